@@ -0,0 +1,332 @@
+"""
+EcoChain Analytics Service
+Long-running local worker that micro-batches user, asset and project requests over HTTP or a Unix socket
+
+Usage:
+    python scripts/analytics_service.py --port 8765
+    python scripts/analytics_service.py --unix-socket /tmp/ecochain.sock --max-wait-ms 10
+    curl -s localhost:8765/analyze-asset -d '{"id": 1, "type": "art", "estimated_value": 250000}'
+    curl -s 'localhost:8765/leaderboard/tier:Gold?page=0&size=20'
+"""
+
+import argparse
+import http.client
+import importlib.util
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Callable, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+logger = logging.getLogger('ecochain.service')
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_STOP = object()
+
+
+def _load_script(filename: str, module_name: str):
+    path = os.path.join(SCRIPTS_DIR, filename)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class MicroBatcher:
+    """
+    Collects submitted items into batches for a single worker thread
+    A batch is dispatched when it reaches max_batch_size or when max_wait_ms has passed
+    since its first item arrived, so batching never adds more than max_wait_ms of latency.
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]], max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0, name: str = 'batcher'):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self._queue: 'queue.Queue[Any]' = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self) -> List[Any]:
+        first = self._queue.get()
+        if first is _STOP:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+            self._dispatch(batch)
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+    def _dispatch(self, batch: List[Any]):
+        """Resolve every future in batch; a failed batch is retried item by item so one bad item fails alone"""
+        try:
+            results = list(self.process_batch([item for item, _ in batch]))
+            if len(results) != len(batch):
+                raise ValueError(f"process_batch returned {len(results)} results for {len(batch)} items")
+        except Exception as exc:
+            if len(batch) == 1:
+                batch[0][1].set_exception(exc)
+                return
+            logger.warning("⚠️ Batch of %d failed (%s), retrying items one by one", len(batch), exc)
+            for entry in batch:
+                self._dispatch([entry])
+        else:
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+class AnalyticsService:
+    """
+    Routes requests to per-operation micro-batchers backed by one pair of engines
+    Engines are built once, with simulated latency off, and shared by every request.
+    Every analyzed user also updates the leaderboards served at /leaderboard/<board>.
+    """
+
+    def __init__(self, analytics: Any = None, ai_engine: Any = None, max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0, run_seed: Optional[int] = None, leaderboard_k: int = 100):
+        if analytics is None:
+            analytics = _load_script('ecochain-analytics.py', 'ecochain_analytics').EcoChainAnalytics(
+                run_seed=run_seed, simulate_latency=False)
+        if ai_engine is None:
+            ai_engine = _load_script('ai-analysis-engine.py', 'ai_analysis_engine').AIAnalysisEngine(
+                run_seed=run_seed, simulate_latency=False)
+        if analytics.leaderboards is None:
+            from leaderboards import Leaderboards
+            analytics.leaderboards = Leaderboards(analytics._get_user_tier, leaderboard_k)
+        self.analytics = analytics
+        self.ai_engine = ai_engine
+        self.leaderboards = analytics.leaderboards
+        self.started = time.time()
+
+        handlers = {
+            'analyze-user': analytics.analyze_users,
+            'analyze-asset': ai_engine.analyze_assets,
+            'verify-project': analytics.verify_projects
+        }
+        self.batchers = {
+            operation: MicroBatcher(handler, max_batch_size, max_wait_ms, name=operation)
+            for operation, handler in handlers.items()
+        }
+
+    def submit(self, operation: str, payload: Dict[str, Any]) -> Future:
+        if operation not in self.batchers:
+            raise KeyError(operation)
+        return self.batchers[operation].submit(payload)
+
+    def handle(self, operation: str, payload: Any, timeout: Optional[float] = None) -> Any:
+        """Result for one payload, or a list of results when payload is a list"""
+        if isinstance(payload, list):
+            futures = [self.submit(operation, item) for item in payload]
+            return [future.result(timeout) for future in futures]
+        return self.submit(operation, payload).result(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'model_config': self.analytics.model_config.version,
+            'operations': {
+                operation: {
+                    'requests': b.items,
+                    'batches': b.batches,
+                    'mean_batch_size': round(b.items / b.batches, 2) if b.batches else 0,
+                    'largest_batch': b.largest_batch
+                }
+                for operation, b in self.batchers.items()
+            }
+        }
+
+    def close(self):
+        for batcher in self.batchers.values():
+            batcher.close()
+
+
+# Transport
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    service: AnalyticsService
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/health':
+            self._reply(200, {'status': 'ok'})
+        elif url.path == '/stats':
+            self._reply(200, self.service.stats())
+        elif url.path == '/leaderboards':
+            self._reply(200, {'boards': self.service.leaderboards.names()})
+        elif url.path.startswith('/leaderboard/'):
+            board = unquote(url.path[len('/leaderboard/'):])
+            query = parse_qs(url.query)
+            try:
+                page = self.service.leaderboards.page(board, int(query.get('page', ['0'])[0]),
+                                                      int(query.get('size', ['20'])[0]))
+            except KeyError:
+                self._reply(404, {'error': f"unknown leaderboard {board}"})
+            except ValueError as exc:
+                self._reply(400, {'error': str(exc)})
+            else:
+                self._reply(200, page)
+        else:
+            self._reply(404, {'error': f"unknown path {self.path}"})
+
+    def do_POST(self):
+        operation = self.path.strip('/')
+        if operation not in self.service.batchers:
+            self._reply(404, {'error': f"unknown operation {operation}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as exc:
+            self._reply(400, {'error': f"invalid JSON: {exc}"})
+            return
+        try:
+            self._reply(200, self.service.handle(operation, payload))
+        except Exception as exc:
+            logger.exception("❌ %s failed", operation)
+            self._reply(500, {'error': str(exc)})
+
+    def _reply(self, status: int, body: Any):
+        data = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format: str, *args):
+        logger.debug("%s " + format, self.address_string(), *args)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # bursts of concurrent callers are the point of batching
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+
+def serve(service: AnalyticsService, host: str = '127.0.0.1', port: int = 8765,
+          unix_socket: Optional[str] = None) -> socketserver.BaseServer:
+    """Bind the service to local HTTP or a Unix socket; call serve_forever() on the result"""
+    handler = type('AnalyticsRequestHandler', (_RequestHandler,), {'service': service})
+    if unix_socket:
+        return _UnixHTTPServer(unix_socket, handler)
+    return _HTTPServer((host, port), handler)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__('localhost', timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+def call(operation: str, payload: Any = None, host: str = '127.0.0.1', port: int = 8765,
+         unix_socket: Optional[str] = None, timeout: float = 30.0) -> Any:
+    """Minimal client: POST payload to an operation, or GET health/stats when payload is None"""
+    conn = (_UnixHTTPConnection(unix_socket, timeout) if unix_socket
+            else http.client.HTTPConnection(host, port, timeout=timeout))
+    try:
+        if payload is None:
+            conn.request('GET', f"/{operation}")
+        else:
+            conn.request('POST', f"/{operation}", json.dumps(payload),
+                         {'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        body = json.loads(response.read())
+        if response.status != 200:
+            raise RuntimeError(f"{operation} failed ({response.status}): {body.get('error')}")
+        return body
+    finally:
+        conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the EcoChain analytics service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix-socket', help="listen on this Unix domain socket instead of TCP")
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help="latency cap of the batching window")
+    parser.add_argument('--seed', type=int, help="run seed shared by every request")
+    parser.add_argument('--leaderboard-k', type=int, default=100, help="entries kept per leaderboard")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    logger.setLevel(logging.INFO)
+    service = AnalyticsService(max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms,
+                               run_seed=args.seed, leaderboard_k=args.leaderboard_k)
+    server = serve(service, args.host, args.port, args.unix_socket)
+    logger.info("🚀 EcoChain analytics service listening on %s",
+                args.unix_socket or f"http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+EcoChain Benchmark Suite
+Throughput and peak-memory scaling curves for the analytics and AI analysis engines
+
+Usage:
+    python scripts/benchmarks.py --output bench_results.json
+    python scripts/benchmarks.py --full --output new.json --compare bench_results.json
+"""
+
+import argparse
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Callable, Optional
+
+import numpy as np
+
+from platform_rollups import PlatformRollups
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ACTION_TYPES = ['energy', 'water', 'recycling', 'transport', 'planting']
+PROJECT_TYPES = ['forestry', 'renewable', 'efficiency', 'methane', 'other']
+ASSET_TYPES = ['real-estate', 'art', 'intellectual-property', 'commodities', 'vehicles']
+LOCATIONS = ['New York, NY, USA', 'London, UK', 'Paris, France', 'Zurich, Switzerland', 'Singapore']
+
+QUICK_SIZES = {
+    'user_actions': [10, 100, 1000, 10000],
+    'projects': [10, 100, 1000],
+    'platform_actions': [1000, 10000, 100000],
+    'portfolio_assets': [10, 100, 1000]
+}
+
+FULL_SIZES = {
+    'user_actions': [10, 100, 1000, 10000, 100000],
+    'projects': [10, 100, 1000, 10000],
+    'platform_actions': [1000, 10000, 100000, 1000000],
+    'portfolio_assets': [10, 100, 1000, 10000, 100000, 1000000]
+}
+
+
+def _load_script(filename: str, module_name: str):
+    path = os.path.join(SCRIPTS_DIR, filename)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Synthetic inputs
+
+def make_user(n_actions: int, seed: int = 0) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    types = rng.integers(len(ACTION_TYPES), size=n_actions)
+    days = rng.integers(365, size=n_actions)
+    start = date(2024, 1, 1)
+    return {
+        'wallet_address': f"0x{seed:040x}",
+        'eco_actions': [
+            {
+                'type': ACTION_TYPES[t],
+                'carbon_offset': float(o),
+                'eco_reward': float(r),
+                'timestamp': (start + timedelta(days=int(d))).isoformat()
+            }
+            for t, o, r, d in zip(types, rng.uniform(0.05, 2.5, n_actions), rng.uniform(20, 50, n_actions), days)
+        ]
+    }
+
+
+def make_projects(n: int) -> List[Dict[str, Any]]:
+    return [{'id': f"PROJ-{i:07d}", 'name': f"Project {i}", 'type': PROJECT_TYPES[i % len(PROJECT_TYPES)],
+             'location': LOCATIONS[i % len(LOCATIONS)], 'size_hectares': 1000 + i % 9000} for i in range(n)]
+
+
+def make_assets(n: int) -> List[Dict[str, Any]]:
+    return [{'id': i, 'name': f"Asset {i}", 'type': ASSET_TYPES[i % len(ASSET_TYPES)],
+             'estimated_value': 500000 + (i * 7919) % 5000000, 'location': LOCATIONS[i % len(LOCATIONS)]}
+            for i in range(n)]
+
+
+def make_rollups(n_actions: int) -> PlatformRollups:
+    rng = np.random.default_rng(n_actions)
+    start = date(2024, 1, 1)
+    days = rng.integers(365, size=n_actions)
+    rollups = PlatformRollups()
+    rollups.add_users([{'created_at': (start + timedelta(days=int(d))).isoformat()}
+                       for d in days[:max(1, n_actions // 10)]])
+    rollups.add_eco_actions([
+        {'user_id': int(u), 'carbon_offset': float(o), 'eco_reward': 25.0,
+         'created_at': (start + timedelta(days=int(d))).isoformat()}
+        for u, o, d in zip(rng.integers(max(1, n_actions // 10), size=n_actions),
+                           rng.uniform(0.05, 2.5, n_actions), days)
+    ])
+    rollups.refresh()
+    return rollups
+
+
+# Measurement
+
+def measure(fn: Callable[[], Any], ops: int, repeat: int) -> Dict[str, Any]:
+    """Best-of-repeat wall time, then one traced run for peak memory"""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    wall = min(timings)
+    return {
+        'ops': ops,
+        'wall_time_s': round(wall, 6),
+        'ops_per_sec': round(ops / wall, 2) if wall > 0 else None,
+        'peak_memory_bytes': peak
+    }
+
+
+def run_suite(sizes: Dict[str, List[int]], repeat: int, seed: int) -> List[Dict[str, Any]]:
+    analytics_module = _load_script('ecochain-analytics.py', 'ecochain_analytics')
+    ai_module = _load_script('ai-analysis-engine.py', 'ai_analysis_engine')
+    analytics = analytics_module.EcoChainAnalytics(run_seed=seed, simulate_latency=False)
+    ai_engine = ai_module.AIAnalysisEngine(run_seed=seed, simulate_latency=False)
+
+    cases = []
+    for n in sizes['user_actions']:
+        user = make_user(n, seed)
+        cases.append(('analyze_user_sustainability_impact', n,
+                      lambda user=user: analytics.analyze_user_sustainability_impact(user)))
+    for n in sizes['projects']:
+        projects = make_projects(n)
+        cases.append(('verify_carbon_offset_project', n,
+                      lambda projects=projects: [analytics.verify_carbon_offset_project(p) for p in projects]))
+    for n in sizes['platform_actions']:
+        rollups = make_rollups(n)
+        cases.append(('analyze_platform_metrics', n,
+                      lambda rollups=rollups: analytics.analyze_platform_metrics(rollups)))
+    for n in sizes['portfolio_assets']:
+        assets = make_assets(n)
+        cases.append(('analyze_asset', n,
+                      lambda assets=assets: [ai_engine.analyze_asset(a) for a in assets]))
+
+    results = []
+    for name, size, fn in cases:
+        result = {'benchmark': name, 'size': size, **measure(fn, size, repeat)}
+        print(f"  {name:<38} size={size:<9} {result['wall_time_s']:>10.4f}s "
+              f"{result['ops_per_sec'] or 0:>14,.0f} ops/s {result['peak_memory_bytes'] / 1e6:>9.1f} MB peak")
+        results.append(result)
+    return results
+
+
+def compare(current: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """Cases whose throughput dropped by more than threshold (a fraction) against the baseline"""
+    previous = {(r['benchmark'], r['size']): r for r in baseline}
+    regressions = []
+    for result in current:
+        before = previous.get((result['benchmark'], result['size']))
+        if not before or not before.get('ops_per_sec') or not result.get('ops_per_sec'):
+            continue
+        change = result['ops_per_sec'] / before['ops_per_sec'] - 1
+        if change < -threshold:
+            regressions.append({
+                'benchmark': result['benchmark'],
+                'size': result['size'],
+                'baseline_ops_per_sec': before['ops_per_sec'],
+                'ops_per_sec': result['ops_per_sec'],
+                'change_pct': round(change * 100, 1)
+            })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the EcoChain analytics engines")
+    parser.add_argument('--full', action='store_true', help="run the full size range (up to 1M assets)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per case; the best is kept")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write machine-readable results to this JSON file")
+    parser.add_argument('--compare', help="baseline JSON results to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed throughput drop (fraction)")
+    args = parser.parse_args(argv)
+
+    print("⏱️ EcoChain Benchmark Suite")
+    print("=" * 50)
+    results = run_suite(FULL_SIZES if args.full else QUICK_SIZES, args.repeat, args.seed)
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'environment': {
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor()
+        },
+        'repeat': args.repeat,
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Results saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"❌ Regression: {r['benchmark']} size={r['size']} {r['change_pct']}% "
+                  f"({r['baseline_ops_per_sec']:,.0f} -> {r['ops_per_sec']:,.0f} ops/s)")
+        if regressions:
+            return 1
+        print(f"✅ No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+EcoChain Bulk Jobs
+Checkpointed, resumable chunked runs of the user and asset analysis engines
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List, Any, Callable, Iterator, Optional
+
+from delta_analysis import ai_versions, analytics_versions, fingerprint
+
+logger = logging.getLogger('ecochain.bulk_jobs')
+
+
+def _atomic_write(path: str, text: str):
+    """Write to a temp file, fsync and rename so readers never see a partial file"""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _chunk_digest(items: List[Any]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for item in items:
+        h.update(json.dumps(item, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class BulkJobRunner:
+    """
+    Processes inputs in numbered chunks and checkpoints after each finished chunk
+    Each chunk's output file is replaced atomically, so re-running a chunk overwrites rather
+    than duplicates its results; a crash loses at most the chunk in flight. on_chunk, when
+    given, is called with the chunk id after its results are written and before it is
+    checkpointed, so state built up alongside the results can be persisted with them.
+    versions, when given, is called at the start of every run; its fingerprint is kept in
+    the checkpoint and a change (another run seed, model version or configuration)
+    invalidates every finished chunk, so one job never mixes results of two setups.
+    """
+
+    def __init__(self, job_dir: str, process_fn: Callable[[Any], Dict[str, Any]],
+                 key_fn: Callable[[Any], Any], chunk_size: int = 500,
+                 on_chunk: Optional[Callable[[int], None]] = None,
+                 versions: Optional[Callable[[], Dict[str, Any]]] = None):
+        self.job_dir = job_dir
+        self.process_fn = process_fn
+        self.key_fn = key_fn
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk
+        self.versions = versions
+        self.checkpoint_path = os.path.join(job_dir, 'checkpoint.json')
+        os.makedirs(job_dir, exist_ok=True)
+
+    def chunk_path(self, chunk_id: int) -> str:
+        return os.path.join(self.job_dir, f"chunk-{chunk_id:06d}.jsonl")
+
+    def load_checkpoint(self) -> Dict[str, Any]:
+        if not os.path.exists(self.checkpoint_path):
+            return {'chunk_size': self.chunk_size, 'completed_chunks': {}}
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('chunk_size') != self.chunk_size:
+            raise ValueError(
+                f"Job in {self.job_dir} was checkpointed with chunk_size={checkpoint.get('chunk_size')}, "
+                f"not {self.chunk_size}"
+            )
+        return checkpoint
+
+    def run(self, items: List[Any]) -> Dict[str, Any]:
+        """Process every chunk not already recorded as complete for its current input"""
+        checkpoint = self.load_checkpoint()
+        job_fingerprint = fingerprint(self.versions()) if self.versions is not None else None
+        if checkpoint['completed_chunks'] and checkpoint.get('job_fingerprint') != job_fingerprint:
+            logger.warning("⚠️ Job in %s was run with other versions or another seed; rerunning every chunk",
+                           self.job_dir)
+            checkpoint['completed_chunks'] = {}
+        checkpoint['job_fingerprint'] = job_fingerprint
+        completed = checkpoint['completed_chunks']
+        total_chunks = (len(items) + self.chunk_size - 1) // self.chunk_size
+        processed = skipped = 0
+        stale = [c for c in completed if int(c) >= total_chunks]
+        if stale:
+            # The input shrank: forget chunks past its end, on disk as well, before reading any results
+            for chunk_id in stale:
+                del completed[chunk_id]
+            checkpoint['total_chunks'] = total_chunks
+            _atomic_write(self.checkpoint_path, json.dumps(checkpoint, sort_keys=True))
+            for chunk_id in stale:
+                if os.path.exists(self.chunk_path(int(chunk_id))):
+                    os.unlink(self.chunk_path(int(chunk_id)))
+
+        for chunk_id in range(total_chunks):
+            chunk = items[chunk_id * self.chunk_size:(chunk_id + 1) * self.chunk_size]
+            digest = _chunk_digest(chunk)
+            if completed.get(str(chunk_id)) == digest and os.path.exists(self.chunk_path(chunk_id)):
+                skipped += 1
+                continue
+
+            lines = []
+            for item in chunk:
+                lines.append(json.dumps({'key': self.key_fn(item), 'result': self.process_fn(item)}, default=str))
+            _atomic_write(self.chunk_path(chunk_id), '\n'.join(lines) + '\n' if lines else '')
+            if self.on_chunk is not None:
+                self.on_chunk(chunk_id)
+
+            completed[str(chunk_id)] = digest
+            checkpoint['total_chunks'] = total_chunks
+            _atomic_write(self.checkpoint_path, json.dumps(checkpoint, sort_keys=True))
+            processed += 1
+
+        return {
+            'total_chunks': total_chunks,
+            'chunks_processed': processed,
+            'chunks_resumed': skipped,
+            'items': len(items)
+        }
+
+    def results(self) -> Iterator[Dict[str, Any]]:
+        """Yield each key's result once, in chunk order"""
+        checkpoint = self.load_checkpoint()
+        seen = set()
+        for chunk_id in sorted(int(c) for c in checkpoint['completed_chunks']):
+            with open(self.chunk_path(chunk_id)) as f:
+                for line in f:
+                    record = json.loads(line)
+                    key = json.dumps(record['key'], sort_keys=True, default=str)
+                    if key not in seen:
+                        seen.add(key)
+                        yield record
+
+
+def user_analysis_job(analytics, job_dir: str, chunk_size: int = 500) -> BulkJobRunner:
+    """Bulk runner around EcoChainAnalytics.analyze_user_sustainability_impact; needs an explicit run_seed"""
+    analytics_versions(analytics)
+    return BulkJobRunner(job_dir, analytics.analyze_user_sustainability_impact,
+                         lambda user: user.get('wallet_address'), chunk_size,
+                         versions=lambda: analytics_versions(analytics))
+
+
+def asset_analysis_job(ai_engine, job_dir: str, chunk_size: int = 50) -> BulkJobRunner:
+    """Bulk runner around AIAnalysisEngine.analyze_asset; needs an explicit run_seed"""
+    ai_versions(ai_engine)
+    return BulkJobRunner(job_dir, ai_engine.analyze_asset,
+                         lambda asset: asset.get('id'), chunk_size, versions=lambda: ai_versions(ai_engine))
@@ -0,0 +1,150 @@
+"""
+EcoChain Compliance Rule Engine
+Declarative compliance rules compiled into a memoized (asset type, jurisdictions) decision table
+"""
+
+import json
+import os
+from typing import Dict, List, Any, Optional, Tuple
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'compliance-rules.json')
+
+WILDCARD = '*'
+
+
+class CompiledOutcome:
+    """Static compliance outcome for one (asset type, location) pair"""
+
+    __slots__ = ('requirements', 'pass_rates')
+
+    def __init__(self, requirements: List[str], pass_rates: List[float]):
+        self.requirements = requirements
+        self.pass_rates = pass_rates
+
+
+class ComplianceRuleEngine:
+    """
+    Compiles compliance rules into a decision table
+    A rule applies to an asset type (or '*') and a jurisdiction (or '*'); a jurisdiction
+    matches when it equals one of the comma-separated parts of the asset's location
+    ("Austin, Texas, USA"), ignoring case. For checks the most specific matching rule wins;
+    requirements from every matching rule are combined in table order. Outcomes are
+    memoized per (asset type named by a rule, matched jurisdictions), so free-text
+    locations and asset types from clients cannot grow the table without bound.
+    """
+
+    def __init__(self, rules: Dict[str, Any]):
+        self.version = rules.get('version', 'unversioned')
+        self.check_rules = rules.get('checks', [])
+        self.requirement_rules = rules.get('requirements', [])
+
+        self.check_names: List[str] = []
+        for rule in self.check_rules:
+            if rule['check'] not in self.check_names:
+                self.check_names.append(rule['check'])
+        self.check_index = {name: i for i, name in enumerate(self.check_names)}
+        rules = self.check_rules + self.requirement_rules
+        self.jurisdictions = sorted({r.get('jurisdiction', WILDCARD) for r in rules} - {WILDCARD})
+        self._jurisdiction_of = {j.casefold(): j for j in self.jurisdictions}
+        self.asset_types = {r.get('asset_type', WILDCARD) for r in rules} - {WILDCARD}
+        self._table: Dict[Tuple[Optional[str], Tuple[str, ...]], CompiledOutcome] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'ComplianceRuleEngine':
+        with open(path or DEFAULT_RULES_PATH) as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def _specificity(rule: Dict[str, Any]) -> int:
+        return (rule.get('asset_type', WILDCARD) != WILDCARD) * 2 + (rule.get('jurisdiction', WILDCARD) != WILDCARD)
+
+    def _matches(self, rule: Dict[str, Any], asset_type: str, jurisdictions: List[str]) -> bool:
+        rule_type = rule.get('asset_type', WILDCARD)
+        rule_jurisdiction = rule.get('jurisdiction', WILDCARD)
+        return ((rule_type == WILDCARD or rule_type == asset_type) and
+                (rule_jurisdiction == WILDCARD or rule_jurisdiction in jurisdictions))
+
+    def matched_jurisdictions(self, location: Any) -> Tuple[str, ...]:
+        """Rule jurisdictions named by the location's comma-separated parts, in sorted order"""
+        parts = {part.strip().casefold() for part in str(location or '').split(',')}
+        return tuple(sorted(self._jurisdiction_of[p] for p in parts if p in self._jurisdiction_of))
+
+    def compile(self, asset_type: str, location: str) -> CompiledOutcome:
+        """Decision table entry for an (asset type, location) pair, built once per distinct outcome key"""
+        jurisdictions = self.matched_jurisdictions(location)
+        # Types no rule names all share the wildcard rules' outcome
+        key = (asset_type if asset_type in self.asset_types else None, jurisdictions)
+        outcome = self._table.get(key)
+        if outcome is not None:
+            self.cache_hits += 1
+            return outcome
+        self.cache_misses += 1
+
+        pass_rates = [1.0] * len(self.check_names)
+        best = [-1] * len(self.check_names)
+        for rule in self.check_rules:
+            if not self._matches(rule, asset_type, jurisdictions):
+                continue
+            i = self.check_index[rule['check']]
+            specificity = self._specificity(rule)
+            if specificity >= best[i]:
+                best[i] = specificity
+                pass_rates[i] = rule['pass_rate']
+
+        requirements = []
+        for rule in self.requirement_rules:
+            if self._matches(rule, asset_type, jurisdictions) and rule['requirement'] not in requirements:
+                requirements.append(rule['requirement'])
+
+        outcome = self._table[key] = CompiledOutcome(requirements, pass_rates)
+        return outcome
+
+    def cache_stats(self) -> Tuple[int, int]:
+        """(hits, misses) of the decision table memo"""
+        return self.cache_hits, self.cache_misses
+
+    def check(self, asset: Dict[str, Any], rng: Any) -> Dict[str, Any]:
+        """Compliance result for a single asset without NumPy; same draws as screen()"""
+        outcome = self.compile(asset.get('type', 'real-estate'), asset.get('location', 'Unknown'))
+        passed = [draw < rate for draw, rate in zip(rng.random(len(self.check_names)), outcome.pass_rates)]
+        score = sum(passed) / len(passed) * 100 if passed else 0.0
+        return self._result(outcome, passed, score)
+
+    def screen(self, assets: List[Dict[str, Any]], rngs: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Compliance results for a batch of assets: one table lookup per asset
+        Each asset's checks are drawn from its own stream (rngs, aligned with assets) so a
+        result does not depend on which batch the asset was screened in.
+        """
+        import numpy as np
+
+        outcomes = [self.compile(a.get('type', 'real-estate'), a.get('location', 'Unknown')) for a in assets]
+        if not outcomes:
+            return []
+        if rngs is None:
+            rngs = [np.random.default_rng()] * len(assets)
+        n_checks = len(self.check_names)
+        draws = np.stack([rng.random(n_checks) for rng in rngs])
+        pass_rates = np.array([o.pass_rates for o in outcomes])
+        passed = draws < pass_rates
+        scores = passed.mean(axis=1) * 100
+        return [self._result(outcome, passed[i], scores[i]) for i, outcome in enumerate(outcomes)]
+
+    def _result(self, outcome: CompiledOutcome, passed: Any, score: float) -> Dict[str, Any]:
+        checks = {name: bool(passed[i]) for i, name in enumerate(self.check_names)}
+        return {
+            'overall_compliance': all(checks.values()),
+            'compliance_score': round(float(score), 1),
+            'individual_checks': checks,
+            'regulatory_requirements': list(outcome.requirements),
+            'compliance_recommendations': self.recommendations(checks)
+        }
+
+    def recommendations(self, checks: Dict[str, bool]) -> List[str]:
+        recommendations = [f"Address {name.replace('_', ' ')} requirements"
+                           for name, passed in checks.items() if not passed]
+        if not recommendations:
+            recommendations.append("All compliance checks passed - ready for tokenization")
+        return recommendations
@@ -0,0 +1,198 @@
+"""
+EcoChain Delta Analysis
+Input fingerprints that limit nightly re-scoring to entities whose inputs or models changed
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Dict, List, Any, Callable, Iterator, Optional, Union
+
+# Fields each engine actually reads; anything else on the entity does not affect its result
+ASSET_FIELDS = ['id', 'name', 'type', 'estimated_value', 'location']
+USER_FIELDS = ['wallet_address']
+USER_ACTION_FIELDS = ['type', 'carbon_offset', 'eco_reward', 'timestamp']
+
+_LOOKUP_BATCH = 500
+_COMMIT_BATCH = 1000
+
+
+def fingerprint(value: Any) -> str:
+    """Stable digest of a JSON-serializable value, independent of key order"""
+    encoded = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def asset_inputs(asset: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: asset.get(field) for field in ASSET_FIELDS}
+
+
+def user_inputs(user: Dict[str, Any]) -> Dict[str, Any]:
+    inputs = {field: user.get(field) for field in USER_FIELDS}
+    inputs['eco_actions'] = [{field: action.get(field) for field in USER_ACTION_FIELDS}
+                             for action in user.get('eco_actions', [])]
+    return inputs
+
+
+class DeltaAnalyzer:
+    """
+    Re-analyzes only entities whose fingerprint changed since the last run
+    An entity's fingerprint covers its relevant input fields and the model versions in
+    effect, so a version bump invalidates every stored result for that engine. versions
+    may be a callable, evaluated at the start of every run, for versions that change while
+    the runner is alive (a reloaded model configuration). Engines
+    draw from per-entity streams of a fixed run seed (see rng_streams), so a reused result
+    is exactly what re-running the analysis would produce. Results live in a SQLite store
+    and are committed every commit_every entities, so an interrupted run keeps its progress.
+    """
+
+    def __init__(self, store_path: str, analyze_fn: Callable[[Any], Dict[str, Any]],
+                 key_fn: Callable[[Any], Any], inputs_fn: Callable[[Any], Dict[str, Any]],
+                 versions: Union[Dict[str, Any], Callable[[], Dict[str, Any]]],
+                 commit_every: int = _COMMIT_BATCH):
+        self.analyze_fn = analyze_fn
+        self.key_fn = key_fn
+        self.inputs_fn = inputs_fn
+        self.versions = versions
+        self.versions_digest = fingerprint(self._current_versions())
+        self.commit_every = commit_every
+        self.conn = sqlite3.connect(store_path)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS analyses ("
+                "key TEXT PRIMARY KEY, input_digest TEXT, versions_digest TEXT, result TEXT, analyzed_at REAL)"
+            )
+
+    def _current_versions(self) -> Dict[str, Any]:
+        return self.versions() if callable(self.versions) else self.versions
+
+    def _stored_digests(self, keys: List[str]) -> Dict[str, tuple]:
+        stored = {}
+        for i in range(0, len(keys), _LOOKUP_BATCH):
+            batch = keys[i:i + _LOOKUP_BATCH]
+            rows = self.conn.execute(
+                f"SELECT key, input_digest, versions_digest FROM analyses WHERE key IN ({','.join('?' * len(batch))})",
+                batch
+            )
+            stored.update((key, (input_digest, versions_digest)) for key, input_digest, versions_digest in rows)
+        return stored
+
+    def run(self, entities: List[Any]) -> Dict[str, Any]:
+        """Analyze new and changed entities, reuse stored results for the rest"""
+        started = time.time()
+        self.versions_digest = fingerprint(self._current_versions())
+        keys = [json.dumps(self.key_fn(entity), default=str) for entity in entities]
+        digests = [fingerprint(self.inputs_fn(entity)) for entity in entities]
+        stored = self._stored_digests(keys)
+
+        new = changed = version_bumps = reanalyzed = 0
+        updates = []
+        for entity, key, digest in zip(entities, keys, digests):
+            previous = stored.get(key)
+            if previous == (digest, self.versions_digest):
+                continue
+            if previous is None:
+                new += 1
+            elif previous[1] != self.versions_digest:
+                version_bumps += 1
+            else:
+                changed += 1
+            result = self.analyze_fn(entity)
+            updates.append((key, digest, self.versions_digest, json.dumps(result, default=str), time.time()))
+            reanalyzed += 1
+            if len(updates) >= self.commit_every:
+                self._store(updates)
+                updates = []
+        self._store(updates)
+
+        return {
+            'entities': len(entities),
+            'reanalyzed': reanalyzed,
+            'reused': len(entities) - reanalyzed,
+            'new': new,
+            'input_changes': changed,
+            'version_bumps': version_bumps,
+            'reanalyzed_fraction': round(reanalyzed / len(entities), 4) if entities else 0.0,
+            'elapsed_seconds': round(time.time() - started, 3)
+        }
+
+    def _store(self, updates: List[tuple]):
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?)", updates)
+
+    def result(self, key: Any) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT result FROM analyses WHERE key = ?",
+                                (json.dumps(key, default=str),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def results(self, entities: Optional[List[Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Stored results for the given entities (in order), or every stored result"""
+        if entities is None:
+            for key, result in self.conn.execute("SELECT key, result FROM analyses ORDER BY key"):
+                yield {'key': json.loads(key), 'result': json.loads(result)}
+            return
+        for entity in entities:
+            key = self.key_fn(entity)
+            yield {'key': key, 'result': self.result(key)}
+
+    def prune(self, entities: List[Any]) -> int:
+        """Drop stored results for entities no longer present; returns rows removed"""
+        live = {json.dumps(self.key_fn(entity), default=str) for entity in entities}
+        stale = [(key,) for (key,) in self.conn.execute("SELECT key FROM analyses") if key not in live]
+        with self.conn:
+            self.conn.executemany("DELETE FROM analyses WHERE key = ?", stale)
+        return len(stale)
+
+    def close(self):
+        self.conn.close()
+
+
+def _require_run_seed(engine):
+    """Results drawn from a random run seed never match a stored fingerprint"""
+    if not engine.rng_streams.seeded:
+        raise ValueError(f"{type(engine).__name__} needs an explicit run_seed to reuse stored results; "
+                         "with a random seed every run re-analyzes every entity")
+
+
+def ai_versions(ai_engine) -> Dict[str, Any]:
+    """
+    Everything besides its inputs that an AIAnalysisEngine result depends on: model and
+    rule versions, the model configuration's content and the run seed (which must be explicit)
+    """
+    _require_run_seed(ai_engine)
+    return {
+        'model_version': ai_engine.model_version,
+        'compliance_rules': ai_engine.compliance_rules.version,
+        'model_config': ai_engine.model_config.current.digest,
+        'run_seed': ai_engine.run_seed
+    }
+
+
+def analytics_versions(analytics) -> Dict[str, Any]:
+    """Everything besides its inputs that an EcoChainAnalytics result depends on"""
+    _require_run_seed(analytics)
+    return {
+        'platform_version': analytics.platform_version,
+        'model_config': analytics.model_config.current.digest,
+        'run_seed': analytics.run_seed
+    }
+
+
+def asset_delta(ai_engine, store_path: str) -> DeltaAnalyzer:
+    """Delta runner around AIAnalysisEngine.analyze_asset; the engine must have an explicit run_seed"""
+    _require_run_seed(ai_engine)
+    # Versions are read per run: the model configuration may be reloaded while the runner lives
+    return DeltaAnalyzer(store_path, ai_engine.analyze_asset, lambda asset: asset.get('id'),
+                         asset_inputs, lambda: ai_versions(ai_engine))
+
+
+def user_delta(analytics, store_path: str) -> DeltaAnalyzer:
+    """
+    Delta runner around EcoChainAnalytics.analyze_user_sustainability_impact
+    Platform ranking in a reused result reflects the score distribution at analysis time.
+    The engine must have an explicit run_seed.
+    """
+    _require_run_seed(analytics)
+    return DeltaAnalyzer(store_path, analytics.analyze_user_sustainability_impact,
+                         lambda user: user.get('wallet_address'), user_inputs, lambda: analytics_versions(analytics))
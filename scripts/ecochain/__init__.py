@@ -0,0 +1,69 @@
+"""
+EcoChain Analytics Package
+Importable entry point to the analysis engines; each engine module is loaded on first use
+
+    import ecochain
+    engine = ecochain.AIAnalysisEngine(run_seed=42, simulate_latency=False)
+"""
+
+import importlib.util
+import os
+import sys
+from typing import Any
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Engines import their helper modules (rng_streams, compliance_rules, ...) by bare name
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+# Engine scripts have hyphenated file names; they are registered under these module names
+SCRIPT_MODULES = {
+    'ecochain_analytics': 'ecochain-analytics.py',
+    'ai_analysis_engine': 'ai-analysis-engine.py'
+}
+
+# Public name -> module that defines it
+_EXPORTS = {
+    'EcoChainAnalytics': 'ecochain_analytics',
+    'AIAnalysisEngine': 'ai_analysis_engine',
+    'RNGStreams': 'rng_streams',
+    'ComplianceRuleEngine': 'compliance_rules',
+    'ModelConfigRegistry': 'model_config',
+    'Instrumentation': 'instrumentation',
+    'PlatformRollups': 'platform_rollups',
+    'AnalyticsService': 'analytics_service'
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def load_module(module_name: str):
+    """Import a scripts module by name, loading hyphenated engine scripts from their files"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    filename = SCRIPT_MODULES.get(module_name)
+    if filename is None:
+        return importlib.import_module(module_name)
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(SCRIPTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'ecochain' has no attribute {name!r}")
+    value = getattr(load_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,5 @@
+import sys
+
+from ecochain.cli import main
+
+sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+EcoChain CLI
+Single command line for the analysis engines
+
+Usage (from scripts/, or with scripts/ on PYTHONPATH):
+    python -m ecochain analyze-asset '{"id": 1, "type": "art", "estimated_value": 250000}'
+    python -m ecochain analyze-user user.json --seed 42
+    python -m ecochain verify-project project.json --project-index projects.npz
+    python -m ecochain platform-metrics --rollups rollups.json --as-of 2024-06-30
+    python -m ecochain analyze-users users.jsonl --output results.jsonl --job-dir jobs/users --seed 42
+
+Single-entity commands never import NumPy; batch commands and rollups load it as needed.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Dict, List, Any, Callable, Iterator, Optional
+
+from ecochain import load_module
+
+logger = logging.getLogger('ecochain.cli')
+
+
+def _read_json(source: str) -> Any:
+    """Inline JSON, '-' for stdin, or a file path"""
+    if source.lstrip().startswith(('{', '[')):
+        return json.loads(source)
+    if source == '-':
+        return json.load(sys.stdin)
+    with open(source) as f:
+        return json.load(f)
+
+
+def _read_records(source: str) -> List[Dict[str, Any]]:
+    """A JSON array or JSON Lines (one object per line) from a file path or '-' for stdin"""
+    if source == '-':
+        text = sys.stdin.read()
+    else:
+        with open(source) as f:
+            text = f.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _write(args: argparse.Namespace, result: Any):
+    text = json.dumps(result, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+def _write_lines(args: argparse.Namespace, records: Iterator[Dict[str, Any]]) -> int:
+    out = open(args.output, 'w') if args.output else sys.stdout
+    count = 0
+    try:
+        for record in records:
+            out.write(json.dumps(record, default=str) + '\n')
+            count += 1
+    finally:
+        if args.output:
+            out.close()
+    return count
+
+
+def _analytics(args: argparse.Namespace):
+    module = load_module('ecochain_analytics')
+    return module.EcoChainAnalytics(run_seed=args.seed, simulate_latency=args.simulate_latency)
+
+
+def _ai_engine(args: argparse.Namespace):
+    module = load_module('ai_analysis_engine')
+    return module.AIAnalysisEngine(run_seed=args.seed, simulate_latency=args.simulate_latency)
+
+
+# Single-entity commands
+
+def cmd_analyze_user(args: argparse.Namespace) -> int:
+    _write(args, _analytics(args).analyze_user_sustainability_impact(_read_json(args.input)))
+    return 0
+
+
+def cmd_analyze_asset(args: argparse.Namespace) -> int:
+    _write(args, _ai_engine(args).analyze_asset(_read_json(args.input), deadline=args.deadline))
+    return 0
+
+
+def _with_project_index(args: argparse.Namespace, analytics: Any, run: Callable[[], int]) -> int:
+    """Check projects against the saved near-duplicate index and save it with the new listings"""
+    if not args.project_index:
+        return run()
+    project_dedup = load_module('project_dedup')
+    if os.path.exists(args.project_index):
+        analytics.project_index = project_dedup.ProjectDuplicateIndex.load(args.project_index)
+    else:
+        analytics.project_index = project_dedup.ProjectDuplicateIndex()
+    status = run()
+    analytics.project_index.save(args.project_index)
+    return status
+
+
+def cmd_verify_project(args: argparse.Namespace) -> int:
+    analytics = _analytics(args)
+    project = _read_json(args.input)
+    return _with_project_index(args, analytics, lambda: _write(
+        args, analytics.verify_carbon_offset_project(project)) or 0)
+
+
+def cmd_platform_metrics(args: argparse.Namespace) -> int:
+    rollups = load_module('platform_rollups').PlatformRollups.load(args.rollups) if args.rollups else None
+    _write(args, _analytics(args).analyze_platform_metrics(rollups, as_of=args.as_of))
+    return 0
+
+
+# Batch commands
+
+def _run_batch(args: argparse.Namespace, analyze_all: Callable[[List[Any]], List[Dict[str, Any]]],
+               job_factory: Callable[[str], Any], key_fn: Callable[[Any], Any]) -> int:
+    """
+    Analyze every record of the input file and write one {"key", "result"} line per record
+    With --job-dir the run is checkpointed per chunk (bulk_jobs) and resumes where it stopped.
+    """
+    if args.job_dir and args.seed is None:
+        # Chunks drawn from different random seeds must not be stitched into one result
+        logger.error("❌ --job-dir needs --seed so an interrupted run resumes with the same draws")
+        return 2
+    records = _read_records(args.input)
+    if args.job_dir:
+        job = job_factory(args.job_dir)
+        summary = job.run(records)
+        count = _write_lines(args, job.results())
+        logger.info("✅ %s records (%s chunks processed, %s resumed)", count,
+                    summary['chunks_processed'], summary['chunks_resumed'])
+    else:
+        results = analyze_all(records)
+        count = _write_lines(args, ({'key': key_fn(r), 'result': result} for r, result in zip(records, results)))
+        logger.info("✅ %s records", count)
+    return 0
+
+
+def cmd_analyze_users(args: argparse.Namespace) -> int:
+    analytics = _analytics(args)
+    bulk_jobs = load_module('bulk_jobs')
+    return _run_batch(
+        args, analytics.analyze_users,
+        lambda job_dir: bulk_jobs.user_analysis_job(analytics, job_dir, args.chunk_size or 500),
+        lambda user: user.get('wallet_address'))
+
+
+def cmd_analyze_assets(args: argparse.Namespace) -> int:
+    ai_engine = _ai_engine(args)
+    bulk_jobs = load_module('bulk_jobs')
+    return _run_batch(
+        args, ai_engine.analyze_assets,
+        lambda job_dir: bulk_jobs.asset_analysis_job(ai_engine, job_dir, args.chunk_size or 50),
+        lambda asset: asset.get('id'))
+
+
+def cmd_verify_projects(args: argparse.Namespace) -> int:
+    analytics = _analytics(args)
+    bulk_jobs = load_module('bulk_jobs')
+    # A checkpointed run appends each chunk's listings to an index increment and folds them into the
+    # index file at the end, so an interrupted run keeps the listings it checked. The increment is
+    # written before the chunk's checkpoint: a crash between the two replays that one chunk, whose
+    # listings are then checked against each other in both directions rather than only earlier ones.
+    save_index = ((lambda chunk_id: analytics.project_index.save_increment(args.project_index))
+                  if args.project_index else None)
+    return _with_project_index(args, analytics, lambda: _run_batch(
+        args, analytics.verify_projects,
+        lambda job_dir: bulk_jobs.BulkJobRunner(job_dir, analytics.verify_carbon_offset_project,
+                                                lambda project: project.get('id'), args.chunk_size or 500,
+                                                on_chunk=save_index,
+                                                versions=lambda: bulk_jobs.analytics_versions(analytics)),
+        lambda project: project.get('id')))
+
+
+_PROJECT_INDEX_HELP = "near-duplicate index (.npz) to check listings against; created if missing"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--seed', type=int, help="run seed; results are reproducible for a fixed seed")
+    common.add_argument('--output', '-o', help="write to this file instead of stdout")
+    common.add_argument('--simulate-latency', action='store_true', help="keep the engines' demo sleeps")
+    common.add_argument('--verbose', '-v', action='store_true', help="log engine progress to stderr")
+
+    parser = argparse.ArgumentParser(prog='ecochain', description="EcoChain analytics engines")
+    commands = parser.add_subparsers(dest='command', required=True, metavar='command')
+
+    single = [
+        ('analyze-user', cmd_analyze_user, "sustainability impact of one user"),
+        ('analyze-asset', cmd_analyze_asset, "valuation, risk, market and compliance of one asset"),
+        ('verify-project', cmd_verify_project, "verify one carbon offset project")
+    ]
+    for name, handler, help_text in single:
+        command = commands.add_parser(name, parents=[common], help=help_text)
+        command.add_argument('input', nargs='?', default='-', help="JSON file, inline JSON, or '-' for stdin")
+        command.set_defaults(handler=handler)
+        if name == 'analyze-asset':
+            command.add_argument('--deadline', type=float, help="seconds; unfinished stages are dropped")
+        if name == 'verify-project':
+            command.add_argument('--project-index', help=_PROJECT_INDEX_HELP)
+
+    command = commands.add_parser('platform-metrics', parents=[common], help="platform-wide metrics")
+    command.add_argument('--rollups', help="saved PlatformRollups file (simulated headline otherwise)")
+    command.add_argument('--as-of', help="ISO date for the rollup window")
+    command.set_defaults(handler=cmd_platform_metrics)
+
+    batch = [
+        ('analyze-users', cmd_analyze_users, "analyze every user in a file"),
+        ('analyze-assets', cmd_analyze_assets, "analyze every asset in a file"),
+        ('verify-projects', cmd_verify_projects, "verify every project in a file")
+    ]
+    for name, handler, help_text in batch:
+        command = commands.add_parser(name, parents=[common], help=help_text)
+        command.add_argument('input', help="JSON array or JSON Lines file, or '-' for stdin")
+        command.add_argument('--job-dir', help="checkpoint chunks here and resume an interrupted run (needs --seed)")
+        command.add_argument('--chunk-size', type=int, help="records per checkpointed chunk")
+        if name == 'verify-projects':
+            command.add_argument('--project-index', help=_PROJECT_INDEX_HELP)
+        command.set_defaults(handler=handler)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format='%(message)s')
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # Output piped into head & co.; silence the flush at interpreter exit
+        sys.stdout = open(os.devnull, 'w')
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
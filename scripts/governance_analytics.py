@@ -0,0 +1,139 @@
+"""
+EcoChain Governance Analytics
+Vectorized vote tallies, quorum attainment and participation over governance_votes
+"""
+
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+
+class GovernanceTally:
+    """
+    Running weighted tallies for every proposal, updated with grouped NumPy reductions
+    Votes arrive as column arrays shaped like the governance_votes table; each batch is
+    folded in with one bincount per measure, never row by row. The one-vote-per-user rule
+    is enforced by the unique_vote key upstream and is not re-checked here.
+    """
+
+    def __init__(self, proposal_ids: np.ndarray, quorum_required: np.ndarray,
+                 statuses: Optional[List[str]] = None):
+        order = np.argsort(proposal_ids)
+        self.proposal_ids = np.asarray(proposal_ids, dtype=np.int64)[order]
+        self.quorum_required = np.asarray(quorum_required, dtype=np.int64)[order]
+        self.statuses = [statuses[i] for i in order] if statuses is not None else None
+        n = len(self.proposal_ids)
+        self.votes_for = np.zeros(n, dtype=np.int64)
+        self.votes_against = np.zeros(n, dtype=np.int64)
+        self.voters_for = np.zeros(n, dtype=np.int64)
+        self.voters_against = np.zeros(n, dtype=np.int64)
+        self._voter_batches: List[np.ndarray] = []
+        self._voters: Optional[np.ndarray] = np.empty(0, dtype=np.int64)
+
+    @classmethod
+    def from_rows(cls, proposals: List[Dict[str, Any]], votes: Optional[List[Dict[str, Any]]] = None
+                  ) -> 'GovernanceTally':
+        """Build from governance_proposals rows and optionally fold in governance_votes rows"""
+        tally = cls(
+            np.array([p['id'] for p in proposals], dtype=np.int64),
+            np.array([p.get('quorum_required', 10000000) for p in proposals], dtype=np.int64),
+            [p.get('status', 'pending') for p in proposals]
+        )
+        if votes:
+            tally.add_votes(
+                np.array([v['proposal_id'] for v in votes], dtype=np.int64),
+                np.array([v['user_id'] for v in votes], dtype=np.int64),
+                np.array([v['voting_power'] for v in votes], dtype=np.int64),
+                np.array([bool(v['vote_choice']) for v in votes])
+            )
+        return tally
+
+    def add_votes(self, proposal_ids: np.ndarray, user_ids: np.ndarray,
+                  voting_power: np.ndarray, vote_choice: np.ndarray):
+        """Fold a batch of new votes into the running tallies"""
+        proposal_ids = np.asarray(proposal_ids, dtype=np.int64)
+        if not len(proposal_ids):
+            return
+        n = len(self.proposal_ids)
+        index = np.minimum(np.searchsorted(self.proposal_ids, proposal_ids), max(0, n - 1))
+        known = self.proposal_ids[index] == proposal_ids if n else np.zeros(len(proposal_ids), dtype=bool)
+        if not known.all():
+            missing = np.unique(proposal_ids[~known])
+            raise KeyError(f"Votes reference unknown proposals: {missing[:10].tolist()}")
+
+        power = np.asarray(voting_power, dtype=np.int64)
+        choice = np.asarray(vote_choice, dtype=bool)
+        # Voting power is a BIGINT; float bincount weights lose precision above 2^53
+        np.add.at(self.votes_for, index[choice], power[choice])
+        np.add.at(self.votes_against, index[~choice], power[~choice])
+        self.voters_for += np.bincount(index[choice], minlength=n)
+        self.voters_against += np.bincount(index[~choice], minlength=n)
+        # Distinct voters are only needed for participation, so deduplicate lazily
+        self._voter_batches.append(np.asarray(user_ids, dtype=np.int64))
+        self._voters = None
+
+    @property
+    def voters(self) -> np.ndarray:
+        """Sorted distinct user ids that have voted"""
+        if self._voters is None:
+            self._voters = np.unique(np.concatenate(self._voter_batches))
+            self._voter_batches = [self._voters]
+        return self._voters
+
+    def tally(self) -> List[Dict[str, Any]]:
+        """Per-proposal weighted totals and quorum attainment"""
+        total = self.votes_for + self.votes_against
+        approval = np.divide(self.votes_for * 100.0, total, out=np.zeros(len(total)), where=total > 0)
+        quorum_progress = np.divide(total * 100.0, self.quorum_required,
+                                    out=np.zeros(len(total)), where=self.quorum_required > 0)
+        return [
+            {
+                'proposal_id': int(self.proposal_ids[i]),
+                'status': self.statuses[i] if self.statuses is not None else None,
+                'votes_for': int(self.votes_for[i]),
+                'votes_against': int(self.votes_against[i]),
+                'total_voting_power': int(total[i]),
+                'approval_rate': round(float(approval[i]), 2),
+                'quorum_required': int(self.quorum_required[i]),
+                'quorum_progress': round(float(quorum_progress[i]), 2),
+                'quorum_reached': bool(total[i] >= self.quorum_required[i]),
+                'voters': int(self.voters_for[i] + self.voters_against[i])
+            }
+            for i in range(len(self.proposal_ids))
+        ]
+
+    def participation_rate(self, eligible_users: int) -> float:
+        """Percentage of eligible users that voted on at least one proposal"""
+        if eligible_users <= 0:
+            raise ValueError("participation needs a positive count of eligible users")
+        return round(len(self.voters) / eligible_users * 100, 1)
+
+    def participation_by_cohort(self, user_ids: np.ndarray, cohorts: np.ndarray) -> Dict[str, Dict[str, Any]]:
+        """Participation rate per cohort label (e.g. user tier or signup month) in one grouped pass"""
+        labels, inverse = np.unique(np.asarray(cohorts), return_inverse=True)
+        voted = np.isin(np.asarray(user_ids, dtype=np.int64), self.voters)
+        members = np.bincount(inverse, minlength=len(labels))
+        participants = np.bincount(inverse, weights=voted, minlength=len(labels)).astype(np.int64)
+        return {
+            str(label): {
+                'users': int(members[i]),
+                'voters': int(participants[i]),
+                'participation_rate': round(float(participants[i]) / max(1, int(members[i])) * 100, 1)
+            }
+            for i, label in enumerate(labels)
+        }
+
+    def summary(self, eligible_users: Optional[int] = None) -> Dict[str, Any]:
+        """Headline figures; participation_rate is only reported for a known eligible-user count"""
+        total = self.votes_for + self.votes_against
+        has_votes = total > 0
+        summary = {
+            'proposals': len(self.proposal_ids),
+            'proposals_with_votes': int(has_votes.sum()),
+            'quorum_reached': int((total >= self.quorum_required).sum()),
+            'distinct_voters': int(len(self.voters)),
+            'average_turnout_voting_power': round(float(total[has_votes].mean()), 2) if has_votes.any() else 0.0
+        }
+        if eligible_users:
+            summary['participation_rate'] = self.participation_rate(eligible_users)
+        return summary
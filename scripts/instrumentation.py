@@ -0,0 +1,198 @@
+"""
+EcoChain Instrumentation
+Per-stage timers, latency histograms, call counters, cache hit ratios and sampled profiling
+"""
+
+import bisect
+import cProfile
+import functools
+import io
+import json
+import pstats
+import threading
+import time
+from typing import Dict, Any, Callable, Optional, Tuple
+
+# Histogram bucket upper bounds in seconds (Prometheus "le" labels)
+LATENCY_BUCKETS = [0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0]
+
+# Engine methods wrapped when instrumentation is enabled
+STAGE_PREFIXES = ('_perform_', '_calculate_')
+ENTRY_POINT_PREFIXES = ('analyze_', 'verify_', 'optimize_', 'screen_')
+
+
+class _StageStats:
+    __slots__ = ('calls', 'errors', 'total_seconds', 'max_seconds', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds: float, failed: bool):
+        self.calls += 1
+        self.errors += failed
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+
+class Instrumentation:
+    """
+    Collects per-stage metrics for an engine instance
+    Engines only wrap their methods when handed an enabled Instrumentation, so the
+    disabled path runs the original, unwrapped methods at no cost.
+    """
+
+    def __init__(self, enabled: bool = True, profile_sample_rate: float = 0.0):
+        self.enabled = enabled
+        self.stages: Dict[str, _StageStats] = {}
+        self.caches: Dict[str, Callable[[], Tuple[int, int]]] = {}
+        self.profiler = ProfileSampler(profile_sample_rate) if profile_sample_rate > 0 else None
+        self._lock = threading.Lock()
+
+    def instrument(self, engine: Any, component: Optional[str] = None):
+        """Replace the engine's stage helpers and entry points with timed wrappers"""
+        if not self.enabled:
+            return
+        component = component or type(engine).__name__
+        for name in dir(type(engine)):
+            if not name.startswith(STAGE_PREFIXES + ENTRY_POINT_PREFIXES):
+                continue
+            method = getattr(engine, name)
+            if callable(method):
+                profiled = self.profiler is not None and name.startswith(ENTRY_POINT_PREFIXES)
+                setattr(engine, name, self._wrap(f"{component}.{name}", method, profiled))
+
+    def _wrap(self, stage: str, method: Callable, profiled: bool) -> Callable:
+        stats = self.stages.setdefault(stage, _StageStats())
+        lock = self._lock
+        profiler = self.profiler if profiled else None
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            failed = True
+            start = time.perf_counter()
+            try:
+                if profiler is not None:
+                    result = profiler.call(method, *args, **kwargs)
+                else:
+                    result = method(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                with lock:
+                    stats.observe(elapsed, failed)
+
+        return timed
+
+    def register_cache(self, name: str, counters: Callable[[], Tuple[int, int]]):
+        """Track a cache through a callable returning (hits, misses)"""
+        self.caches[name] = counters
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {
+                name: {
+                    'calls': s.calls,
+                    'errors': s.errors,
+                    'total_ms': round(s.total_seconds * 1000, 3),
+                    'mean_ms': round(s.total_seconds / s.calls * 1000, 4) if s.calls else 0.0,
+                    'max_ms': round(s.max_seconds * 1000, 3),
+                    'histogram': dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], s.buckets))
+                }
+                for name, s in sorted(self.stages.items()) if s.calls
+            }
+        caches = {}
+        for name, counters in sorted(self.caches.items()):
+            hits, misses = counters()
+            caches[name] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else None
+            }
+        return {'stages': stages, 'caches': caches}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Snapshot in the Prometheus text exposition format"""
+        lines = [
+            '# HELP ecochain_stage_seconds Latency of engine stages',
+            '# TYPE ecochain_stage_seconds histogram'
+        ]
+        with self._lock:
+            for name, s in sorted(self.stages.items()):
+                if not s.calls:
+                    continue
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + [float('inf')], s.buckets):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'ecochain_stage_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'ecochain_stage_seconds_sum{{stage="{name}"}} {s.total_seconds:.9f}')
+                lines.append(f'ecochain_stage_seconds_count{{stage="{name}"}} {s.calls}')
+            lines.append('# HELP ecochain_stage_errors_total Stage calls that raised')
+            lines.append('# TYPE ecochain_stage_errors_total counter')
+            for name, s in sorted(self.stages.items()):
+                if s.calls:
+                    lines.append(f'ecochain_stage_errors_total{{stage="{name}"}} {s.errors}')
+
+        lines.append('# HELP ecochain_cache_requests_total Cache lookups by result')
+        lines.append('# TYPE ecochain_cache_requests_total counter')
+        for name, counters in sorted(self.caches.items()):
+            hits, misses = counters()
+            lines.append(f'ecochain_cache_requests_total{{cache="{name}",result="hit"}} {hits}')
+            lines.append(f'ecochain_cache_requests_total{{cache="{name}",result="miss"}} {misses}')
+        return '\n'.join(lines) + '\n'
+
+
+class ProfileSampler:
+    """
+    Runs a deterministic sample of calls under cProfile and accumulates the stats
+    With sample_rate=0.01 every 100th entry-point call is profiled.
+    """
+
+    def __init__(self, sample_rate: float):
+        self.interval = max(1, round(1 / sample_rate))
+        self.calls = 0
+        self.profiled_calls = 0
+        self.stats: Optional[pstats.Stats] = None
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            sampled = self.calls % self.interval == 0
+        if not sampled:
+            return fn(*args, **kwargs)
+
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(fn, *args, **kwargs)
+        finally:
+            with self._lock:
+                self.profiled_calls += 1
+                if self.stats is None:
+                    self.stats = pstats.Stats(profile)
+                else:
+                    self.stats.add(profile)
+
+    def top(self, limit: int = 20, sort: str = 'cumulative') -> str:
+        """Hot spots across every sampled call, as pstats text"""
+        if self.stats is None:
+            return ''
+        out = io.StringIO()
+        self.stats.stream = out
+        self.stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def dump(self, path: str):
+        """Write accumulated stats for snakeviz / pstats"""
+        if self.stats is not None:
+            self.stats.dump_stats(path)
@@ -0,0 +1,270 @@
+"""
+EcoChain Leaderboards
+Streaming top-K wallet leaderboards: overall eco score, eco score within each tier, and
+carbon offset per action type
+"""
+
+import bisect
+import json
+from typing import Dict, List, Any, Callable, Iterable, Optional, Tuple
+
+import numpy as np
+
+OVERALL = 'overall'
+
+
+def tier_board(tier: str) -> str:
+    return f"tier:{tier}"
+
+
+def action_board(action_type: str) -> str:
+    return f"action:{action_type}"
+
+
+class Leaderboard:
+    """
+    Exact top of one board, maintained incrementally
+    Every member's current score is kept (the source for rebuilds); the best k + slack are
+    tracked best-first in a bounded list kept ordered with bisect, so an update costs
+    O(log K) plus one short memmove and a page read copies only the page. Tracked entries
+    always outrank untracked ones; a tracked member that falls below the tracked floor is
+    dropped, and once fewer than k remain tracked the board is rebuilt from every score
+    with argpartition in O(n). The slack absorbs score drops between rebuilds.
+    """
+
+    def __init__(self, name: str, k: int = 100, slack: Optional[int] = None):
+        self.name = name
+        self.k = k
+        self.capacity = k + (k if slack is None else slack)
+        self.version = 0
+        self.rebuilds = 0
+        self._scores: Dict[str, float] = {}
+        # (-score, member): ascending order is best first, ties broken by wallet address
+        self._top: List[Tuple[float, str]] = []
+        self._tracked: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def score(self, member: str) -> Optional[float]:
+        return self._scores.get(member)
+
+    def update(self, member: str, score: float):
+        """Set a member's score, adding the member if new"""
+        score = float(score)
+        if self._scores.get(member) == score:
+            return
+        self._scores[member] = score
+        self.version += 1
+        self._untrack(member)
+
+        entry = (-score, member)
+        all_tracked = len(self._top) == len(self._scores) - 1
+        if all_tracked or (self._top and entry < self._top[-1]):
+            bisect.insort(self._top, entry)
+            self._tracked[member] = -score
+            if len(self._top) > self.capacity:
+                _, evicted = self._top.pop()
+                del self._tracked[evicted]
+        self._check_depth()
+
+    def remove(self, member: str):
+        if self._scores.pop(member, None) is None:
+            return
+        self.version += 1
+        self._untrack(member)
+        self._check_depth()
+
+    def _untrack(self, member: str):
+        negated = self._tracked.pop(member, None)
+        if negated is not None:
+            del self._top[bisect.bisect_left(self._top, (negated, member))]
+
+    def _check_depth(self):
+        if len(self._top) < min(self.k, len(self._scores)):
+            self.rebuild()
+
+    def rebuild(self):
+        """Re-select the tracked entries from every score: argpartition, then sort only the winners"""
+        members = list(self._scores)
+        values = np.fromiter(self._scores.values(), dtype=float, count=len(members))
+        if len(members) > self.capacity:
+            chosen = np.argpartition(-values, self.capacity - 1)[:self.capacity]
+            # Members tied with the cut score are admitted in address order, as the ordering demands
+            cut = values[chosen].min()
+            above = np.flatnonzero(values > cut).tolist()
+            tied = sorted(members[i] for i in np.flatnonzero(values == cut).tolist())
+            entries = [(-values[i], members[i]) for i in above]
+            entries += [(-cut, member) for member in tied[:self.capacity - len(above)]]
+        else:
+            entries = [(-values[i], member) for i, member in enumerate(members)]
+        self._top = sorted((float(negated), member) for negated, member in entries)
+        self._tracked = {member: negated for negated, member in self._top}
+        self.rebuilds += 1
+
+    def replace_all(self, members: Iterable[str], scores: Iterable[float]):
+        """Load a full batch of scores, replacing the board's contents, with a single rebuild"""
+        self._scores = dict(zip(members, np.asarray(list(scores), dtype=float).tolist()))
+        self.version += 1
+        self.rebuild()
+
+    # Reads
+
+    def page(self, page: int = 0, size: int = 20) -> Dict[str, Any]:
+        """One page of the top k; costs O(size)"""
+        if page < 0 or size < 1:
+            raise ValueError(f"page must be >= 0 and size >= 1, got page={page}, size={size}")
+        start = page * size
+        entries = self._top[start:max(start, min(start + size, self.k))]
+        return {
+            'board': self.name,
+            'page': page,
+            'size': size,
+            'pages': -(-min(self.k, len(self._top)) // size),
+            'total_members': len(self._scores),
+            'version': self.version,
+            'entries': [{'rank': start + i + 1, 'wallet_address': member, 'score': -negated}
+                        for i, (negated, member) in enumerate(entries)]
+        }
+
+    def rank(self, member: str) -> Optional[int]:
+        """1-based rank when the member is within the top k"""
+        negated = self._tracked.get(member)
+        if negated is None:
+            return None
+        rank = bisect.bisect_left(self._top, (negated, member)) + 1
+        return rank if rank <= self.k else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Frozen copy of the top k that can be paginated consistently while updates continue"""
+        return {
+            'board': self.name,
+            'version': self.version,
+            'total_members': len(self._scores),
+            'entries': [{'rank': i + 1, 'wallet_address': member, 'score': -negated}
+                        for i, (negated, member) in enumerate(self._top[:self.k])]
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'k': self.k, 'slack': self.capacity - self.k, 'scores': self._scores}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Leaderboard':
+        board = cls(data['name'], data['k'], data['slack'])
+        board.replace_all(data['scores'].keys(), data['scores'].values())
+        return board
+
+
+class Leaderboards:
+    """
+    The platform's leaderboards, fed by user analyses, score changes or new eco actions
+    'overall' ranks wallets by eco score; 'tier:<tier>' ranks them within the tier
+    tier_fn assigns (EcoChainAnalytics._get_user_tier), moving a wallet between tier
+    boards when its score crosses a boundary; 'action:<type>' ranks cumulative carbon
+    offset per action type. The boards mapping is copied rather than changed in place
+    when boards are added or dropped, so other threads can read names() while a writer
+    updates the boards.
+    """
+
+    def __init__(self, tier_fn: Callable[[float], str], k: int = 100, slack: Optional[int] = None):
+        self.tier_fn = tier_fn
+        self.k = k
+        self.slack = slack
+        self.boards: Dict[str, Leaderboard] = {OVERALL: Leaderboard(OVERALL, k, slack)}
+        self._tiers: Dict[str, str] = {}
+
+    def board(self, name: str) -> Leaderboard:
+        board = self.boards.get(name)
+        if board is None:
+            board = Leaderboard(name, self.k, self.slack)
+            self.boards = {**self.boards, name: board}
+        return board
+
+    def names(self) -> List[str]:
+        return sorted(self.boards)
+
+    def update_score(self, wallet: str, eco_score: float):
+        self.boards[OVERALL].update(wallet, eco_score)
+        tier = self.tier_fn(eco_score)
+        previous = self._tiers.get(wallet)
+        if previous is not None and previous != tier:
+            self.boards[tier_board(previous)].remove(wallet)
+        self._tiers[wallet] = tier
+        self.board(tier_board(tier)).update(wallet, eco_score)
+
+    def set_carbon_offsets(self, wallet: str, offsets_by_action: Dict[str, float]):
+        """Cumulative carbon offset per action type, e.g. carbon_impact['category_breakdown']"""
+        for action_type, offset in offsets_by_action.items():
+            self.board(action_board(action_type)).update(wallet, offset)
+
+    def add_eco_actions(self, actions: Iterable[Dict[str, Any]]):
+        """Fold newly recorded eco action rows (wallet_address, type, carbon_offset) into the action boards"""
+        increments: Dict[Tuple[str, str], float] = {}
+        for action in actions:
+            key = (action.get('action_type', action.get('type', 'unknown')),
+                   action.get('wallet_address', action.get('user_id')))
+            increments[key] = increments.get(key, 0.0) + float(action.get('carbon_offset', 0) or 0)
+        for (action_type, wallet), offset in increments.items():
+            board = self.board(action_board(action_type))
+            board.update(wallet, (board.score(wallet) or 0.0) + offset)
+
+    def record_analysis(self, analysis: Dict[str, Any]):
+        """Update every board from an analyze_user_sustainability_impact result"""
+        wallet = analysis['user_id']
+        self.update_score(wallet, analysis['eco_score']['overall_score'])
+        self.set_carbon_offsets(wallet, analysis['carbon_impact']['category_breakdown'])
+
+    def record_analyses(self, analyses: Iterable[Dict[str, Any]]):
+        """record_analysis for each result of a batch, in order"""
+        for analysis in analyses:
+            self.record_analysis(analysis)
+
+    def rebuild(self, wallets: List[str], eco_scores: Iterable[float],
+                offsets_by_action: Optional[Dict[str, Tuple[List[str], Iterable[float]]]] = None):
+        """
+        Replace the boards from a full batch: wallets with their eco scores, and per action
+        type (wallets, cumulative offsets). Tiers are assigned once per distinct score.
+        """
+        scores = np.asarray(list(eco_scores), dtype=float)
+        self.boards[OVERALL].replace_all(wallets, scores)
+        distinct, inverse = np.unique(scores, return_inverse=True)
+        distinct_tiers = [self.tier_fn(float(score)) for score in distinct]
+        tier_names = sorted(set(distinct_tiers))
+        codes = np.array([tier_names.index(t) for t in distinct_tiers], dtype=np.int64)[inverse]
+        self._tiers = dict(zip(wallets, [tier_names[c] for c in codes.tolist()]))
+        boards = {name: board for name, board in self.boards.items() if not name.startswith('tier:')}
+        for code, tier in enumerate(tier_names):
+            selected = np.flatnonzero(codes == code)
+            board = boards[tier_board(tier)] = Leaderboard(tier_board(tier), self.k, self.slack)
+            board.replace_all([wallets[i] for i in selected.tolist()], scores[selected])
+        self.boards = boards
+        for action_type, (action_wallets, offsets) in (offsets_by_action or {}).items():
+            self.board(action_board(action_type)).replace_all(action_wallets, offsets)
+
+    def page(self, board: str, page: int = 0, size: int = 20) -> Dict[str, Any]:
+        leaderboard = self.boards.get(board)
+        if leaderboard is None:
+            raise KeyError(board)
+        return leaderboard.page(page, size)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: board.snapshot() for name, board in sorted(self.boards.items())}
+
+    def save(self, path: str):
+        """Persist every member's scores; tracked tops are rebuilt on load"""
+        with open(path, 'w') as f:
+            json.dump({'k': self.k, 'slack': self.slack,
+                       'boards': [board.to_dict() for board in self.boards.values()]}, f)
+
+    @classmethod
+    def load(cls, path: str, tier_fn: Callable[[float], str]) -> 'Leaderboards':
+        with open(path) as f:
+            data = json.load(f)
+        leaderboards = cls(tier_fn, data['k'], data['slack'])
+        for board_data in data['boards']:
+            board = Leaderboard.from_dict(board_data)
+            leaderboards.boards[board.name] = board
+            if board.name.startswith('tier:'):
+                tier = board.name[len('tier:'):]
+                leaderboards._tiers.update((wallet, tier) for wallet in board_data['scores'])
+        return leaderboards
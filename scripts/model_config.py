@@ -0,0 +1,284 @@
+"""
+EcoChain Model Configuration
+Versioned model tables (eco action categories, risk factors, valuation weights, project
+ranges) compiled into read-only lookup tables indexed by category code, reloaded live
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from functools import cached_property
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model-config.json')
+
+WILDCARD = '*'
+
+logger = logging.getLogger('ecochain.model_config')
+
+
+def _mapping(value: Any, where: str, allow_empty: bool = False) -> Mapping[str, Any]:
+    if not isinstance(value, Mapping):
+        raise TypeError(f"{where}: expected an object, got {type(value).__name__}")
+    if not value and not allow_empty:
+        raise ValueError(f"{where}: must not be empty")
+    return value
+
+
+def _list(value: Any, where: str) -> list:
+    if not isinstance(value, list) or not value:
+        raise TypeError(f"{where}: expected a non-empty list, got {value!r}")
+    return value
+
+
+def _number(value: Any, where: str) -> float:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"{where}: {value!r} is not a finite number")
+    return number
+
+
+def _range(value: Any, where: str) -> Tuple[float, float]:
+    bounds = _list(value, where)
+    if len(bounds) != 2:
+        raise ValueError(f"{where}: expected [low, high]")
+    low, high = _number(bounds[0], where), _number(bounds[1], where)
+    if not low <= high:
+        raise ValueError(f"{where}: low {low} exceeds high {high}")
+    return low, high
+
+
+class CompiledModelConfig:
+    """
+    One version of the model configuration, compiled for lookups
+    A category's code is its position in the file. Scalar lookups read tuples indexed by
+    code; every mapping handed out is read-only, so a compiled version can be shared by
+    any number of threads and engines. NumPy views of the same tables (arrays) are built
+    on first use, keeping NumPy out of single-analysis start-up. Every weight, reward and
+    range is converted to a number while compiling (integers stay ints, anything else
+    becomes a float), so a malformed file fails here rather than inside an analysis;
+    digest identifies the content, whatever its version label.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        config = _mapping(config, 'model config')
+        # Key order is kept: category codes follow the file
+        self.digest = hashlib.blake2b(json.dumps(config, separators=(',', ':')).encode(),
+                                      digest_size=16).hexdigest()
+        self.version = str(config.get('version', 'unversioned'))
+        self.analytics_models = MappingProxyType({
+            name: str(version) for name, version in _mapping(config['analytics_models'], 'analytics_models').items()
+        })
+
+        actions = _mapping(config['eco_actions'], 'eco_actions')
+        eco_actions = {}
+        for name, spec in actions.items():
+            where = f"eco_actions.{name}"
+            spec = _mapping(spec, where)
+            eco_actions[name] = MappingProxyType(dict(
+                spec,
+                base_reward=_number(spec['base_reward'], f"{where}.base_reward"),
+                carbon_factor=_number(spec['carbon_factor'], f"{where}.carbon_factor"),
+                difficulty=str(spec['difficulty']),
+                verification_methods=tuple(str(method) for method in
+                                           _list(spec['verification_methods'], f"{where}.verification_methods"))
+            ))
+            if eco_actions[name]['carbon_factor'] <= 0:
+                raise ValueError(f"{where}: carbon_factor must be positive")
+        self.eco_actions = MappingProxyType(eco_actions)
+        self.action_types = tuple(eco_actions)
+        self.action_code = MappingProxyType({name: i for i, name in enumerate(self.action_types)})
+        self.base_reward = tuple(eco_actions[name]['base_reward'] for name in self.action_types)
+        self.carbon_factor = tuple(eco_actions[name]['carbon_factor'] for name in self.action_types)
+        self.difficulty = tuple(eco_actions[name]['difficulty'] for name in self.action_types)
+
+        self.risk_factors = MappingProxyType({
+            name: _number(weight, f"risk_factors.{name}")
+            for name, weight in _mapping(config['risk_factors'], 'risk_factors').items()
+        })
+        self.risk_factor_names = tuple(self.risk_factors)
+        self.risk_weights = tuple(self.risk_factors.values())
+
+        valuation = _mapping(config['valuation_weights'], 'valuation_weights')
+        self.valuation_methods = tuple(str(m) for m in _list(valuation['methods'], 'valuation_weights.methods'))
+        asset_weights = _mapping(valuation['asset_types'], 'valuation_weights.asset_types')
+        self.asset_types = tuple(asset_weights)
+        self.asset_code = MappingProxyType({name: i for i, name in enumerate(self.asset_types)})
+        self._valuation_table = []
+        for name in self.asset_types:
+            where = f"valuation_weights.{name}"
+            weights = [_number(w, where) for w in _list(asset_weights[name], where)]
+            if len(weights) != len(self.valuation_methods):
+                raise ValueError(f"{where}: expected {len(self.valuation_methods)} weights")
+            if abs(sum(weights) - 1) > 1e-9:
+                raise ValueError(f"{where}: weights sum to {sum(weights)}, not 1")
+            self._valuation_table.append(MappingProxyType(dict(zip(self.valuation_methods, weights))))
+        self._valuation_table = tuple(self._valuation_table)
+        if valuation['default'] not in self.asset_code:
+            raise ValueError(f"valuation_weights.default: unknown asset type {valuation['default']!r}")
+        self.default_asset_code = self.asset_code[valuation['default']]
+
+        # Named project types take codes 0..n-1; the wildcard row, code n, covers any other type
+        projects = _mapping(config['project_types'], 'project_types')
+        if WILDCARD not in projects:
+            raise ValueError(f"project_types: missing the {WILDCARD!r} row for other types")
+        self.project_types = tuple(name for name in projects if name != WILDCARD)
+        self.project_code = MappingProxyType({name: i for i, name in enumerate(self.project_types)})
+        self.default_project_code = len(self.project_types)
+        rows = self.project_types + (WILDCARD,)
+        self.offset_potential = tuple(_range(_mapping(projects[name], f"project_types.{name}")['offset_potential'],
+                                             f"project_types.{name}.offset_potential") for name in rows)
+        self.permanence = tuple(_range(projects[name]['permanence'], f"project_types.{name}.permanence")
+                                for name in rows)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'CompiledModelConfig':
+        with open(path or DEFAULT_CONFIG_PATH) as f:
+            return cls(json.load(f))
+
+    # Scalar lookups
+
+    def valuation_weights(self, asset_type: str) -> Mapping[str, float]:
+        """Method -> weight for an asset type; unknown types use the default type's weights"""
+        return self._valuation_table[self.asset_code.get(asset_type, self.default_asset_code)]
+
+    def project_code_of(self, project_type: str) -> int:
+        return self.project_code.get(project_type, self.default_project_code)
+
+    def offset_range(self, project_type: str) -> Tuple[float, float]:
+        """Annual CO2 reduction range (tonnes) for a project type"""
+        return self.offset_potential[self.project_code_of(project_type)]
+
+    def permanence_range(self, project_type: str) -> Tuple[float, float]:
+        return self.permanence[self.project_code_of(project_type)]
+
+    # Vectorized lookups
+
+    @cached_property
+    def arrays(self) -> Mapping[str, 'np.ndarray']:
+        """
+        Read-only NumPy tables indexed by category code: base_reward, carbon_factor
+        (action), risk_weights (risk factor), valuation_weights (asset x method), and
+        offset_potential, permanence (project x [low, high], wildcard row last)
+        """
+        import numpy as np
+
+        tables = {
+            'base_reward': np.array(self.base_reward, dtype=float),
+            'carbon_factor': np.array(self.carbon_factor, dtype=float),
+            'risk_weights': np.array(self.risk_weights, dtype=float),
+            'valuation_weights': np.array([[w[m] for m in self.valuation_methods] for w in self._valuation_table]),
+            'offset_potential': np.array(self.offset_potential, dtype=float),
+            'permanence': np.array(self.permanence, dtype=float)
+        }
+        for table in tables.values():
+            table.flags.writeable = False
+        return MappingProxyType(tables)
+
+    def codes(self, names: Iterable[str], kind: str = 'action') -> 'np.ndarray':
+        """
+        Category codes for a batch of names, for indexing arrays; kind is 'action',
+        'asset' or 'project'. Unknown assets and projects map to their default row;
+        unknown actions map to -1.
+        """
+        import numpy as np
+
+        code, default = {
+            'action': (self.action_code, -1),
+            'asset': (self.asset_code, self.default_asset_code),
+            'project': (self.project_code, self.default_project_code)
+        }[kind]
+        return np.array([code.get(name, default) for name in names], dtype=np.int64)
+
+
+class ModelConfigRegistry:
+    """
+    The current model configuration, reloaded when its file changes
+    A reload parses and compiles the new file completely before a single reference
+    assignment publishes it, so readers in any thread see the old version or the new one,
+    never a mix; a file that fails to parse or validate, or that changes content without
+    changing its version, is logged and the running version kept. Reads check the file at most every check_interval seconds (None turns the check
+    off), so running workers pick up an edit without a restart.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: Optional[float] = 1.0):
+        self.path = path or DEFAULT_CONFIG_PATH
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._stamp = self._file_stamp()
+        self._current = CompiledModelConfig.load(self.path)
+        self._next_check = time.monotonic() + (check_interval or 0)
+
+    def _file_stamp(self) -> Tuple[int, int, int]:
+        # The inode changes when the file is replaced by rename, the usual way to publish it
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    @property
+    def current(self) -> CompiledModelConfig:
+        """The configuration to use for one analysis; read it once and keep the reference"""
+        if self.check_interval is not None and time.monotonic() >= self._next_check:
+            self.reload(blocking=False)
+        return self._current
+
+    @property
+    def version(self) -> str:
+        return self._current.version
+
+    def reload(self, force: bool = False, blocking: bool = True) -> bool:
+        """Recompile the file if it changed (or when forced); True when a new version was published"""
+        if not self._lock.acquire(blocking):
+            # Another thread is already checking
+            return False
+        try:
+            self._next_check = time.monotonic() + (self.check_interval or 0)
+            try:
+                stamp = self._file_stamp()
+            except OSError as exc:
+                logger.warning("⚠️ Model config %s unreadable, keeping %s: %s", self.path, self._current.version, exc)
+                return False
+            if stamp == self._stamp and not force:
+                return False
+            self._stamp = stamp
+            try:
+                compiled = CompiledModelConfig.load(self.path)
+            except Exception as exc:
+                logger.error("❌ Model config %s rejected, keeping %s: %r", self.path, self._current.version, exc)
+                return False
+            if compiled.digest == self._current.digest:
+                return False
+            if compiled.version == self._current.version:
+                logger.error("❌ Model config %s rejected: content changed but version is still %s",
+                             self.path, compiled.version)
+                return False
+            self._current = compiled
+            self.reloads += 1
+            logger.info("🔄 Model config %s loaded from %s", compiled.version, self.path)
+            return True
+        finally:
+            self._lock.release()
+
+
+_default_registry: Optional[ModelConfigRegistry] = None
+_default_lock = threading.Lock()
+
+
+def default_registry() -> ModelConfigRegistry:
+    """Registry for DEFAULT_CONFIG_PATH, shared by every engine in the process"""
+    global _default_registry
+    if _default_registry is None:
+        with _default_lock:
+            if _default_registry is None:
+                _default_registry = ModelConfigRegistry()
+    return _default_registry
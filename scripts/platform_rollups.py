@@ -0,0 +1,224 @@
+"""
+EcoChain Platform Rollups
+Incrementally maintained daily, weekly and monthly aggregates backing platform metrics
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+# Additive measures kept per bucket; distinct active users are tracked separately
+MEASURES = ['new_users', 'eco_actions', 'carbon_offset', 'eco_distributed', 'utility_payments_volume']
+
+
+def _to_date(value: Any) -> date:
+    """Normalize a timestamp, datetime or ISO string to a calendar date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value)[:10]).date()
+
+
+def _week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+class _Bucket:
+    """Aggregates for one day, week or month"""
+
+    __slots__ = ('totals', 'active_users')
+
+    def __init__(self):
+        self.totals = dict.fromkeys(MEASURES, 0.0)
+        self.active_users: Set[str] = set()
+
+    def merge(self, other: '_Bucket', distinct_users: bool = True):
+        for measure in MEASURES:
+            self.totals[measure] += other.totals[measure]
+        if distinct_users:
+            self.active_users |= other.active_users
+
+
+class PlatformRollups:
+    """
+    Materialized platform aggregates at daily, weekly and monthly granularity
+    New events update their daily bucket in place; weekly and monthly buckets covering a
+    changed day are marked stale and rebuilt from their days on the next read.
+    """
+
+    def __init__(self):
+        self.daily: Dict[date, _Bucket] = {}
+        self.weekly: Dict[date, _Bucket] = {}
+        self.monthly: Dict[date, _Bucket] = {}
+        self._stale_weeks: Set[date] = set()
+        self._stale_months: Set[date] = set()
+
+    # Ingestion
+
+    def add_users(self, users: List[Dict[str, Any]]):
+        """Record user registrations (rows shaped like the users table)"""
+        for user in users:
+            bucket = self._touch(user.get('created_at'))
+            bucket.totals['new_users'] += 1
+
+    def add_eco_actions(self, actions: List[Dict[str, Any]]):
+        """Record eco actions (rows shaped like the eco_actions table); rejected actions are skipped"""
+        for action in actions:
+            if action.get('status') == 'rejected':
+                continue
+            bucket = self._touch(action.get('created_at') or action.get('timestamp'))
+            bucket.totals['eco_actions'] += 1
+            bucket.totals['carbon_offset'] += float(action.get('carbon_offset', 0) or 0)
+            bucket.totals['eco_distributed'] += float(action.get('eco_reward', 0) or 0)
+            user = action.get('user_id', action.get('wallet_address'))
+            if user is not None:
+                bucket.active_users.add(str(user))
+
+    def add_utility_payments(self, payments: List[Dict[str, Any]]):
+        """Record utility payments (rows shaped like the utility_payments table); failed payments are skipped"""
+        for payment in payments:
+            if payment.get('payment_status') == 'failed':
+                continue
+            bucket = self._touch(payment.get('created_at'))
+            bucket.totals['utility_payments_volume'] += float(payment.get('amount_usd', 0) or 0)
+            user = payment.get('user_id', payment.get('wallet_address'))
+            if user is not None:
+                bucket.active_users.add(str(user))
+
+    def _touch(self, timestamp: Any) -> _Bucket:
+        """Return the daily bucket for a timestamp and mark the enclosing tiers stale"""
+        day = _to_date(timestamp if timestamp is not None else datetime.now())
+        bucket = self.daily.get(day)
+        if bucket is None:
+            bucket = self.daily[day] = _Bucket()
+        self._stale_weeks.add(_week_start(day))
+        self._stale_months.add(_month_start(day))
+        return bucket
+
+    # Tier maintenance
+
+    def refresh(self):
+        """Rebuild only the weekly and monthly buckets that saw new data"""
+        for week in self._stale_weeks:
+            self.weekly[week] = self._rebuild(week, week + timedelta(days=7))
+        for month in self._stale_months:
+            self.monthly[month] = self._rebuild(month, _next_month(month))
+        self._stale_weeks.clear()
+        self._stale_months.clear()
+
+    def _rebuild(self, start: date, end: date) -> _Bucket:
+        bucket = _Bucket()
+        day = start
+        while day < end:
+            daily = self.daily.get(day)
+            if daily is not None:
+                bucket.merge(daily)
+            day += timedelta(days=1)
+        return bucket
+
+    # Queries
+
+    def _plan(self, start: date, end: date) -> List[Tuple[Dict[date, _Bucket], date]]:
+        """Cover [start, end] with as few precomputed buckets as possible, coarsest first"""
+        plan = []
+        day = start
+        while day <= end:
+            if day.day == 1 and _next_month(day) - timedelta(days=1) <= end:
+                plan.append((self.monthly, day))
+                day = _next_month(day)
+            elif day.weekday() == 0 and day + timedelta(days=6) <= end:
+                plan.append((self.weekly, day))
+                day += timedelta(days=7)
+            else:
+                plan.append((self.daily, day))
+                day += timedelta(days=1)
+        return plan
+
+    def query(self, start: Any, end: Any, distinct_users: bool = True) -> Dict[str, Any]:
+        """
+        Aggregate every measure over an inclusive date range
+        Distinct active users need the union of every covered bucket's user set; pass
+        distinct_users=False when only the additive measures are wanted.
+        """
+        self.refresh()
+        start, end = _to_date(start), _to_date(end)
+        result = _Bucket()
+        plan = self._plan(start, end)
+        for tier, key in plan:
+            bucket = tier.get(key)
+            if bucket is not None:
+                result.merge(bucket, distinct_users)
+
+        totals = {
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            **{measure: round(value, 6) for measure, value in result.totals.items()},
+            'buckets_read': len(plan)
+        }
+        if distinct_users:
+            totals['active_users'] = len(result.active_users)
+        return totals
+
+    def platform_metrics(self, as_of: Optional[Any] = None) -> Dict[str, Any]:
+        """Headline platform metrics read from the rollups"""
+        as_of = _to_date(as_of) if as_of is not None else (max(self.daily) if self.daily else date.today())
+        # Lifetime figures are additive; only the 30-day window pays for a distinct-user union
+        lifetime = self.query(min(self.daily, default=as_of), as_of, distinct_users=False)
+        recent = self.query(as_of - timedelta(days=29), as_of)
+
+        return {
+            'total_users': int(lifetime['new_users']),
+            'active_users_30d': recent['active_users'],
+            'total_eco_actions': int(lifetime['eco_actions']),
+            'total_carbon_offset': round(lifetime['carbon_offset'], 2),
+            'eco_tokens_distributed': round(lifetime['eco_distributed'], 2),
+            'utility_payments_volume': round(lifetime['utility_payments_volume'], 2)
+        }
+
+    def to_platform_stats_rows(self) -> List[Dict[str, Any]]:
+        """Cumulative per-day rows matching the platform_stats table"""
+        rows = []
+        running = dict.fromkeys(MEASURES, 0.0)
+        for day in sorted(self.daily):
+            for measure in MEASURES:
+                running[measure] += self.daily[day].totals[measure]
+            rows.append({
+                'stat_date': day.isoformat(),
+                'total_users': int(running['new_users']),
+                'total_eco_distributed': round(running['eco_distributed'], 8),
+                'total_carbon_offset': round(running['carbon_offset'], 6),
+                'total_utility_payments': round(running['utility_payments_volume'], 2)
+            })
+        return rows
+
+    # Persistence
+
+    def save(self, path: str):
+        """Persist the daily tier; coarser tiers are rebuilt on load"""
+        payload = {
+            day.isoformat(): {'totals': bucket.totals, 'active_users': sorted(bucket.active_users)}
+            for day, bucket in self.daily.items()
+        }
+        with open(path, 'w') as f:
+            json.dump(payload, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'PlatformRollups':
+        rollups = cls()
+        with open(path) as f:
+            payload = json.load(f)
+        for day, data in payload.items():
+            bucket = rollups._touch(day)
+            bucket.totals.update(data['totals'])
+            bucket.active_users.update(data['active_users'])
+        rollups.refresh()
+        return rollups
@@ -0,0 +1,368 @@
+"""
+EcoChain Project Deduplication
+MinHash signatures with banded locality-sensitive hashing to find carbon offset projects
+listed more than once under slightly different names or descriptions
+"""
+
+import glob
+import json
+import os
+import re
+import zlib
+from typing import Dict, List, Any, Iterable, Optional, Set
+
+import numpy as np
+
+from rng_streams import RNGStreams
+
+_SHIFT = np.uint64(32)
+_WORD = re.compile(r'[a-z0-9]+')
+
+# Fields that describe which site a project is; type is compared but does not identify one
+IDENTIFYING_FIELDS = ('name', 'description', 'location')
+
+# Projects hashed per vectorized pass; bounds the (tokens x permutations) work array
+_SIGNATURE_BATCH = 512
+
+
+def _words(text: Any) -> List[str]:
+    return _WORD.findall(str(text or '').lower())
+
+
+def _identifiable(project: Dict[str, Any]) -> bool:
+    return any(_words(project.get(field)) for field in IDENTIFYING_FIELDS)
+
+
+def project_shingles(project: Dict[str, Any]) -> Set[str]:
+    """
+    Feature set compared between projects
+    Character trigrams of the name survive small spelling and wording changes; words and
+    word pairs of the description, location words and the project type complete the set.
+    Each feature is tagged with its field so a location word never matches a name word.
+    """
+    shingles = set()
+    name = ' '.join(_words(project.get('name')))
+    shingles.update(f"n:{name[i:i + 3]}" for i in range(max(1, len(name) - 2)) if name)
+    description = _words(project.get('description'))
+    shingles.update(f"d:{word}" for word in description)
+    shingles.update(f"d:{a} {b}" for a, b in zip(description, description[1:]))
+    shingles.update(f"l:{word}" for word in _words(project.get('location')))
+    shingles.add(f"t:{project.get('type', 'unknown')}")
+    return shingles
+
+
+class ProjectDuplicateIndex:
+    """
+    Near-duplicate index over carbon offset projects
+    Each project gets a num_perm MinHash signature, split into bands of rows_per_band rows.
+    Two projects become candidates when any band hashes identically, which happens with
+    probability 1 - (1 - s^r)^b for Jaccard similarity s; candidates are then confirmed with
+    the signature estimate of s. The defaults (16 bands of 4 rows) put the candidate curve's
+    midpoint near s = 0.5. Bucket keys of every band live in one sorted array probed with
+    a single searchsorted, so a lookup costs O(bands * log n). New projects go to a small
+    in-memory buffer that is merged into the sorted array once it outgrows a fraction of
+    the index.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.5, seed: int = 0):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.threshold = threshold
+        self.seed = seed
+
+        rng = RNGStreams(seed).generator('project_dedup', 'permutations')
+        self._a = rng.integers(0, 1 << 63, (num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, (num_perm, 1), dtype=np.uint64)
+        # Odd multipliers fold a band's rows into one 64-bit bucket key; the salt keeps bands apart
+        self._band_mix = rng.integers(0, 1 << 63, self.rows_per_band, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._band_salt = rng.integers(0, 1 << 63, (bands, 1), dtype=np.uint64)
+
+        self.keys: List[Any] = []
+        self._row_of: Dict[str, int] = {}
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._live = np.empty(0, dtype=bool)
+        self._size = 0
+
+        # Merged part: bucket keys of every band sorted ascending, and the rows they came from
+        self._sorted_keys = np.empty(0, dtype=np.uint64)
+        self._sorted_rows = np.empty(0, dtype=np.int32)
+        # Buffered part: bucket key -> rows added since the last merge
+        self._pending: Dict[int, List[int]] = {}
+        self._pending_rows = 0
+        self._replaced_rows = 0
+        # Rows already written to path by save or save_increment
+        self._saved_rows = 0
+
+    def __len__(self) -> int:
+        return int(self._live[:self._size].sum())
+
+    @staticmethod
+    def _key(project: Dict[str, Any]) -> Any:
+        return project.get('id', project.get('name'))
+
+    @staticmethod
+    def _key_text(key: Any) -> str:
+        return json.dumps(key, default=str)
+
+    # Signatures
+
+    def signatures(self, projects: List[Dict[str, Any]]) -> np.ndarray:
+        """MinHash signatures (len(projects) x num_perm, uint32), computed in vectorized batches"""
+        out = np.empty((len(projects), self.num_perm), dtype=np.uint32)
+        for start in range(0, len(projects), _SIGNATURE_BATCH):
+            batch = projects[start:start + _SIGNATURE_BATCH]
+            hashes = []
+            offsets = []
+            for project in batch:
+                offsets.append(len(hashes))
+                hashes.extend(zlib.crc32(s.encode()) for s in project_shingles(project))
+            x = np.array(hashes, dtype=np.uint64)
+            # Multiply-shift hashing: high 32 bits of (a*x + b) mod 2^64, one permutation per row
+            permuted = self._a * x
+            permuted += self._b
+            permuted >>= _SHIFT
+            out[start:start + len(batch)] = np.minimum.reduceat(permuted, offsets, axis=1).T
+        return out
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """Bucket key per (band, project): shape bands x len(signatures)"""
+        banded = signatures.astype(np.uint64).reshape(len(signatures), self.bands, self.rows_per_band)
+        return (banded * self._band_mix).sum(axis=2, dtype=np.uint64).T + self._band_salt
+
+    # Inserts
+
+    def add(self, project: Dict[str, Any]):
+        self.add_many([project])
+
+    def add_many(self, projects: List[Dict[str, Any]]):
+        """Index projects; a project whose key is already indexed replaces the earlier entry"""
+        if not projects:
+            return
+        signatures = self.signatures(projects)
+        self._insert([self._key(project) for project in projects], signatures, self._band_keys(signatures))
+
+    def _insert(self, keys: List[Any], signatures: np.ndarray, band_keys: np.ndarray):
+        needed = self._size + len(keys)
+        if needed > len(self._signatures):
+            capacity = max(needed, 2 * len(self._signatures), 1024)
+            grown = np.empty((capacity, self.num_perm), dtype=np.uint32)
+            grown[:self._size] = self._signatures[:self._size]
+            live = np.zeros(capacity, dtype=bool)
+            live[:self._size] = self._live[:self._size]
+            self._signatures, self._live = grown, live
+
+        self._signatures[self._size:needed] = signatures
+        self._live[self._size:needed] = True
+        for i, key in enumerate(keys):
+            row = self._size + i
+            previous = self._row_of.get(self._key_text(key))
+            if previous is not None:
+                self._live[previous] = False
+                self._replaced_rows += 1
+            self._row_of[self._key_text(key)] = row
+            self.keys.append(key)
+        first_row = self._size
+        self._size = needed
+        self._pending_rows += len(keys)
+
+        # Large batches go straight into the sorted array instead of through the buffer
+        if self._pending_rows > max(1024, len(self._sorted_keys) // (8 * self.bands)):
+            self.compact()
+            return
+        for i, buckets in enumerate(band_keys.T.tolist()):
+            for bucket in buckets:
+                self._pending.setdefault(bucket, []).append(first_row + i)
+
+    def compact(self):
+        """Merge buffered inserts into the sorted bucket array and drop replaced rows"""
+        if not self._pending_rows and not self._replaced_rows:
+            return
+        rows = np.flatnonzero(self._live[:self._size]).astype(np.int32)
+        band_keys = self._band_keys(self._signatures[rows]).ravel()
+        order = np.argsort(band_keys, kind='stable')
+        self._sorted_keys = band_keys[order]
+        self._sorted_rows = np.tile(rows, self.bands)[order]
+        self._pending = {}
+        self._pending_rows = 0
+        self._replaced_rows = 0
+
+    # Lookups
+
+    def _candidates(self, band_keys: np.ndarray) -> np.ndarray:
+        lo = np.searchsorted(self._sorted_keys, band_keys, side='left')
+        hi = np.searchsorted(self._sorted_keys, band_keys, side='right')
+        found = [self._sorted_rows[start:end] for start, end in zip(lo.tolist(), hi.tolist()) if end > start]
+        for bucket in band_keys.tolist():
+            pending = self._pending.get(bucket)
+            if pending:
+                found.append(np.asarray(pending, dtype=np.int32))
+        if not found:
+            return np.empty(0, dtype=np.int32)
+        rows = np.unique(np.concatenate(found))
+        return rows[self._live[rows]]
+
+    def query(self, project: Dict[str, Any], threshold: Optional[float] = None,
+              limit: int = 10) -> List[Dict[str, Any]]:
+        """Indexed projects whose estimated Jaccard similarity reaches threshold, most similar first"""
+        threshold = self.threshold if threshold is None else threshold
+        if not _identifiable(project):
+            # The type alone says nothing about which forest or facility this is
+            return []
+        signature = self.signatures([project])
+        return self._query_signature(project, signature[0], self._band_keys(signature)[:, 0], threshold, limit)
+
+    def _query_signature(self, project: Dict[str, Any], signature: np.ndarray, band_keys: np.ndarray,
+                         threshold: float, limit: int) -> List[Dict[str, Any]]:
+        rows = self._candidates(band_keys)
+        own_row = self._row_of.get(self._key_text(self._key(project)))
+        if own_row is not None:
+            rows = rows[rows != own_row]
+        if not len(rows):
+            return []
+        similarity = (self._signatures[rows] == signature).mean(axis=1)
+        keep = similarity >= threshold
+        rows, similarity = rows[keep], similarity[keep]
+        order = np.argsort(-similarity, kind='stable')[:limit]
+        return [{'project_id': self.keys[rows[i]], 'similarity': round(float(similarity[i]), 3)} for i in order]
+
+    def check(self, project: Dict[str, Any], limit: int = 10) -> Dict[str, Any]:
+        """Overlap assessment for a project about to be listed"""
+        return self._assessment(self.query(project, limit=limit))
+
+    def check_many(self, projects: List[Dict[str, Any]], limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Check then index each project in order, as check followed by add would; signatures
+        and bucket keys are computed for the whole batch in one pass, so a project is also
+        compared against those listed before it in the same batch
+        """
+        if not projects:
+            return []
+        signatures = self.signatures(projects)
+        band_keys = self._band_keys(signatures)
+        assessments = []
+        for i, project in enumerate(projects):
+            if _identifiable(project):
+                matches = self._query_signature(project, signatures[i], band_keys[:, i], self.threshold, limit)
+            else:
+                matches = []
+            assessments.append(self._assessment(matches))
+            self._insert([self._key(project)], signatures[i:i + 1], band_keys[:, i:i + 1])
+        return assessments
+
+    def _assessment(self, matches: List[Dict[str, Any]]) -> Dict[str, Any]:
+        top = matches[0]['similarity'] if matches else 0.0
+        return {
+            'possible_duplicates': matches,
+            'max_similarity': top,
+            'duplicate_risk': 'High' if top >= 0.8 else 'Medium' if matches else 'Low',
+            'indexed_projects': len(self)
+        }
+
+    def duplicate_pairs(self, threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Every pair of indexed projects at or above threshold (bucket-local comparisons only)"""
+        threshold = self.threshold if threshold is None else threshold
+        self.compact()
+        keys, rows = self._sorted_keys, self._sorted_rows
+        # Runs of equal keys are buckets; only buckets holding two or more rows produce pairs
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+        shared = ends - starts > 1
+        pairs = set()
+        for lo, hi in zip(starts[shared].tolist(), ends[shared].tolist()):
+            bucket = sorted(rows[lo:hi].tolist())
+            for i in range(len(bucket)):
+                for j in range(i + 1, len(bucket)):
+                    pairs.add((bucket[i], bucket[j]))
+        if not pairs:
+            return []
+        left, right = np.array(sorted(pairs)).T
+        similarity = (self._signatures[left] == self._signatures[right]).mean(axis=1)
+        keep = np.flatnonzero(similarity >= threshold)
+        keep = keep[np.argsort(-similarity[keep], kind='stable')]
+        return [{'project_ids': [self.keys[left[i]], self.keys[right[i]]],
+                 'similarity': round(float(similarity[i]), 3)} for i in keep]
+
+    # Persistence
+
+    def save(self, path: str):
+        """
+        Write signatures and the merged bucket array to one .npz file at exactly path,
+        atomically, folding in and removing any increments saved next to it
+        """
+        self.compact()
+        # Through a file handle, since savez_compressed appends .npz to a path without it
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                params=np.array([self.num_perm, self.bands, self.seed], dtype=np.int64),
+                threshold=np.array(self.threshold),
+                keys=np.array(json.dumps(self.keys, default=str)),
+                signatures=self._signatures[:self._size],
+                live=self._live[:self._size],
+                sorted_keys=self._sorted_keys,
+                sorted_rows=self._sorted_rows
+            )
+        os.replace(tmp_path, path)
+        # Increments left behind by a crash here are replayed on load; re-adding a key is harmless
+        for increment in self._increment_paths(path):
+            os.unlink(increment)
+        self._saved_rows = self._size
+
+    def save_increment(self, path: str):
+        """
+        Append the projects added since the last save to an uncompressed increment file next
+        to path; its cost follows the new rows rather than the index size. load replays
+        increments in order and save folds them back into path.
+        """
+        if not os.path.exists(path):
+            self.save(path)
+            return
+        if self._saved_rows == self._size:
+            return
+        existing = self._increment_paths(path)
+        sequence = int(existing[-1].rsplit('-', 1)[1]) + 1 if existing else 0
+        increment = f"{path}.increment-{sequence:06d}"
+        tmp_path = f"{increment}.tmp-{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                keys=np.array(json.dumps(self.keys[self._saved_rows:self._size], default=str)),
+                signatures=self._signatures[self._saved_rows:self._size]
+            )
+        os.replace(tmp_path, increment)
+        self._saved_rows = self._size
+
+    @staticmethod
+    def _increment_paths(path: str) -> List[str]:
+        return sorted(glob.glob(f"{glob.escape(path)}.increment-[0-9]*[0-9]"))
+
+    @classmethod
+    def load(cls, path: str) -> 'ProjectDuplicateIndex':
+        with np.load(path) as data:
+            num_perm, bands, seed = (int(v) for v in data['params'])
+            index = cls(num_perm, bands, float(data['threshold']), seed)
+            index.keys = json.loads(str(data['keys']))
+            index._signatures = data['signatures']
+            index._live = data['live']
+            index._sorted_keys = data['sorted_keys']
+            index._sorted_rows = data['sorted_rows']
+        index._size = len(index._signatures)
+        for row in np.flatnonzero(index._live):
+            index._row_of[cls._key_text(index.keys[row])] = int(row)
+        for increment in cls._increment_paths(path):
+            with np.load(increment) as data:
+                signatures = data['signatures']
+                index._insert(json.loads(str(data['keys'])), signatures, index._band_keys(signatures))
+        index._saved_rows = index._size
+        return index
+
+    @classmethod
+    def from_projects(cls, projects: Iterable[Dict[str, Any]], **kwargs) -> 'ProjectDuplicateIndex':
+        index = cls(**kwargs)
+        index.add_many(list(projects))
+        index.compact()
+        return index
@@ -0,0 +1,174 @@
+"""
+EcoChain Reward Optimizer
+Budget-constrained search over per-category eco action rewards
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Any, Mapping, Optional, Union
+
+import numpy as np
+
+from model_config import CompiledModelConfig
+
+# Prior reward elasticities used when the action history carries no reward variation
+DIFFICULTY_ELASTICITY = {
+    'easy': 0.6,
+    'medium': 0.45,
+    'hard': 0.3
+}
+
+
+class RewardOptimizer:
+    """
+    Searches reward vectors over the eco action categories
+    Maximizes projected carbon offset per budgeted token using per-category response elasticities
+    """
+
+    def __init__(self, eco_actions: Union[CompiledModelConfig, Mapping[str, Mapping[str, Any]]],
+                 min_multiplier: float = 0.5, max_multiplier: float = 2.0, batch_size: int = 4096, seed: int = 0):
+        if isinstance(eco_actions, CompiledModelConfig):
+            # A compiled configuration already holds the per-category tables as arrays
+            config = eco_actions
+            eco_actions = config.eco_actions
+            codes = config.codes(eco_actions)
+            self.base_reward = config.arrays['base_reward'][codes]
+            self.carbon_factor = config.arrays['carbon_factor'][codes]
+        else:
+            self.base_reward = np.array([float(spec['base_reward']) for spec in eco_actions.values()])
+            self.carbon_factor = np.array([float(spec['carbon_factor']) for spec in eco_actions.values()])
+        self.eco_actions = eco_actions
+        self.categories = list(eco_actions.keys())
+        self.min_multiplier = min_multiplier
+        self.max_multiplier = max_multiplier
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.last_solution: Optional[np.ndarray] = None
+
+    def estimate_response_model(self, actions: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Estimate per-category elasticities, base volumes and offset per action from history
+
+        Elasticities are the log-log slope of monthly action count against the mean reward
+        paid that month; categories without reward variation fall back to a difficulty prior.
+        """
+        n = len(self.categories)
+        index = {category: i for i, category in enumerate(self.categories)}
+        monthly_counts = [defaultdict(int) for _ in range(n)]
+        monthly_rewards = [defaultdict(float) for _ in range(n)]
+        offset_totals = np.zeros(n)
+        action_totals = np.zeros(n)
+
+        for action in actions:
+            i = index.get(action.get('type'))
+            if i is None:
+                continue
+            month = str(action.get('timestamp', ''))[:7]
+            monthly_counts[i][month] += 1
+            monthly_rewards[i][month] += action.get('eco_reward', 0)
+            offset_totals[i] += action.get('carbon_offset', 0)
+            action_totals[i] += 1
+
+        elasticity = np.empty(n)
+        base_volume = np.ones(n)
+        offset_per_action = self.carbon_factor.copy()
+        for i, category in enumerate(self.categories):
+            elasticity[i] = DIFFICULTY_ELASTICITY.get(self.eco_actions[category].get('difficulty'), 0.45)
+
+            months = list(monthly_counts[i].keys())
+            if not months:
+                continue
+            counts = np.array([monthly_counts[i][m] for m in months], dtype=float)
+            rewards = np.array([monthly_rewards[i][m] for m in months]) / counts
+            base_volume[i] = counts.mean()
+            if offset_totals[i] > 0:
+                offset_per_action[i] = offset_totals[i] / action_totals[i]
+
+            valid = rewards > 0
+            if valid.sum() >= 3:
+                log_reward = np.log(rewards[valid])
+                log_count = np.log(counts[valid])
+                variance = log_reward.var()
+                if variance > 1e-9:
+                    slope = ((log_reward - log_reward.mean()) * (log_count - log_count.mean())).mean() / variance
+                    elasticity[i] = float(np.clip(slope, 0.05, 1.5))
+
+        return {
+            'elasticity': elasticity,
+            'base_volume': base_volume,
+            'offset_per_action': offset_per_action
+        }
+
+    def evaluate(self, candidates: np.ndarray, reference: np.ndarray,
+                 model: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Project action volume, carbon offset and token spend for a batch of reward vectors"""
+        volume = model['base_volume'] * (candidates / reference) ** model['elasticity']
+        return {
+            'volume': volume.sum(axis=1),
+            'offset': volume @ model['offset_per_action'],
+            'spend': (volume * candidates).sum(axis=1)
+        }
+
+    def optimize(self, current_rewards: Dict[str, float], actions: Optional[List[Dict[str, Any]]] = None,
+                 budget: Optional[float] = None, rounds: int = 8, warm_start: bool = True) -> Dict[str, Any]:
+        """
+        Search for the reward vector with the highest projected offset within the token budget
+
+        With the budget binding, maximizing total offset is maximizing offset per budgeted
+        token. The budget defaults to the projected spend of the current structure.
+        """
+        reference = np.array([float(current_rewards.get(c, default))
+                              for c, default in zip(self.categories, self.base_reward.tolist())])
+        invalid = [c for c, r in zip(self.categories, reference) if not (np.isfinite(r) and r > 0)]
+        if invalid:
+            # Candidates are scaled relative to the current rewards, so each must be positive
+            raise ValueError(f"current rewards must be positive: {', '.join(invalid)}")
+        model = self.estimate_response_model(actions or [])
+        baseline = self.evaluate(reference[None, :], reference, model)
+        if budget is None:
+            budget = float(baseline['spend'][0])
+
+        lower = reference * self.min_multiplier
+        upper = reference * self.max_multiplier
+        sigma = 0.25
+        center = reference
+        if warm_start and self.last_solution is not None and self.last_solution.shape == reference.shape:
+            center = np.clip(self.last_solution, lower, upper)
+            sigma = 0.05
+            rounds = max(2, rounds // 3)
+
+        best = center
+        best_offset = -np.inf
+        candidates_evaluated = 0
+        elite_count = max(1, self.batch_size // 50)
+        for _ in range(rounds):
+            noise = self.rng.standard_normal((self.batch_size, len(reference)))
+            candidates = np.clip(center * np.exp(sigma * noise), lower, upper)
+            candidates[0] = best if np.isfinite(best_offset) else center
+            projected = self.evaluate(candidates, reference, model)
+            candidates_evaluated += len(candidates)
+
+            objective = np.where(projected['spend'] <= budget * (1 + 1e-9), projected['offset'], -np.inf)
+            top = int(np.argmax(objective))
+            if objective[top] > best_offset:
+                best_offset = float(objective[top])
+                best = candidates[top].copy()
+
+            elite = np.argpartition(-objective, elite_count - 1)[:elite_count]
+            elite = elite[np.isfinite(objective[elite])]
+            if len(elite):
+                center = np.exp(np.log(candidates[elite]).mean(axis=0))
+            sigma *= 0.7
+
+        if not np.isfinite(best_offset):
+            best = reference
+        self.last_solution = best
+        optimized = self.evaluate(best[None, :], reference, model)
+
+        return {
+            'optimized_rewards': {c: round(float(r), 2) for c, r in zip(self.categories, best)},
+            'elasticities': {c: round(float(e), 3) for c, e in zip(self.categories, model['elasticity'])},
+            'budget': round(budget, 2),
+            'baseline': {k: float(v[0]) for k, v in baseline.items()},
+            'optimized': {k: float(v[0]) for k, v in optimized.items()},
+            'candidates_evaluated': candidates_evaluated
+        }
@@ -0,0 +1,234 @@
+"""
+EcoChain RNG Streams
+Deterministic per-entity random streams derived from a single run seed
+"""
+
+import functools
+import hashlib
+import secrets
+from typing import Any, List, Optional, Sequence, Tuple
+
+_M32 = 0xFFFFFFFF
+_M64 = (1 << 64) - 1
+_M128 = (1 << 128) - 1
+
+# numpy.random.SeedSequence mixing constants
+_INIT_A = 0x43b0d7e5
+_MULT_A = 0x931e8875
+_INIT_B = 0x8b51f9dd
+_MULT_B = 0x58f38ded
+_MIX_MULT_L = 0xca01f9dd
+_MIX_MULT_R = 0x4973f715
+_XSHIFT = 16
+_POOL_SIZE = 4
+
+_PCG64_MULTIPLIER = 0x2360ed051fc65da44385df649fccf645
+
+
+def _key_words(key: Any) -> Tuple[int, ...]:
+    """Stable 32-bit words for an entity or stage key, independent of PYTHONHASHSEED"""
+    return _text_words(str(key))
+
+
+@functools.lru_cache(maxsize=4096)
+def _text_words(text: str) -> Tuple[int, ...]:
+    # An entity's stages and every entity's stage names repeat, so digests are memoized
+    digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+    return tuple(int.from_bytes(digest[i:i + 4], 'little') for i in range(0, 16, 4))
+
+
+def _uint32_words(value: int) -> List[int]:
+    words = []
+    while value > 0:
+        words.append(value & _M32)
+        value >>= 32
+    return words or [0]
+
+
+def _hashmix(value: int, hash_const: int) -> Tuple[int, int]:
+    value = (value ^ hash_const) & _M32
+    hash_const = (hash_const * _MULT_A) & _M32
+    value = (value * hash_const) & _M32
+    return value ^ (value >> _XSHIFT), hash_const
+
+
+def _mix(x: int, y: int) -> int:
+    result = (_MIX_MULT_L * x - _MIX_MULT_R * y) & _M32
+    return result ^ (result >> _XSHIFT)
+
+
+@functools.lru_cache(maxsize=64)
+def _run_pool(entropy: int) -> Tuple[Tuple[int, ...], int]:
+    """SeedSequence entropy pool after mixing in the run seed; shared by every stream of a run"""
+    run_words = _uint32_words(entropy)
+    run_words += [0] * (_POOL_SIZE - len(run_words))
+    hash_const = _INIT_A
+    pool = []
+    for word in run_words[:_POOL_SIZE]:
+        value, hash_const = _hashmix(word, hash_const)
+        pool.append(value)
+    for i_src in range(_POOL_SIZE):
+        for i_dst in range(_POOL_SIZE):
+            if i_src != i_dst:
+                value, hash_const = _hashmix(pool[i_src], hash_const)
+                pool[i_dst] = _mix(pool[i_dst], value)
+    for word in run_words[_POOL_SIZE:]:
+        for i_dst in range(_POOL_SIZE):
+            value, hash_const = _hashmix(word, hash_const)
+            pool[i_dst] = _mix(pool[i_dst], value)
+    return tuple(pool), hash_const
+
+
+def _seed_sequence_state(entropy: int, spawn_key: Tuple[int, ...]) -> List[int]:
+    """
+    Four 64-bit words, equal to SeedSequence(entropy, spawn_key).generate_state(4, np.uint64)
+    spawn_key must be non-empty 32-bit words (NumPy pads the run entropy only in that case).
+    """
+    pool, hash_const = _run_pool(entropy)
+    pool = list(pool)
+    for word in spawn_key:
+        for i_dst in range(_POOL_SIZE):
+            value, hash_const = _hashmix(word, hash_const)
+            pool[i_dst] = _mix(pool[i_dst], value)
+
+    hash_const = _INIT_B
+    state = []
+    for i in range(8):
+        value = (pool[i % _POOL_SIZE] ^ hash_const) & _M32
+        hash_const = (hash_const * _MULT_B) & _M32
+        value = (value * hash_const) & _M32
+        state.append(value ^ (value >> _XSHIFT))
+    return [state[i] | (state[i + 1] << 32) for i in range(0, 8, 2)]
+
+
+class ScalarStream:
+    """
+    Pure-Python PCG64 stream, draw-for-draw identical to NumPy's Generator(PCG64(seed))
+    Covers the Generator methods the scalar analysis helpers use (random, uniform,
+    integers, choice without replacement), so a single analysis never has to import NumPy.
+    """
+
+    __slots__ = ('state', 'inc', '_has_uint32', '_uint32')
+
+    def __init__(self, entropy: int, spawn_key: Tuple[int, ...]):
+        words = _seed_sequence_state(entropy, spawn_key)
+        initstate = (words[0] << 64) | words[1]
+        initseq = (words[2] << 64) | words[3]
+        self.inc = ((initseq << 1) | 1) & _M128
+        self.state = ((self.inc + initstate) * _PCG64_MULTIPLIER + self.inc) & _M128
+        self._has_uint32 = False
+        self._uint32 = 0
+
+    def _next_uint64(self) -> int:
+        state = self.state = (self.state * _PCG64_MULTIPLIER + self.inc) & _M128
+        value = ((state >> 64) ^ state) & _M64
+        rotation = state >> 122
+        return ((value >> rotation) | (value << (64 - rotation))) & _M64
+
+    def _next_uint32(self) -> int:
+        if self._has_uint32:
+            self._has_uint32 = False
+            return self._uint32
+        value = self._next_uint64()
+        self._has_uint32 = True
+        self._uint32 = value >> 32
+        return value & _M32
+
+    def _bounded(self, high: int) -> int:
+        """Integer in [0, high] by Lemire's method, as in NumPy's random_bounded_uint64"""
+        if high == 0:
+            return 0
+        if high <= _M32:
+            if high == _M32:
+                return self._next_uint32()
+            span, draw, mask, shift = high + 1, self._next_uint32, _M32, 32
+        else:
+            if high == _M64:
+                return self._next_uint64()
+            span, draw, mask, shift = high + 1, self._next_uint64, _M64, 64
+        product = draw() * span
+        if (product & mask) < span:
+            threshold = (mask - high) % span
+            while (product & mask) < threshold:
+                product = draw() * span
+        return product >> shift
+
+    def random(self, size: Optional[int] = None):
+        if size is not None:
+            return [self.random() for _ in range(size)]
+        return (self._next_uint64() >> 11) * (1.0 / 9007199254740992.0)
+
+    def uniform(self, low: float = 0.0, high: float = 1.0) -> float:
+        return low + (high - low) * self.random()
+
+    def integers(self, low: int, high: Optional[int] = None) -> int:
+        if high is None:
+            low, high = 0, low
+        return low + self._bounded(high - low - 1)
+
+    def choice(self, a: int, size: int, replace: bool = False) -> List[int]:
+        """Distinct indices from range(a) (Floyd's algorithm, then shuffled), as Generator.choice"""
+        if replace:
+            return [self.integers(a) for _ in range(size)]
+        if a > 10000 and size > a // 50:
+            # Generator.choice switches to a partial Fisher-Yates shuffle of range(a) here
+            swapped = {}
+            for i in range(a - 1, max(a - size, 1) - 1, -1):
+                j = self._bounded(i)
+                swapped[i], swapped[j] = swapped.get(j, j), swapped.get(i, i)
+            return [swapped.get(i, i) for i in range(a - size, a)]
+        seen = set()
+        picked = []
+        for j in range(a - size, a):
+            value = self._bounded(j)
+            if value in seen:
+                value = j
+            seen.add(value)
+            picked.append(value)
+        for i in range(size - 1, 0, -1):
+            j = self._bounded(i)
+            picked[i], picked[j] = picked[j], picked[i]
+        return picked
+
+
+class RNGStreams:
+    """
+    Derives an independent Generator per (entity, stage) from the run seed
+    A stream depends only on the run seed, the entity key (asset id, wallet address,
+    project id) and the stage name, so results are identical whether entities are
+    analyzed serially, on a process pool or across shards, and skipping one stage does
+    not shift the draws of another.
+    """
+
+    def __init__(self, run_seed: Optional[int] = None):
+        # Same entropy NumPy's SeedSequence(None) would draw
+        self.run_seed = int(run_seed) if run_seed is not None else secrets.randbits(128)
+        self.seeded = run_seed is not None
+
+    def _spawn_key(self, entity: Any, stage: str) -> Tuple[int, ...]:
+        return _key_words(entity) + _key_words(stage)
+
+    def generator(self, entity: Any, stage: str = ''):
+        """NumPy Generator for vectorized draws"""
+        import numpy as np
+        seed = np.random.SeedSequence(self.run_seed, spawn_key=self._spawn_key(entity, stage))
+        return np.random.Generator(np.random.PCG64(seed))
+
+    def stream(self, entity: Any, stage: str = '') -> ScalarStream:
+        """Pure-Python stream with the same draws as generator(entity, stage)"""
+        return ScalarStream(self.run_seed, self._spawn_key(entity, stage))
+
+
+def choice(rng: Any, options: Sequence[Any]) -> Any:
+    """Pick one element, keeping its Python type (Generator.choice returns NumPy scalars)"""
+    return options[int(rng.integers(len(options)))]
+
+
+def sample(rng: Any, options: Sequence[Any], k: int) -> List[Any]:
+    """k distinct elements in random order"""
+    return [options[int(i)] for i in rng.choice(len(options), size=k, replace=False)]
+
+
+def randint(rng: Any, low: int, high: int) -> int:
+    """Integer in [low, high], inclusive like random.randint"""
+    return int(rng.integers(low, high + 1))
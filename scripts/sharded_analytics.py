@@ -0,0 +1,283 @@
+"""
+EcoChain Sharded Analytics
+Hash-partitioned user analytics with mergeable per-shard partial aggregates
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from sketches import PlatformSketches
+
+logger = logging.getLogger('ecochain.sharded')
+
+SCORE_BINS = 1001  # eco scores are reported to one decimal place in [0, 100]
+
+_engine = None
+
+
+def shard_for(wallet_address: str, num_shards: int) -> int:
+    """Stable shard assignment; unlike hash() it does not change between processes"""
+    digest = hashlib.blake2b(str(wallet_address).lower().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % num_shards
+
+
+def iter_users(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream users from a JSON Lines file, one at a time"""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_shard_inputs(users: Iterable[Dict[str, Any]], input_paths: List[str]) -> List[int]:
+    """
+    Route a stream of users into one JSON Lines input file per shard
+    Only the user being routed is held in memory; each file is replaced atomically once
+    the stream ends. Returns the number of users written to each shard.
+    """
+    tmp_paths = [f"{path}.tmp-{os.getpid()}" for path in input_paths]
+    files = [open(path, 'w') for path in tmp_paths]
+    counts = [0] * len(input_paths)
+    try:
+        for user in users:
+            shard_id = shard_for(user.get('wallet_address', ''), len(input_paths))
+            files[shard_id].write(json.dumps(user, sort_keys=True, default=str) + '\n')
+            counts[shard_id] += 1
+    finally:
+        for f in files:
+            f.close()
+    for tmp_path, path in zip(tmp_paths, input_paths):
+        os.replace(tmp_path, path)
+    return counts
+
+
+def _input_digest(users: List[Dict[str, Any]]) -> str:
+    """Fingerprint of a shard's input so stale outputs are detected on restart"""
+    h = hashlib.blake2b(digest_size=16)
+    for user in users:
+        h.update(json.dumps(user, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def _load_engine():
+    """Load EcoChainAnalytics from its script once per worker process"""
+    global _engine
+    if _engine is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ecochain-analytics.py')
+        spec = importlib.util.spec_from_file_location('ecochain_analytics', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _engine = module.EcoChainAnalytics()
+    return _engine
+
+
+class ScoreDistribution:
+    """Histogram of eco scores at 0.1 resolution, used for platform ranking"""
+
+    def __init__(self, counts: Optional[np.ndarray] = None):
+        self.counts = counts if counts is not None else np.zeros(SCORE_BINS, dtype=np.int64)
+
+    def add_many(self, scores: List[float]):
+        bins = np.clip(np.rint(np.asarray(scores, dtype=float) * 10).astype(np.int64), 0, SCORE_BINS - 1)
+        self.counts += np.bincount(bins, minlength=SCORE_BINS)
+
+    def merge(self, other: 'ScoreDistribution') -> 'ScoreDistribution':
+        self.counts += other.counts
+        return self
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def rank(self, score: float) -> int:
+        """1-based rank: one plus the number of users with a strictly higher score"""
+        bin_index = int(np.clip(round(score * 10), 0, SCORE_BINS - 1))
+        return int(self.counts[bin_index + 1:].sum()) + 1
+
+    def percentile(self, score: float) -> float:
+        """Share of users scoring at or below the given score"""
+        if not self.total:
+            return 0.0
+        bin_index = int(np.clip(round(score * 10), 0, SCORE_BINS - 1))
+        return round(float(self.counts[:bin_index + 1].sum()) / self.total * 100, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        nonzero = np.flatnonzero(self.counts)
+        return {'bins': nonzero.tolist(), 'counts': self.counts[nonzero].tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScoreDistribution':
+        distribution = cls()
+        distribution.counts[np.asarray(data['bins'], dtype=np.int64)] = data['counts']
+        return distribution
+
+
+def analyze_shard(shard_id: int, users: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compute one shard's partial aggregate
+    Only deterministic engine helpers are used, so re-running a shard reproduces its output.
+    """
+    engine = _load_engine()
+    sketches = PlatformSketches()
+    distribution = ScoreDistribution()
+    totals = {'users': 0, 'eco_actions': 0, 'carbon_offset': 0.0, 'eco_distributed': 0.0,
+              'utility_payments_volume': 0.0}
+    actions_by_type: Dict[str, int] = {}
+    scores = []
+
+    for user in users:
+        actions = user.get('eco_actions', [])
+        carbon_impact = engine._calculate_carbon_impact(user)
+        eco_score = engine._calculate_eco_score(user)
+        scores.append(eco_score['overall_score'])
+
+        totals['users'] += 1
+        totals['eco_actions'] += len(actions)
+        totals['carbon_offset'] += carbon_impact['total_carbon_offset']
+        totals['eco_distributed'] += sum(a.get('eco_reward', 0) for a in actions)
+        totals['utility_payments_volume'] += sum(p.get('amount_usd', 0) for p in user.get('utility_payments', []))
+        for action in actions:
+            action_type = action.get('type', 'unknown')
+            actions_by_type[action_type] = actions_by_type.get(action_type, 0) + 1
+        sketches.add_eco_actions([dict(a, wallet_address=user.get('wallet_address')) for a in actions])
+
+    distribution.add_many(scores)
+    sketches.add_eco_scores(scores)
+
+    return {
+        'shard_id': shard_id,
+        'input_digest': _input_digest(users),
+        'totals': totals,
+        'actions_by_type': dict(sorted(actions_by_type.items())),
+        'score_distribution': distribution.to_dict(),
+        'sketches': sketches.to_dict()
+    }
+
+
+def _stored_digest(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return json.load(f).get('input_digest')
+    except (OSError, ValueError):
+        return None
+
+
+def _run_shard(shard_id: int, input_path: str, output_path: str, force: bool = False) -> bool:
+    """
+    Worker entry point: read this shard's users, analyze them and write the partial atomically
+    A shard whose stored output was computed from the same input is left as is. Returns
+    whether the shard was analyzed.
+    """
+    users = sorted(iter_users(input_path), key=lambda u: str(u.get('wallet_address', '')))
+    if not force and _stored_digest(output_path) == _input_digest(users):
+        return False
+    partial = analyze_shard(shard_id, users)
+    tmp_path = f"{output_path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        json.dump(partial, f, sort_keys=True)
+    os.replace(tmp_path, output_path)
+    return True
+
+
+class ShardedAggregate:
+    """Coordinator-side merge of every shard's partial aggregate"""
+
+    def __init__(self, partials: List[Dict[str, Any]]):
+        self.partials = partials
+        self.totals = {'users': 0, 'eco_actions': 0, 'carbon_offset': 0.0, 'eco_distributed': 0.0,
+                       'utility_payments_volume': 0.0}
+        self.actions_by_type: Dict[str, int] = {}
+        self.score_distribution = ScoreDistribution()
+        self.sketches = None
+
+        for partial in sorted(partials, key=lambda p: p['shard_id']):
+            for key, value in partial['totals'].items():
+                self.totals[key] += value
+            for action_type, count in partial['actions_by_type'].items():
+                self.actions_by_type[action_type] = self.actions_by_type.get(action_type, 0) + count
+            self.score_distribution.merge(ScoreDistribution.from_dict(partial['score_distribution']))
+            shard_sketches = PlatformSketches.from_dict(partial['sketches'])
+            self.sketches = shard_sketches if self.sketches is None else self.sketches.merge(shard_sketches)
+
+    def install(self, analytics) -> 'ShardedAggregate':
+        """Rank later analyses on analytics against the merged score distribution"""
+        analytics.score_distribution = self.score_distribution
+        return self
+
+    def platform_metrics(self, as_of: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Headline platform metrics, in the shape PlatformRollups produces
+        Shard inputs carry no time window, so instead of active_users_30d this reports
+        active_users: the distinct wallets with an action anywhere in the sharded input.
+        """
+        return {
+            'total_users': self.totals['users'],
+            'active_users': self.sketches.active_wallets.count() if self.sketches else 0,
+            'total_eco_actions': self.totals['eco_actions'],
+            'total_carbon_offset': round(self.totals['carbon_offset'], 2),
+            'eco_tokens_distributed': round(self.totals['eco_distributed'], 2),
+            'utility_payments_volume': round(self.totals['utility_payments_volume'], 2)
+        }
+
+
+class ShardedAnalytics:
+    """
+    Runs user analytics as independent shard processes and merges their outputs
+    Each shard worker reads only its own input file (inputs/shard-NNNN-of-NNNN.jsonl, one
+    user per line) and sends back nothing but its partial aggregate, written to
+    output_dir; the coordinator never holds more than one user. Inputs can be routed from
+    a users stream with run(), or exported per hash range (shard_for) by another job and
+    processed with run_shards(). A shard whose output matches its current input is not
+    re-analyzed.
+    """
+
+    def __init__(self, num_shards: int, output_dir: str, processes: Optional[int] = None):
+        self.num_shards = num_shards
+        self.output_dir = output_dir
+        self.input_dir = os.path.join(output_dir, 'inputs')
+        self.processes = processes
+        os.makedirs(self.input_dir, exist_ok=True)
+
+    def shard_path(self, shard_id: int) -> str:
+        return os.path.join(self.output_dir, f"shard-{shard_id:04d}-of-{self.num_shards:04d}.json")
+
+    def input_path(self, shard_id: int) -> str:
+        return os.path.join(self.input_dir, f"shard-{shard_id:04d}-of-{self.num_shards:04d}.jsonl")
+
+    def run(self, users: Union[str, Iterable[Dict[str, Any]]], shard_ids: Optional[List[int]] = None,
+            force: bool = False) -> ShardedAggregate:
+        """
+        Route users (a JSON Lines path or any iterable, e.g. a database cursor) into the
+        shard inputs, then run missing, stale or explicitly requested shards and merge
+        """
+        source = iter_users(users) if isinstance(users, str) else users
+        write_shard_inputs(source, [self.input_path(s) for s in range(self.num_shards)])
+        return self.run_shards(shard_ids, force)
+
+    def run_shards(self, shard_ids: Optional[List[int]] = None, force: bool = False) -> ShardedAggregate:
+        """Analyze shards from their existing input files, then merge every shard"""
+        targets = list(shard_ids if shard_ids is not None else range(self.num_shards))
+        with ProcessPoolExecutor(max_workers=self.processes) as pool:
+            futures = [pool.submit(_run_shard, s, self.input_path(s), self.shard_path(s), force)
+                       for s in targets]
+            analyzed = sum(future.result() for future in futures)
+        logger.info("🧩 Analyzed %d/%d analytics shards (%d up to date)", analyzed, self.num_shards,
+                    len(targets) - analyzed)
+        return self.merge()
+
+    def merge(self) -> ShardedAggregate:
+        partials = []
+        for shard_id in range(self.num_shards):
+            path = self.shard_path(shard_id)
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Shard {shard_id} has no output at {path}")
+            with open(path) as f:
+                partials.append(json.load(f))
+        return ShardedAggregate(partials)
@@ -0,0 +1,247 @@
+"""
+EcoChain Approximate Sketches
+Mergeable HyperLogLog and KLL sketches for platform-wide distinct counts and quantiles
+"""
+
+import base64
+import hashlib
+import math
+from typing import Dict, List, Any, Iterable, Optional
+
+import numpy as np
+
+
+def _hash64(value: Any) -> int:
+    """Stable 64-bit hash so sketches built in different processes agree"""
+    return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), 'big')
+
+
+class HyperLogLog:
+    """
+    Distinct-count sketch with 2^precision registers
+    Relative standard error is about 1.04 / sqrt(2^precision).
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, value: Any):
+        self.add_many([value])
+
+    def add_many(self, values: Iterable[Any]):
+        p = self.precision
+        width = 64 - p
+        mask = (1 << width) - 1
+        indices = []
+        ranks = []
+        for value in values:
+            h = _hash64(value)
+            indices.append(h >> width)
+            ranks.append(width - (h & mask).bit_length() + 1)
+        if indices:
+            np.maximum.at(self.registers, np.array(indices), np.array(ranks, dtype=np.uint8))
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        if other.precision != self.precision:
+            raise ValueError("cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int32)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'sketch': 'hll',
+            'precision': self.precision,
+            'registers': base64.b64encode(self.registers.tobytes()).decode()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HyperLogLog':
+        sketch = cls(data['precision'])
+        sketch.registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        return sketch
+
+
+class KLLSketch:
+    """
+    Quantile sketch built from a hierarchy of compactors
+    Rank error is roughly 1.7 / k with k items retained at the top level.
+    """
+
+    def __init__(self, k: int = 200):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.compactors: List[List[float]] = [[]]
+        self._coin = 0
+
+    @property
+    def rank_error(self) -> float:
+        return 1.7 / self.k
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def add(self, value: float):
+        self.compactors[0].append(float(value))
+        self.count += 1
+        if len(self.compactors[0]) >= self._capacity(0):
+            self._compress()
+
+    def add_many(self, values: Iterable[float]):
+        values = np.asarray(list(values) if not isinstance(values, np.ndarray) else values, dtype=float)
+        self.compactors[0].extend(values.tolist())
+        self.count += len(values)
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.compactors):
+            compactor = self.compactors[level]
+            if len(compactor) >= self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                compactor.sort()
+                # Alternate the kept half so compaction is unbiased yet deterministic
+                self._coin ^= 1
+                keep_tail = len(compactor) % 2
+                tail = compactor[-1:] if keep_tail else []
+                body = compactor[:len(compactor) - keep_tail]
+                self.compactors[level + 1].extend(body[self._coin::2])
+                self.compactors[level] = tail
+            level += 1
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantiles(self, qs: Iterable[float]) -> List[Optional[float]]:
+        items = []
+        weights = []
+        for level, compactor in enumerate(self.compactors):
+            items.extend(compactor)
+            weights.extend([1 << level] * len(compactor))
+        qs = list(qs)
+        if not items:
+            return [None] * len(qs)
+        items = np.asarray(items)
+        weights = np.asarray(weights, dtype=float)
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        targets = np.asarray(qs, dtype=float) * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, targets, side='left'), len(items) - 1)
+        return [float(v) for v in items[order][positions]]
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.quantiles([q])[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'sketch': 'kll', 'k': self.k, 'count': self.count, 'compactors': self.compactors}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'KLLSketch':
+        sketch = cls(data['k'])
+        sketch.count = data['count']
+        sketch.compactors = [list(c) for c in data['compactors']]
+        return sketch
+
+
+class PlatformSketches:
+    """
+    Bundle of sketches for one shard or one day of platform events
+    Build one per shard/day and merge them; merge the last 30 daily bundles for 30-day figures.
+    """
+
+    PERCENTILES = [0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+    def __init__(self, precision: int = 14, k: int = 200):
+        self.precision = precision
+        self.k = k
+        self.active_wallets = HyperLogLog(precision)
+        self.wallets_by_action: Dict[str, HyperLogLog] = {}
+        self.eco_scores = KLLSketch(k)
+        self.carbon_offsets = KLLSketch(k)
+
+    def add_eco_actions(self, actions: List[Dict[str, Any]]):
+        """Record eco action rows keyed by wallet_address (or user_id)"""
+        by_type: Dict[str, List[Any]] = {}
+        wallets = []
+        offsets = []
+        for action in actions:
+            wallet = action.get('wallet_address', action.get('user_id'))
+            wallets.append(wallet)
+            by_type.setdefault(action.get('action_type', action.get('type', 'unknown')), []).append(wallet)
+            offsets.append(float(action.get('carbon_offset', 0) or 0))
+        self.active_wallets.add_many(wallets)
+        for action_type, type_wallets in by_type.items():
+            if action_type not in self.wallets_by_action:
+                self.wallets_by_action[action_type] = HyperLogLog(self.precision)
+            self.wallets_by_action[action_type].add_many(type_wallets)
+        self.carbon_offsets.add_many(offsets)
+
+    def add_eco_scores(self, scores: Iterable[float]):
+        self.eco_scores.add_many(scores)
+
+    def merge(self, other: 'PlatformSketches') -> 'PlatformSketches':
+        self.active_wallets.merge(other.active_wallets)
+        for action_type, sketch in other.wallets_by_action.items():
+            if action_type not in self.wallets_by_action:
+                self.wallets_by_action[action_type] = HyperLogLog(self.precision)
+            self.wallets_by_action[action_type].merge(sketch)
+        self.eco_scores.merge(other.eco_scores)
+        self.carbon_offsets.merge(other.carbon_offsets)
+        return self
+
+    def summary(self) -> Dict[str, Any]:
+        labels = [f"p{round(q * 100)}" for q in self.PERCENTILES]
+        return {
+            'active_wallets': self.active_wallets.count(),
+            'distinct_wallets_by_action': {t: s.count() for t, s in sorted(self.wallets_by_action.items())},
+            'eco_score_percentiles': dict(zip(labels, self.eco_scores.quantiles(self.PERCENTILES))),
+            'carbon_offset_percentiles': dict(zip(labels, self.carbon_offsets.quantiles(self.PERCENTILES))),
+            'error_bounds': {
+                'distinct_count_relative_error': round(self.active_wallets.relative_error, 4),
+                'quantile_rank_error': round(self.eco_scores.rank_error, 4)
+            }
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'precision': self.precision,
+            'k': self.k,
+            'active_wallets': self.active_wallets.to_dict(),
+            'wallets_by_action': {t: s.to_dict() for t, s in self.wallets_by_action.items()},
+            'eco_scores': self.eco_scores.to_dict(),
+            'carbon_offsets': self.carbon_offsets.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PlatformSketches':
+        sketches = cls(data['precision'], data['k'])
+        sketches.active_wallets = HyperLogLog.from_dict(data['active_wallets'])
+        sketches.wallets_by_action = {t: HyperLogLog.from_dict(s) for t, s in data['wallets_by_action'].items()}
+        sketches.eco_scores = KLLSketch.from_dict(data['eco_scores'])
+        sketches.carbon_offsets = KLLSketch.from_dict(data['carbon_offsets'])
+        return sketches
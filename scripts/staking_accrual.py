@@ -0,0 +1,165 @@
+"""
+EcoChain Staking Accrual
+Bulk reward accrual over staking_records held as column arrays
+"""
+
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+def _to_epoch_seconds(values: List[Any]) -> np.ndarray:
+    """Timestamps (ISO strings, datetimes or None) to int64 seconds; None becomes NaT"""
+    stamps = np.array([v if v is not None else 'NaT' for v in values], dtype='datetime64[s]')
+    return stamps.astype(np.int64)
+
+
+_NAT = np.datetime64('NaT', 's').astype(np.int64)
+
+
+def _check_withdrawn(ids: np.ndarray, status: np.ndarray, unstaked_at: np.ndarray):
+    """A withdrawn position must say when it was withdrawn, or its accrual would never stop"""
+    undated = (status == 'withdrawn') & (unstaked_at == _NAT)
+    if undated.any():
+        raise ValueError(f"Withdrawn staking positions without unstaked_at: {ids[undated][:10].tolist()}")
+
+
+class StakingBook:
+    """
+    All staking positions as arrays, with vectorized accrual as of any timestamp
+    Rewards are simple interest on amount_staked at apy_rate from staked_at until the
+    position stops accruing: unstaked_at if set, the end of the staking period for
+    completed positions, otherwise the as-of time. Withdrawn positions must carry
+    unstaked_at; rows without it are rejected.
+    """
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.user_ids = np.empty(0, dtype=np.int64)
+        self.amount_staked = np.empty(0)
+        self.apy_rate = np.empty(0)
+        self.staking_period_days = np.empty(0, dtype=np.int64)
+        self.staked_at = np.empty(0, dtype=np.int64)
+        self.unstaked_at = np.empty(0, dtype=np.int64)
+        self.completed = np.empty(0, dtype=bool)
+        self.rewards_earned = np.empty(0)
+        self._row_for_id: Dict[int, int] = {}
+        self._dirty = np.empty(0, dtype=bool)
+        self._last_as_of: Optional[int] = None
+        self._user_index: Optional[np.ndarray] = None
+        self._users: Optional[np.ndarray] = None
+        self._user_rewards: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_arrays(cls, ids: np.ndarray, user_ids: np.ndarray, amount_staked: np.ndarray,
+                    apy_rate: np.ndarray, staking_period_days: np.ndarray, staked_at: np.ndarray,
+                    unstaked_at: np.ndarray, status: np.ndarray) -> 'StakingBook':
+        """Bulk-load positions from column arrays; timestamps are datetime64 (NaT when not unstaked)"""
+        book = cls()
+        book.ids = np.asarray(ids, dtype=np.int64)
+        book.user_ids = np.asarray(user_ids, dtype=np.int64)
+        book.amount_staked = np.asarray(amount_staked, dtype=float)
+        book.apy_rate = np.asarray(apy_rate, dtype=float)
+        book.staking_period_days = np.asarray(staking_period_days, dtype=np.int64)
+        book.staked_at = np.asarray(staked_at, dtype='datetime64[s]').astype(np.int64)
+        book.unstaked_at = np.asarray(unstaked_at, dtype='datetime64[s]').astype(np.int64)
+        status = np.asarray(status)
+        _check_withdrawn(book.ids, status, book.unstaked_at)
+        book.completed = status == 'completed'
+        book.rewards_earned = np.zeros(len(book.ids))
+        book._dirty = np.ones(len(book.ids), dtype=bool)
+        book._row_for_id = {int(i): row for row, i in enumerate(book.ids)}
+        return book
+
+    def upsert(self, records: List[Dict[str, Any]]):
+        """Insert new staking_records rows or replace existing ones by id"""
+        if not records:
+            return
+        status = np.array([r.get('status', 'active') for r in records])
+        columns = {
+            'ids': np.array([r['id'] for r in records], dtype=np.int64),
+            'user_ids': np.array([r['user_id'] for r in records], dtype=np.int64),
+            'amount_staked': np.array([float(r['amount_staked']) for r in records]),
+            'apy_rate': np.array([float(r['apy_rate']) for r in records]),
+            'staking_period_days': np.array([r.get('staking_period_days', 30) for r in records], dtype=np.int64),
+            'staked_at': _to_epoch_seconds([r['staked_at'] for r in records]),
+            'unstaked_at': _to_epoch_seconds([r.get('unstaked_at') for r in records]),
+            'completed': status == 'completed'
+        }
+        _check_withdrawn(columns['ids'], status, columns['unstaked_at'])
+
+        rows = np.array([self._row_for_id.get(int(i), -1) for i in columns['ids']], dtype=np.int64)
+        existing = rows >= 0
+        if existing.any():
+            for name, values in columns.items():
+                getattr(self, name)[rows[existing]] = values[existing]
+            self._dirty[rows[existing]] = True
+            self._user_index = None
+
+        new = ~existing
+        if new.any():
+            start = len(self.ids)
+            for name, values in columns.items():
+                setattr(self, name, np.concatenate([getattr(self, name), values[new]]))
+            self.rewards_earned = np.concatenate([self.rewards_earned, np.zeros(int(new.sum()))])
+            self._dirty = np.concatenate([self._dirty, np.ones(int(new.sum()), dtype=bool)])
+            for offset, position_id in enumerate(columns['ids'][new]):
+                self._row_for_id[int(position_id)] = start + offset
+            self._user_index = None
+
+    def _accrual_end(self, rows: np.ndarray, as_of: int) -> np.ndarray:
+        period_end = self.staked_at[rows] + self.staking_period_days[rows] * 86400
+        end = np.where(self.completed[rows], period_end, as_of)
+        unstaked = self.unstaked_at[rows]
+        end = np.where(unstaked != _NAT, unstaked, end)
+        return np.minimum(end, as_of)
+
+    def _compute(self, rows: np.ndarray, as_of: int) -> np.ndarray:
+        elapsed = np.maximum(0, self._accrual_end(rows, as_of) - self.staked_at[rows])
+        return self.amount_staked[rows] * self.apy_rate[rows] * elapsed / SECONDS_PER_YEAR
+
+    def _ensure_user_index(self):
+        if self._user_index is None:
+            self._users, self._user_index = np.unique(self.user_ids, return_inverse=True)
+            self._user_rewards = np.bincount(self._user_index, weights=self.rewards_earned,
+                                             minlength=len(self._users))
+
+    def accrue(self, as_of: Any, full: bool = False) -> Dict[str, Any]:
+        """
+        Bring rewards_earned up to as_of
+        The fast path recomputes only changed positions and positions still accruing
+        since the previous run; positions that closed before it keep their cached rewards.
+        """
+        as_of_s = int(np.datetime64(as_of, 's').astype(np.int64))
+        if full or self._last_as_of is None:
+            rows = np.arange(len(self.ids))
+        else:
+            still_accruing = self._accrual_end(np.arange(len(self.ids)), np.iinfo(np.int64).max) > min(
+                self._last_as_of, as_of_s)
+            rows = np.flatnonzero(self._dirty | still_accruing)
+
+        self._ensure_user_index()
+        updated = self._compute(rows, as_of_s)
+        delta = updated - self.rewards_earned[rows]
+        self.rewards_earned[rows] = updated
+        self._user_rewards += np.bincount(self._user_index[rows], weights=delta, minlength=len(self._users))
+        self._dirty[rows] = False
+        self._last_as_of = as_of_s
+
+        return {
+            'as_of': str(np.datetime64(as_of_s, 's')),
+            'positions': len(self.ids),
+            'positions_recomputed': len(rows),
+            'total_rewards_earned': round(float(self.rewards_earned.sum()), 8),
+            'total_value_staked': round(float(self.amount_staked[self.unstaked_at == _NAT].sum()), 8)
+        }
+
+    def user_totals(self) -> Dict[int, float]:
+        """Accrued rewards per user as of the last accrual run"""
+        self._ensure_user_index()
+        return {int(u): round(float(r), 8) for u, r in zip(self._users, self._user_rewards)}
+
+    def rewards_for(self, position_ids: List[int]) -> Dict[int, float]:
+        return {int(i): round(float(self.rewards_earned[self._row_for_id[int(i)]]), 8) for i in position_ids}
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from ecochain import load_module  # noqa: E402
+
+
+@pytest.fixture
+def analytics_module():
+    return load_module('ecochain_analytics')
+
+
+@pytest.fixture
+def ai_module():
+    return load_module('ai_analysis_engine')
+
+
+@pytest.fixture
+def analytics(analytics_module):
+    return analytics_module.EcoChainAnalytics(run_seed=42, simulate_latency=False)
+
+
+@pytest.fixture
+def ai_engine(ai_module):
+    return ai_module.AIAnalysisEngine(run_seed=42, simulate_latency=False)
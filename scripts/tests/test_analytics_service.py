@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from analytics_service import AnalyticsService, MicroBatcher, call, serve
+
+
+def test_concurrent_submits_are_batched():
+    sizes = []
+    batcher = MicroBatcher(lambda items: sizes.append(len(items)) or [i * 2 for i in items],
+                           max_batch_size=8, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(i) for i in range(20)]
+        assert [f.result(5) for f in futures] == [i * 2 for i in range(20)]
+    finally:
+        batcher.close()
+    assert max(sizes) == 8 and sum(sizes) == 20
+    assert batcher.batches == len(sizes) < 20
+
+
+def test_failing_item_fails_alone():
+    def process(items):
+        if 'bad' in items:
+            raise ValueError('bad item')
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(item) for item in ('a', 'bad', 'c')]
+        assert futures[0].result(5) == 'A' and futures[2].result(5) == 'C'
+        with pytest.raises(ValueError, match='bad item'):
+            futures[1].result(5)
+    finally:
+        batcher.close()
+
+
+def test_short_result_list_does_not_leave_futures_pending():
+    batcher = MicroBatcher(lambda items: items[:1], max_batch_size=4, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(i) for i in range(3)]
+        assert [f.result(5) for f in futures] == [0, 1, 2]
+    finally:
+        batcher.close()
+
+
+def test_service_answers_over_http(analytics, ai_engine):
+    service = AnalyticsService(analytics, ai_engine, max_wait_ms=1)
+    server = serve(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1]
+    try:
+        payload = {'id': 1, 'type': 'art', 'estimated_value': 1000}
+        asset = call('analyze-asset', payload, port=port)
+        expected = ai_engine.analyze_assets([payload])[0]
+        assert (asset['asset_id'], asset['overall_score']) == (expected['asset_id'], expected['overall_score'])
+        assert call('stats', port=port)['operations']['analyze-asset']['requests'] == 1
+        with pytest.raises(RuntimeError, match='404'):
+            call('unknown', {}, port=port)
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def _without_timing(result):
+    return {k: v for k, v in result.items() if k not in ('analysis_timestamp', 'verification_timestamp',
+                                                          'processing_time_ms')}
+
+
+def test_batched_user_analysis_matches_per_user_calls(analytics_module):
+    from leaderboards import Leaderboards
+
+    users = [{'wallet_address': f'0x{i}', 'eco_actions': [{'type': 'recycling', 'carbon_offset': float(i)}]}
+             for i in range(1, 6)]
+    batched = analytics_module.EcoChainAnalytics(run_seed=7, simulate_latency=False)
+    single = analytics_module.EcoChainAnalytics(run_seed=7, simulate_latency=False)
+    batched.leaderboards = Leaderboards(batched._get_user_tier)
+    single.leaderboards = Leaderboards(single._get_user_tier)
+    expected = [single.analyze_user_sustainability_impact(u) for u in users]
+    assert [_without_timing(r) for r in batched.analyze_users(users)] == [_without_timing(r) for r in expected]
+    assert batched.leaderboards.snapshot() == single.leaderboards.snapshot()
+
+
+def test_batched_verification_flags_duplicates_within_the_batch(analytics_module):
+    from project_dedup import ProjectDuplicateIndex
+
+    projects = [
+        {'id': 1, 'name': 'Amazon Rainforest Conservation', 'type': 'forestry', 'location': 'Para, Brazil'},
+        {'id': 2, 'name': 'Texas Wind Farm', 'type': 'renewable', 'location': 'Texas, USA'},
+        {'id': 3, 'name': 'Amazon Rainforest Conservaton', 'type': 'forestry', 'location': 'Para, Brazil'},
+        {'id': 4, 'type': 'forestry'},
+    ]
+    batched = analytics_module.EcoChainAnalytics(run_seed=7, simulate_latency=False)
+    single = analytics_module.EcoChainAnalytics(run_seed=7, simulate_latency=False)
+    batched.project_index, single.project_index = ProjectDuplicateIndex(), ProjectDuplicateIndex()
+    expected = [single.verify_carbon_offset_project(p) for p in projects]
+    results = batched.verify_projects(projects)
+    assert [_without_timing(r) for r in results] == [_without_timing(r) for r in expected]
+    assert [r['verification_status'] for r in results] == ['verified', 'verified', 'needs_review', 'verified']
+    assert len(batched.project_index) == len(projects)
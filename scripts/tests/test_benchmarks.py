@@ -0,0 +1,41 @@
+import json
+
+import benchmarks
+
+TINY_SIZES = {'user_actions': [5], 'projects': [2], 'platform_actions': [20], 'portfolio_assets': [2]}
+
+
+def test_compare_flags_only_drops_beyond_threshold():
+    baseline = [{'benchmark': 'a', 'size': 10, 'ops_per_sec': 100.0},
+                {'benchmark': 'b', 'size': 10, 'ops_per_sec': 100.0},
+                {'benchmark': 'c', 'size': 10, 'ops_per_sec': 100.0}]
+    current = [{'benchmark': 'a', 'size': 10, 'ops_per_sec': 95.0},
+               {'benchmark': 'b', 'size': 10, 'ops_per_sec': 80.0},
+               {'benchmark': 'd', 'size': 10, 'ops_per_sec': 1.0}]
+    regressions = benchmarks.compare(current, baseline, 0.10)
+    assert [(r['benchmark'], r['change_pct']) for r in regressions] == [('b', -20.0)]
+
+
+def test_measure_reports_throughput_and_peak_memory():
+    result = benchmarks.measure(lambda: [0] * 100000, ops=10, repeat=2)
+    assert result['ops'] == 10
+    assert result['wall_time_s'] > 0
+    assert result['peak_memory_bytes'] >= 100000 * 8
+
+
+def test_suite_covers_every_engine_entry_point(capsys):
+    results = benchmarks.run_suite(TINY_SIZES, repeat=1, seed=0)
+    assert {r['benchmark'] for r in results} == {
+        'analyze_user_sustainability_impact', 'verify_carbon_offset_project',
+        'analyze_platform_metrics', 'analyze_asset'}
+
+
+def test_main_fails_on_regression(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(benchmarks, 'QUICK_SIZES', TINY_SIZES)
+    baseline = tmp_path / 'baseline.json'
+    benchmarks.main(['--repeat', '1', '--output', str(baseline)])
+    report = json.loads(baseline.read_text())
+    for result in report['results']:
+        result['ops_per_sec'] *= 1000
+    baseline.write_text(json.dumps(report))
+    assert benchmarks.main(['--repeat', '1', '--compare', str(baseline)]) == 1
@@ -0,0 +1,109 @@
+import pytest
+
+from bulk_jobs import BulkJobRunner
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _items(n=23):
+    return [{'id': i, 'value': i * i} for i in range(n)]
+
+
+def _runner(job_dir, calls, fail_at=None):
+    def process(item):
+        if item['id'] == fail_at:
+            raise Interrupted()
+        calls.append(item['id'])
+        return {'double': item['value'] * 2}
+    return BulkJobRunner(str(job_dir), process, lambda item: item['id'], chunk_size=5)
+
+
+def test_interrupted_run_resumes_from_the_last_finished_chunk(tmp_path):
+    items = _items()
+    calls = []
+    with pytest.raises(Interrupted):
+        _runner(tmp_path, calls, fail_at=12).run(items)
+    assert calls == list(range(12))
+
+    calls.clear()
+    summary = _runner(tmp_path, calls).run(items)
+    # Chunks 0 and 1 were checkpointed; chunk 2 was in flight and is redone
+    assert summary == {'total_chunks': 5, 'chunks_processed': 3, 'chunks_resumed': 2, 'items': 23}
+    assert calls == list(range(10, 23))
+
+    results = list(_runner(tmp_path, []).results())
+    assert [r['key'] for r in results] == list(range(23))
+    assert all(r['result'] == {'double': 2 * i * i} for i, r in enumerate(results))
+
+
+def test_changed_chunk_is_reprocessed(tmp_path):
+    items = _items()
+    _runner(tmp_path, []).run(items)
+    items[7]['value'] = -1
+    calls = []
+    summary = _runner(tmp_path, calls).run(items)
+    assert summary['chunks_processed'] == 1
+    assert calls == list(range(5, 10))
+
+
+def test_shorter_input_drops_stale_chunks(tmp_path):
+    _runner(tmp_path, []).run(_items(23))
+    _runner(tmp_path, []).run(_items(8))
+    assert [r['key'] for r in _runner(tmp_path, []).results()] == list(range(8))
+
+
+def test_chunk_size_mismatch_is_rejected(tmp_path):
+    _runner(tmp_path, []).run(_items())
+    with pytest.raises(ValueError, match='chunk_size'):
+        BulkJobRunner(str(tmp_path), lambda item: item, lambda item: item['id'], chunk_size=7).run(_items())
+
+
+def test_input_shrinking_to_a_chunk_boundary_drops_stale_chunks(tmp_path):
+    calls = []
+    _runner(tmp_path, calls).run(_items(23))
+    calls.clear()
+    summary = _runner(tmp_path, calls).run(_items(10))
+    assert summary['chunks_processed'] == 0 and calls == []
+    runner = _runner(tmp_path, calls)
+    assert [record['key'] for record in runner.results()] == list(range(10))
+    assert sorted(p.name for p in tmp_path.glob('chunk-*.jsonl')) == ['chunk-000000.jsonl', 'chunk-000001.jsonl']
+
+
+def test_changed_versions_invalidate_finished_chunks(tmp_path):
+    calls = []
+    versions = {'run_seed': 1}
+
+    def runner():
+        return BulkJobRunner(str(tmp_path), lambda item: calls.append(item['id']) or {}, lambda item: item['id'],
+                             chunk_size=5, versions=lambda: dict(versions))
+
+    runner().run(_items(12))
+    assert runner().run(_items(12))['chunks_processed'] == 0
+    versions['run_seed'] = 2
+    calls.clear()
+    assert runner().run(_items(12))['chunks_processed'] == 3
+    assert calls == list(range(12))
+
+
+def test_engine_jobs_require_a_seed_and_track_the_model_config(tmp_path, analytics_module):
+    import bulk_jobs
+
+    with pytest.raises(ValueError, match='run_seed'):
+        bulk_jobs.user_analysis_job(analytics_module.EcoChainAnalytics(simulate_latency=False), str(tmp_path))
+    analytics = analytics_module.EcoChainAnalytics(run_seed=3, simulate_latency=False)
+    users = [{'wallet_address': f"0x{i}", 'eco_actions': []} for i in range(4)]
+    job = bulk_jobs.user_analysis_job(analytics, str(tmp_path), chunk_size=2)
+    job.run(users)
+    assert job.run(users)['chunks_processed'] == 0
+    analytics.platform_version = 'next'
+    assert job.run(users)['chunks_processed'] == 2
+
+
+def test_cli_job_dir_requires_seed(tmp_path, capsys):
+    from ecochain import cli
+
+    users = tmp_path / 'users.jsonl'
+    users.write_text('{"wallet_address": "0x1"}\n')
+    assert cli.main(['analyze-users', str(users), '--job-dir', str(tmp_path / 'job')]) == 2
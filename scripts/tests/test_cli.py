@@ -0,0 +1,52 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from ecochain import cli
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+USER = {'wallet_address': '0x42', 'eco_actions': [{'type': 'water', 'carbon_offset': 1.5, 'eco_reward': 20}]}
+
+
+def _stable(result):
+    return {k: v for k, v in result.items() if k not in ('analysis_timestamp', 'processing_time_ms')}
+
+
+@pytest.mark.parametrize('command, payload', [
+    ('analyze-user', USER),
+    ('analyze-asset', {'id': 1, 'type': 'art', 'estimated_value': 250000}),
+    ('verify-project', {'id': 3, 'type': 'forestry'})
+])
+def test_single_entity_commands_do_not_import_numpy(command, payload):
+    script = ("import sys; sys.path.insert(0, sys.argv[1]); from ecochain import cli; "
+              "cli.main(sys.argv[2:]); print('numpy' in sys.modules, file=sys.stderr)")
+    completed = subprocess.run([sys.executable, '-c', script, SCRIPTS_DIR, command, json.dumps(payload),
+                                '--seed', '1'], capture_output=True, text=True, check=True)
+    assert completed.stderr.strip().splitlines()[-1] == 'False'
+    assert json.loads(completed.stdout)['run_seed'] == 1
+
+
+def test_single_command_matches_engine(tmp_path, analytics_module):
+    output = tmp_path / 'result.json'
+    assert cli.main(['analyze-user', json.dumps(USER), '--seed', '42', '--output', str(output)]) == 0
+    expected = analytics_module.EcoChainAnalytics(run_seed=42, simulate_latency=False)
+    assert _stable(json.loads(output.read_text())) == _stable(json.loads(json.dumps(
+        expected.analyze_user_sustainability_impact(USER), default=str)))
+
+
+@pytest.mark.parametrize('with_job_dir', [False, True])
+def test_batch_command_writes_one_line_per_record(tmp_path, with_job_dir):
+    users = tmp_path / 'users.jsonl'
+    users.write_text('\n'.join(json.dumps(dict(USER, wallet_address=f"0x{i}")) for i in range(5)))
+    output = tmp_path / 'results.jsonl'
+    argv = ['analyze-users', str(users), '--seed', '1', '--output', str(output)]
+    if with_job_dir:
+        argv += ['--job-dir', str(tmp_path / 'job'), '--chunk-size', '2']
+    assert cli.main(argv) == 0
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [line['key'] for line in lines] == [f"0x{i}" for i in range(5)]
+    assert all(line['result']['user_id'] == line['key'] for line in lines)
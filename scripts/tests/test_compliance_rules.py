@@ -0,0 +1,73 @@
+from compliance_rules import ComplianceRuleEngine
+from rng_streams import RNGStreams
+
+RULES = {
+    'version': 'test',
+    'checks': [
+        {'check': 'kyc', 'asset_type': '*', 'jurisdiction': '*', 'pass_rate': 0.5},
+        {'check': 'kyc', 'asset_type': 'art', 'jurisdiction': '*', 'pass_rate': 0.7},
+        {'check': 'kyc', 'asset_type': '*', 'jurisdiction': 'USA', 'pass_rate': 0.6},
+        {'check': 'kyc', 'asset_type': 'art', 'jurisdiction': 'USA', 'pass_rate': 0.9},
+        {'check': 'tax', 'asset_type': '*', 'jurisdiction': '*', 'pass_rate': 0.8}
+    ],
+    'requirements': [
+        {'requirement': 'Disclosure', 'asset_type': '*', 'jurisdiction': '*'},
+        {'requirement': 'Provenance', 'asset_type': 'art', 'jurisdiction': '*'},
+        {'requirement': 'SEC filing', 'asset_type': '*', 'jurisdiction': 'USA'},
+        {'requirement': 'Disclosure', 'asset_type': 'art', 'jurisdiction': 'USA'}
+    ]
+}
+
+
+def test_most_specific_check_rule_wins():
+    engine = ComplianceRuleEngine(RULES)
+    assert engine.compile('art', 'New York, USA').pass_rates == [0.9, 0.8]
+    assert engine.compile('art', 'Paris, France').pass_rates == [0.7, 0.8]
+    assert engine.compile('vehicles', 'Austin, USA').pass_rates == [0.6, 0.8]
+    assert engine.compile('vehicles', 'Unknown').pass_rates == [0.5, 0.8]
+
+
+def test_requirements_combine_in_table_order_without_duplicates():
+    engine = ComplianceRuleEngine(RULES)
+    assert engine.compile('art', 'New York, USA').requirements == ['Disclosure', 'Provenance', 'SEC filing']
+    assert engine.compile('vehicles', 'Unknown').requirements == ['Disclosure']
+
+
+def test_outcomes_are_memoized_per_type_and_location():
+    engine = ComplianceRuleEngine(RULES)
+    first = engine.compile('art', 'London, UK')
+    assert engine.compile('art', 'London, UK') is first
+    assert engine.cache_stats() == (1, 1)
+
+
+def test_scalar_check_matches_batched_screen():
+    engine = ComplianceRuleEngine.load()
+    streams = RNGStreams(11)
+    assets = [{'id': i, 'type': t, 'location': loc}
+              for i, (t, loc) in enumerate([('art', 'New York, USA'), ('real-estate', 'London, UK'),
+                                            ('vehicles', 'Unknown'), ('commodities', 'Tokyo, Japan')])]
+    screened = engine.screen(assets, [streams.generator(a['id'], 'compliance') for a in assets])
+    checked = [engine.check(a, streams.stream(a['id'], 'compliance')) for a in assets]
+    assert checked == screened
+
+
+def test_default_rules_are_versioned():
+    assert ComplianceRuleEngine.load().version != 'unversioned'
+
+
+def test_jurisdictions_match_whole_location_parts():
+    rules = dict(RULES, checks=RULES['checks'] + [{'check': 'kyc', 'asset_type': '*', 'jurisdiction': 'India',
+                                                   'pass_rate': 0.1}])
+    engine = ComplianceRuleEngine(rules)
+    assert engine.compile('vehicles', 'Indianapolis, USA').pass_rates == [0.6, 0.8]
+    assert engine.compile('vehicles', 'Mumbai, india').pass_rates == [0.1, 0.8]
+    assert engine.matched_jurisdictions('Austin, Texas, USA') == ('USA',)
+
+
+def test_table_stays_bounded_for_free_text_inputs():
+    engine = ComplianceRuleEngine(RULES)
+    for i in range(500):
+        engine.compile(f"type-{i % 7}", f"Street {i}, Town {i}, USA")
+        engine.compile('art', f"Gallery {i}, Paris, France")
+    assert len(engine._table) == 2
+    assert engine.cache_stats() == (998, 2)
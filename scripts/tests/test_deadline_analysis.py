@@ -0,0 +1,55 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+ASSET = {'id': 7, 'name': 'Deadline', 'type': 'art', 'estimated_value': 50000}
+
+
+@pytest.fixture
+def slow_engine(ai_module):
+    engine = ai_module.AIAnalysisEngine(run_seed=42, simulate_latency=True)
+    engine.stage_latency = {'valuation': 0.4, 'risk': 0.3, 'market': 0.2, 'compliance': 0.1}
+    return engine
+
+
+def test_no_deadline_pressure_matches_full_analysis(ai_engine):
+    full = ai_engine.analyze_assets([ASSET])[0]
+    bounded = ai_engine.analyze_asset(ASSET, deadline=5.0)
+    assert not bounded['degraded']
+    assert bounded['overall_score'] == full['overall_score']
+    assert bounded['valuation'] == full['valuation']
+
+
+def test_stages_that_cannot_fit_are_skipped(slow_engine):
+    started = time.time()
+    result = slow_engine.analyze_asset(ASSET, deadline=0.25)
+    assert time.time() - started < 0.25 + 0.1
+    assert result['degraded_stages'] == ['valuation', 'risk']
+    assert result['market_analysis'] is not None and result['compliance'] is not None
+
+
+def test_concurrent_deadline_calls_do_not_starve_each_other(ai_module):
+    engine = ai_module.AIAnalysisEngine(run_seed=42, simulate_latency=True)
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: engine.analyze_asset(ASSET, deadline=1.0), range(8)))
+    assert [r['degraded'] for r in results] == [False] * 8
+    assert len({r['overall_score'] for r in results}) == 1
+
+
+def test_short_deadline_does_not_degrade_the_next_call(ai_module):
+    engine = ai_module.AIAnalysisEngine(run_seed=42, simulate_latency=True)
+    assert engine.analyze_asset(ASSET, deadline=0.3)['degraded_stages'] == ['valuation', 'risk', 'market']
+    assert engine.analyze_asset(ASSET, deadline=0.5)['degraded_stages'] == ['valuation', 'risk']
+
+
+def test_abandoned_stages_do_not_hold_up_the_next_call(slow_engine, monkeypatch):
+    # Under-estimate valuation so the first call starts it and then abandons it
+    monkeypatch.setitem(slow_engine.stage_latency, 'valuation', 0.1)
+    run_stage = slow_engine._run_stage
+    monkeypatch.setattr(slow_engine, '_run_stage',
+                        lambda stage, *args: time.sleep(0.5) if stage == 'valuation' else run_stage(stage, *args))
+    first = slow_engine.analyze_asset(ASSET, deadline=0.15)
+    assert 'valuation' in first['degraded_stages']
+    second = slow_engine.analyze_asset(ASSET, deadline=0.25)
+    assert second['degraded_stages'] == ['valuation', 'risk']
@@ -0,0 +1,57 @@
+import pytest
+
+from delta_analysis import DeltaAnalyzer, asset_delta, asset_inputs, fingerprint, user_delta, user_inputs
+
+
+def _assets(n):
+    return [{'id': i, 'name': f"Asset {i}", 'type': 'art', 'estimated_value': 1000 * (i + 1)} for i in range(n)]
+
+
+def test_fingerprint_ignores_key_order_and_unused_fields():
+    assert fingerprint({'a': 1, 'b': [1, 2]}) == fingerprint({'b': [1, 2], 'a': 1})
+    asset = _assets(1)[0]
+    assert fingerprint(asset_inputs(asset)) == fingerprint(asset_inputs(dict(asset, notes='ignored')))
+    user = {'wallet_address': '0x1', 'eco_actions': [{'type': 'water', 'carbon_offset': 1.0, 'id': 5}]}
+    assert fingerprint(user_inputs(user)) == fingerprint(user_inputs(dict(user, email='x')))
+
+
+def test_only_changed_entities_are_reanalyzed(ai_engine, tmp_path):
+    assets = _assets(10)
+    runner = asset_delta(ai_engine, str(tmp_path / 'store.db'))
+    assert runner.run(assets)['reanalyzed'] == 10
+    assets[3] = dict(assets[3], estimated_value=1)
+    summary = runner.run(assets + _assets(11)[10:])
+    assert (summary['reanalyzed'], summary['input_changes'], summary['new']) == (2, 1, 1)
+    stored = runner.result(3)
+    fresh = ai_engine.analyze_asset(assets[3])
+    assert stored['overall_score'] == fresh['overall_score']
+    assert stored['valuation'] == fresh['valuation']
+
+
+def test_version_change_invalidates_stored_results(analytics, tmp_path):
+    users = [{'wallet_address': f"0x{i}", 'eco_actions': [{'type': 'water', 'carbon_offset': 1.0}]} for i in range(4)]
+    path = str(tmp_path / 'store.db')
+    user_delta(analytics, path).run(users)
+    analytics.platform_version = 'next'
+    assert user_delta(analytics, path).run(users)['version_bumps'] == 4
+
+
+def test_random_run_seed_is_rejected(ai_module, tmp_path):
+    with pytest.raises(ValueError, match='run_seed'):
+        asset_delta(ai_module.AIAnalysisEngine(simulate_latency=False), str(tmp_path / 'store.db'))
+
+
+def test_interrupted_run_keeps_committed_chunks(tmp_path):
+    path = str(tmp_path / 'store.db')
+
+    def analyze(entity):
+        if entity == 5:
+            raise RuntimeError('interrupted')
+        return {'value': entity}
+
+    runner = DeltaAnalyzer(path, analyze, lambda e: e, lambda e: {'value': e}, {'v': 1}, commit_every=2)
+    with pytest.raises(RuntimeError):
+        runner.run(list(range(8)))
+    runner.close()
+    resumed = DeltaAnalyzer(path, lambda e: {'value': e}, lambda e: e, lambda e: {'value': e}, {'v': 1})
+    assert resumed.run(list(range(8)))['reanalyzed'] == 4
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from governance_analytics import GovernanceTally
+
+
+def _proposals():
+    return [{'id': 3, 'quorum_required': 100}, {'id': 1, 'quorum_required': 50}, {'id': 2, 'quorum_required': 10}]
+
+
+def test_tally_matches_row_by_row_totals():
+    rng = np.random.default_rng(0)
+    votes = [{'proposal_id': int(rng.integers(1, 4)), 'user_id': i, 'voting_power': int(rng.integers(1, 40)),
+              'vote_choice': bool(rng.integers(0, 2))} for i in range(500)]
+    tally = {row['proposal_id']: row for row in GovernanceTally.from_rows(_proposals(), votes).tally()}
+    for proposal_id in (1, 2, 3):
+        mine = [v for v in votes if v['proposal_id'] == proposal_id]
+        assert tally[proposal_id]['votes_for'] == sum(v['voting_power'] for v in mine if v['vote_choice'])
+        assert tally[proposal_id]['votes_against'] == sum(v['voting_power'] for v in mine if not v['vote_choice'])
+        assert tally[proposal_id]['voters'] == len(mine)
+
+
+def test_large_voting_power_is_summed_exactly():
+    power = 2 ** 53 + 1
+    tally = GovernanceTally.from_rows(_proposals(), [
+        {'proposal_id': 1, 'user_id': 1, 'voting_power': power, 'vote_choice': True},
+        {'proposal_id': 1, 'user_id': 2, 'voting_power': power, 'vote_choice': True}
+    ])
+    assert tally.tally()[0]['votes_for'] == 2 * power
+
+
+def test_unknown_proposals_are_rejected():
+    tally = GovernanceTally.from_rows(_proposals())
+    with pytest.raises(KeyError):
+        tally.add_votes([9], [1], [5], [True])
+
+
+def test_empty_proposal_set_tallies_zeros():
+    tally = GovernanceTally.from_rows([])
+    tally.add_votes([], [], [], [])
+    assert tally.tally() == []
+    assert tally.summary()['proposals'] == 0
+    with pytest.raises(KeyError):
+        tally.add_votes([1], [1], [5], [True])
+
+
+def test_participation_needs_an_eligible_count():
+    tally = GovernanceTally.from_rows(_proposals(), [
+        {'proposal_id': 1, 'user_id': u, 'voting_power': 1, 'vote_choice': True} for u in (1, 2, 2, 3)])
+    assert tally.participation_rate(10) == 30.0
+    assert 'participation_rate' not in tally.summary()
+    assert tally.summary(6)['participation_rate'] == 50.0
+    with pytest.raises(ValueError):
+        tally.participation_rate(0)
+
+
+def test_platform_metrics_omit_participation_without_real_user_count(analytics):
+    tally = GovernanceTally.from_rows(_proposals(), [
+        {'proposal_id': 1, 'user_id': 1, 'voting_power': 1, 'vote_choice': True}])
+    simulated = analytics.analyze_platform_metrics(governance=tally)
+    assert 'governance_participation' not in simulated
+    assert 'governance_participation_rate' not in simulated['user_engagement_metrics']
+    assert 'participation_rate' not in simulated['governance_summary']
+
+    counted = analytics.analyze_platform_metrics(governance=tally, eligible_voters=4)
+    assert counted['governance_participation'] == 25.0
@@ -0,0 +1,59 @@
+import pytest
+
+from instrumentation import Instrumentation, ProfileSampler
+
+
+def test_instrumented_engine_records_stages_and_cache(ai_module):
+    instrumentation = Instrumentation()
+    engine = ai_module.AIAnalysisEngine(run_seed=1, simulate_latency=False, instrumentation=instrumentation)
+    for i in range(3):
+        engine.analyze_asset({'id': i, 'type': 'art', 'location': 'London, UK'})
+
+    snapshot = instrumentation.snapshot()
+    assert snapshot['stages']['ai.analyze_asset']['calls'] == 3
+    assert snapshot['stages']['ai._perform_valuation_analysis']['calls'] == 3
+    assert sum(snapshot['stages']['ai.analyze_asset']['histogram'].values()) == 3
+    assert snapshot['caches']['compliance_table'] == {'hits': 2, 'misses': 1, 'hit_ratio': 0.6667}
+
+
+def test_disabled_instrumentation_leaves_methods_unwrapped(ai_module):
+    engine = ai_module.AIAnalysisEngine(run_seed=1, simulate_latency=False,
+                                        instrumentation=Instrumentation(enabled=False))
+    assert 'analyze_asset' not in vars(engine)
+
+
+def test_errors_are_counted_and_reraised():
+    class Engine:
+        def _perform_step(self):
+            raise RuntimeError('boom')
+
+    instrumentation = Instrumentation()
+    engine = Engine()
+    instrumentation.instrument(engine, 'demo')
+    with pytest.raises(RuntimeError):
+        engine._perform_step()
+    assert instrumentation.snapshot()['stages']['demo._perform_step']['errors'] == 1
+
+
+def test_prometheus_buckets_are_cumulative():
+    class Engine:
+        def _perform_step(self):
+            return 1
+
+    instrumentation = Instrumentation()
+    engine = Engine()
+    instrumentation.instrument(engine, 'demo')
+    for _ in range(4):
+        engine._perform_step()
+    lines = instrumentation.to_prometheus().splitlines()
+    buckets = [int(line.rsplit(' ', 1)[1]) for line in lines if line.startswith('ecochain_stage_seconds_bucket')]
+    assert buckets == sorted(buckets) and buckets[-1] == 4
+    assert 'ecochain_stage_seconds_count{stage="demo._perform_step"} 4' in lines
+
+
+def test_profile_sampler_profiles_every_nth_call():
+    sampler = ProfileSampler(0.25)
+    for _ in range(8):
+        assert sampler.call(sum, [1, 2]) == 3
+    assert sampler.profiled_calls == 2
+    assert 'function calls' in sampler.top(5)
@@ -0,0 +1,94 @@
+import random
+import threading
+
+import pytest
+
+from analytics_service import AnalyticsService, call, serve
+from leaderboards import OVERALL, Leaderboard, Leaderboards
+
+
+def _brute_force_top(scores, k):
+    return [member for member, _ in sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]]
+
+
+def test_incremental_top_matches_brute_force():
+    rng = random.Random(3)
+    board = Leaderboard('demo', k=10, slack=5)
+    scores = {}
+    for step in range(3000):
+        member = f"0x{rng.randrange(200):03d}"
+        if rng.random() < 0.1:
+            board.remove(member)
+            scores.pop(member, None)
+        else:
+            # Coarse scores so ties are common
+            scores[member] = float(rng.randrange(50))
+            board.update(member, scores[member])
+        if step % 100 == 0:
+            assert [e['wallet_address'] for e in board.snapshot()['entries']] == _brute_force_top(scores, 10)
+    assert board.rebuilds > 0
+    top = _brute_force_top(scores, 10)
+    assert [board.rank(member) for member in top] == list(range(1, 11))
+
+
+def test_pages_cover_the_top_k_in_order():
+    board = Leaderboard('demo', k=7)
+    board.replace_all([f"w{i}" for i in range(20)], range(20))
+    pages = [board.page(p, 3) for p in range(3)]
+    assert [e['rank'] for page in pages for e in page['entries']] == list(range(1, 8))
+    assert pages[0]['pages'] == 3 and pages[0]['entries'][0]['wallet_address'] == 'w19'
+
+
+@pytest.mark.parametrize('page, size', [(-1, 10), (0, 0), (0, -5)])
+def test_invalid_pages_are_rejected(page, size):
+    with pytest.raises(ValueError):
+        Leaderboard('demo').page(page, size)
+
+
+def test_wallet_moves_between_tier_boards():
+    boards = Leaderboards(lambda score: 'Gold' if score >= 50 else 'Bronze', k=5)
+    boards.update_score('0x1', 80)
+    boards.update_score('0x1', 20)
+    assert boards.page('tier:Gold')['entries'] == []
+    assert boards.page('tier:Bronze')['entries'][0]['wallet_address'] == '0x1'
+    assert boards.names() == [OVERALL, 'tier:Bronze', 'tier:Gold']
+
+
+def test_board_names_can_be_read_while_boards_are_added():
+    boards = Leaderboards(lambda score: 'Gold', k=5)
+    done = threading.Event()
+    errors = []
+
+    def read():
+        while not done.is_set():
+            try:
+                boards.names()
+            except RuntimeError as exc:
+                errors.append(exc)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(3000):
+        boards.set_carbon_offsets('0x1', {f"type-{i}": 1.0})
+    done.set()
+    reader.join()
+    assert errors == [] and len(boards.names()) == 3001
+
+
+def test_service_rejects_invalid_page_parameters(analytics, ai_engine):
+    service = AnalyticsService(analytics, ai_engine, max_wait_ms=1)
+    server = serve(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    try:
+        call('analyze-user', {'wallet_address': '0x1', 'eco_actions': [{'type': 'water', 'carbon_offset': 2.0}]},
+             port=port)
+        assert OVERALL in call('leaderboards', port=port)['boards']
+        assert call('leaderboard/overall?page=0&size=5', port=port)['entries'][0]['wallet_address'] == '0x1'
+        for query in ('page=-1', 'size=0', 'size=x'):
+            with pytest.raises(RuntimeError, match='400'):
+                call(f"leaderboard/overall?{query}", port=port)
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
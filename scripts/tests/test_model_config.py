@@ -0,0 +1,120 @@
+import copy
+import json
+import os
+
+import pytest
+
+from delta_analysis import user_delta
+from model_config import DEFAULT_CONFIG_PATH, CompiledModelConfig, ModelConfigRegistry
+
+with open(DEFAULT_CONFIG_PATH) as f:
+    BASE = json.load(f)
+
+
+def _write(path, config):
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(config, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def _edited(version=None, **sections):
+    config = copy.deepcopy(BASE)
+    config.update(sections)
+    if version is not None:
+        config['version'] = version
+    return config
+
+
+@pytest.fixture
+def registry(tmp_path):
+    path = str(tmp_path / 'model-config.json')
+    _write(path, BASE)
+    return ModelConfigRegistry(path, check_interval=None)
+
+
+def test_compiled_tables_are_read_only_and_numeric():
+    config = CompiledModelConfig(_edited(eco_actions=dict(BASE['eco_actions'],
+                                                          water=dict(BASE['eco_actions']['water'], base_reward='25'))))
+    assert config.base_reward[config.action_code['water']] == 25.0
+    assert isinstance(config.eco_actions['energy']['base_reward'], int)
+    assert config.offset_range('unknown-type') == tuple(map(float, BASE['project_types']['*']['offset_potential']))
+    assert not config.arrays['valuation_weights'].flags.writeable
+    with pytest.raises(TypeError):
+        config.eco_actions['water'] = {}
+
+
+@pytest.mark.parametrize('edit', [
+    {'eco_actions': []},
+    {'eco_actions': {}},
+    {'risk_factors': dict(BASE['risk_factors'], credit_risk='x')},
+    {'risk_factors': dict(BASE['risk_factors'], credit_risk=float('nan'))},
+    {'eco_actions': dict(BASE['eco_actions'], water=dict(BASE['eco_actions']['water'], base_reward=None))},
+    {'eco_actions': dict(BASE['eco_actions'], water=dict(BASE['eco_actions']['water'], verification_methods='x'))},
+    {'valuation_weights': dict(BASE['valuation_weights'], default='boats')},
+    {'valuation_weights': dict(BASE['valuation_weights'], asset_types={'art': [0.5, 0.5, 0.5]})},
+    {'project_types': {'forestry': BASE['project_types']['forestry']}},
+    {'project_types': dict(BASE['project_types'], forestry={'offset_potential': [9, 1], 'permanence': [1, 2]})},
+    {'project_types': dict(BASE['project_types'], forestry={'offset_potential': 5, 'permanence': [1, 2]})},
+])
+def test_invalid_reload_is_rejected_and_current_kept(registry, edit):
+    _write(registry.path, _edited('v9', **edit))
+    assert registry.reload() is False
+    assert registry.version == BASE['version']
+    assert registry.reloads == 0
+
+
+def test_same_version_with_changed_content_is_rejected(registry):
+    _write(registry.path, _edited(risk_factors=dict(BASE['risk_factors'], credit_risk=0.5)))
+    assert registry.reload() is False
+    assert registry.current.risk_factors['credit_risk'] == BASE['risk_factors']['credit_risk']
+
+    _write(registry.path, _edited('v1.1.0', risk_factors=dict(BASE['risk_factors'], credit_risk=0.5)))
+    assert registry.reload() is True
+    assert registry.current.risk_factors['credit_risk'] == 0.5
+
+
+def test_unchanged_content_is_not_republished(registry):
+    before = registry.current
+    _write(registry.path, BASE)
+    assert registry.reload(force=True) is False
+    assert registry.current is before
+
+
+class _CountingRegistry(ModelConfigRegistry):
+    reads = 0
+
+    @property
+    def current(self):
+        self.reads += 1
+        return super().current
+
+
+@pytest.mark.parametrize('call', [
+    lambda analytics, ai: analytics.analyze_user_sustainability_impact(
+        {'wallet_address': '0x1', 'eco_actions': [{'type': 'water', 'carbon_offset': 1.0}]}),
+    lambda analytics, ai: analytics.verify_carbon_offset_project({'id': 1, 'type': 'forestry'}),
+    lambda analytics, ai: ai.analyze_asset({'id': 1, 'type': 'art'}),
+    lambda analytics, ai: ai.analyze_asset({'id': 1, 'type': 'art'}, deadline=5.0),
+    lambda analytics, ai: ai.analyze_assets([{'id': 1, 'type': 'art'}, {'id': 2, 'type': 'vehicles'}]),
+    lambda analytics, ai: analytics.analyze_users([{'wallet_address': '0x1'}, {'wallet_address': '0x2'}]),
+    lambda analytics, ai: analytics.verify_projects([{'id': 1, 'type': 'forestry'}, {'id': 2, 'type': 'solar'}])
+])
+def test_each_analysis_reads_the_configuration_once(analytics_module, ai_module, call):
+    registry = _CountingRegistry(check_interval=None)
+    analytics = analytics_module.EcoChainAnalytics(run_seed=1, simulate_latency=False, model_config=registry)
+    ai = ai_module.AIAnalysisEngine(run_seed=1, simulate_latency=False, model_config=registry)
+    call(analytics, ai)
+    assert registry.reads == 1
+
+
+def test_delta_runner_sees_a_reloaded_configuration(analytics_module, registry, tmp_path):
+    analytics = analytics_module.EcoChainAnalytics(run_seed=1, simulate_latency=False, model_config=registry)
+    users = [{'wallet_address': f"0x{i}", 'eco_actions': []} for i in range(3)]
+    runner = user_delta(analytics, str(tmp_path / 'store.db'))
+    runner.run(users)
+    assert runner.run(users)['reanalyzed'] == 0
+    _write(registry.path, _edited('v1.1.0', eco_actions=dict(
+        BASE['eco_actions'], water=dict(BASE['eco_actions']['water'], base_reward=99))))
+    assert registry.reload() is True
+    assert runner.run(users)['version_bumps'] == 3
+    assert runner.result('0x0')['reward_optimization']['potential_additional_rewards'] > 0
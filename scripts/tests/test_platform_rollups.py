@@ -0,0 +1,58 @@
+import random
+from datetime import date, timedelta
+
+from platform_rollups import PlatformRollups
+
+
+def _actions(n=2000, seed=0):
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    return [{
+        'user_id': f"u{rng.randrange(300)}",
+        'created_at': (start + timedelta(days=rng.randrange(200))).isoformat(),
+        'carbon_offset': round(rng.uniform(0, 3), 3),
+        'eco_reward': rng.randrange(1, 50),
+        'status': rng.choice(['verified', 'verified', 'rejected'])
+    } for _ in range(n)]
+
+
+def test_query_matches_brute_force_over_arbitrary_ranges():
+    actions = _actions()
+    rollups = PlatformRollups()
+    rollups.add_eco_actions(actions)
+    accepted = [a for a in actions if a['status'] != 'rejected']
+    rng = random.Random(1)
+    for _ in range(25):
+        first = date(2024, 1, 1) + timedelta(days=rng.randrange(200))
+        last = first + timedelta(days=rng.randrange(90))
+        inside = [a for a in accepted if first <= date.fromisoformat(a['created_at']) <= last]
+        result = rollups.query(first, last)
+        assert result['eco_actions'] == len(inside)
+        assert abs(result['carbon_offset'] - sum(a['carbon_offset'] for a in inside)) < 1e-6
+        assert result['active_users'] == len({a['user_id'] for a in inside})
+
+
+def test_active_users_30d_only_counts_the_window():
+    rollups = PlatformRollups()
+    rollups.add_eco_actions([
+        {'user_id': 'old', 'created_at': '2024-01-01', 'carbon_offset': 1},
+        {'user_id': 'new', 'created_at': '2024-03-01', 'carbon_offset': 1}
+    ])
+    metrics = rollups.platform_metrics(as_of='2024-03-10')
+    assert metrics['active_users_30d'] == 1
+    assert metrics['total_eco_actions'] == 2
+
+
+def test_additive_query_skips_the_distinct_union():
+    rollups = PlatformRollups()
+    rollups.add_eco_actions(_actions(200))
+    assert 'active_users' not in rollups.query('2024-01-01', '2024-12-31', distinct_users=False)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    rollups = PlatformRollups()
+    rollups.add_eco_actions(_actions(500))
+    path = tmp_path / 'rollups.json'
+    rollups.save(str(path))
+    loaded = PlatformRollups.load(str(path))
+    assert loaded.query('2024-01-01', '2024-07-31') == rollups.query('2024-01-01', '2024-07-31')
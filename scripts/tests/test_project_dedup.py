@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from ecochain import cli
+from project_dedup import ProjectDuplicateIndex
+
+
+def _projects():
+    return [
+        {'id': 1, 'name': 'Amazon Rainforest Conservation', 'type': 'forestry',
+         'description': 'Protecting primary rainforest along the river basin', 'location': 'Para, Brazil'},
+        {'id': 2, 'name': 'Amazon Rainforest Conservaton', 'type': 'forestry',
+         'description': 'Protecting primary rainforest along the river basin', 'location': 'Para, Brazil'},
+        {'id': 3, 'name': 'Texas Wind Farm', 'type': 'renewable',
+         'description': 'Utility scale wind turbines feeding the grid', 'location': 'Texas, USA'},
+    ]
+
+
+def test_near_duplicate_listing_is_flagged():
+    index = ProjectDuplicateIndex.from_projects(_projects()[:1] + _projects()[2:])
+    check = index.check(_projects()[1])
+    assert [m['project_id'] for m in check['possible_duplicates']] == [1]
+    assert check['duplicate_risk'] == 'High'
+    assert index.check(_projects()[2])['possible_duplicates'] == []
+
+
+def test_save_writes_exactly_the_given_path(tmp_path):
+    path = tmp_path / 'projects.idx'
+    ProjectDuplicateIndex.from_projects(_projects()).save(str(path))
+    assert [p.name for p in tmp_path.iterdir()] == ['projects.idx']
+    loaded = ProjectDuplicateIndex.load(str(path))
+    assert len(loaded) == 3
+    assert loaded.check(dict(_projects()[0], id=9))['max_similarity'] > 0.8
+
+
+def test_cli_reuses_an_index_saved_without_npz_suffix(tmp_path, capsys):
+    index_path = str(tmp_path / 'index')
+    for project in _projects()[:2]:
+        cli.main(['verify-project', json.dumps(project), '--seed', '1', '--project-index', index_path])
+    assert ProjectDuplicateIndex.load(index_path).keys == [1, 2]
+
+
+def test_interrupted_job_keeps_index_of_finished_chunks(tmp_path, capsys, monkeypatch, analytics_module):
+    projects = tmp_path / 'projects.jsonl'
+    projects.write_text('\n'.join(json.dumps(p) for p in _projects()))
+    index_path = str(tmp_path / 'index.npz')
+    args = ['verify-projects', str(projects), '--seed', '1', '--job-dir', str(tmp_path / 'job'),
+            '--chunk-size', '1', '--project-index', index_path]
+
+    verify = analytics_module.EcoChainAnalytics.verify_carbon_offset_project
+
+    def crash_on_third(self, project):
+        if project['id'] == 3:
+            raise RuntimeError('interrupted')
+        return verify(self, project)
+
+    monkeypatch.setattr(analytics_module.EcoChainAnalytics, 'verify_carbon_offset_project', crash_on_third)
+    with pytest.raises(RuntimeError):
+        cli.main(args)
+    assert ProjectDuplicateIndex.load(index_path).keys == [1, 2]
+
+    monkeypatch.setattr(analytics_module.EcoChainAnalytics, 'verify_carbon_offset_project', verify)
+    assert cli.main(args) == 0
+    index = ProjectDuplicateIndex.load(index_path)
+    assert index.keys == [1, 2, 3]
+
+
+def test_increments_are_replayed_on_load_and_folded_in_by_save(tmp_path):
+    path = str(tmp_path / 'index.npz')
+    index = ProjectDuplicateIndex()
+    index.add(_projects()[0])
+    index.save_increment(path)
+    index.add(_projects()[2])
+    index.save_increment(path)
+    index.add(dict(_projects()[1], id=1))
+    index.save_increment(path)
+    index.save_increment(path)
+    assert len(ProjectDuplicateIndex._increment_paths(path)) == 2
+
+    loaded = ProjectDuplicateIndex.load(path)
+    assert len(loaded) == 2
+    assert loaded.check(_projects()[1])['duplicate_risk'] == 'High'
+    assert loaded.query(_projects()[2]) == index.query(_projects()[2])
+
+    loaded.save(path)
+    assert ProjectDuplicateIndex._increment_paths(path) == []
+    assert ProjectDuplicateIndex.load(path).keys == loaded.keys
@@ -0,0 +1,48 @@
+import pytest
+
+from reward_optimizer import RewardOptimizer
+
+ECO_ACTIONS = {
+    'energy': {'base_reward': 25, 'carbon_factor': 0.12, 'difficulty': 'medium'},
+    'water': {'base_reward': 20, 'carbon_factor': 0.08, 'difficulty': 'easy'},
+    'planting': {'base_reward': 50, 'carbon_factor': 0.35, 'difficulty': 'hard'}
+}
+CURRENT = {'energy': 25, 'water': 20, 'planting': 50}
+
+
+def test_optimized_structure_stays_within_budget_and_beats_baseline():
+    result = RewardOptimizer(ECO_ACTIONS, batch_size=512, seed=1).optimize(CURRENT)
+
+    assert result['optimized']['spend'] <= result['budget'] * (1 + 1e-6)
+    assert result['optimized']['offset'] >= result['baseline']['offset']
+    for category, reward in result['optimized_rewards'].items():
+        assert CURRENT[category] * 0.5 - 0.01 <= reward <= CURRENT[category] * 2.0 + 0.01
+
+
+def test_same_seed_gives_same_solution():
+    first = RewardOptimizer(ECO_ACTIONS, batch_size=256, seed=7).optimize(CURRENT)
+    second = RewardOptimizer(ECO_ACTIONS, batch_size=256, seed=7).optimize(CURRENT)
+    assert first == second
+
+
+def test_warm_start_evaluates_fewer_candidates():
+    optimizer = RewardOptimizer(ECO_ACTIONS, batch_size=256, seed=3)
+    cold = optimizer.optimize(CURRENT)
+    warm = optimizer.optimize(CURRENT)
+    assert warm['candidates_evaluated'] < cold['candidates_evaluated']
+
+
+@pytest.mark.parametrize('reward', [0, -5, float('nan')])
+def test_non_positive_current_reward_is_rejected(reward):
+    with pytest.raises(ValueError, match='water'):
+        RewardOptimizer(ECO_ACTIONS, seed=1).optimize(dict(CURRENT, water=reward))
+
+
+def test_compiled_configuration_matches_its_eco_actions():
+    from model_config import CompiledModelConfig
+
+    config = CompiledModelConfig.load()
+    current = {name: spec['base_reward'] for name, spec in config.eco_actions.items()}
+    from_config = RewardOptimizer(config, batch_size=256, seed=5).optimize(current)
+    from_mapping = RewardOptimizer(dict(config.eco_actions), batch_size=256, seed=5).optimize(current)
+    assert from_config == from_mapping
@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from rng_streams import RNGStreams
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_streams_depend_only_on_seed_entity_and_stage():
+    streams = RNGStreams(42)
+    first = streams.generator('0xabc', 'valuation').random(4).tolist()
+    streams.generator('0xdef', 'valuation').random(100)
+    assert RNGStreams(42).generator('0xabc', 'valuation').random(4).tolist() == first
+    assert streams.generator('0xabc', 'risk').random(4).tolist() != first
+    assert RNGStreams(43).generator('0xabc', 'valuation').random(4).tolist() != first
+
+
+@pytest.mark.parametrize('seed', [0, 42, 2 ** 100 + 7])
+@pytest.mark.parametrize('entity', [0, '0xabc', 12345678901234567890])
+def test_scalar_stream_matches_numpy_pcg64(seed, entity):
+    streams = RNGStreams(seed)
+    scalar, generator = streams.stream(entity, 'stage'), streams.generator(entity, 'stage')
+    assert scalar.random(5) == generator.random(5).tolist()
+    assert scalar.uniform(-3.5, 9.25) == generator.uniform(-3.5, 9.25)
+    for low, high in [(0, 1), (5, 17), (-1000, 1000), (0, 2 ** 32), (0, 2 ** 40), (0, 2 ** 63)]:
+        assert [scalar.integers(low, high) for _ in range(4)] == [int(generator.integers(low, high)) for _ in range(4)]
+    assert scalar.integers(9) == generator.integers(9)
+    assert scalar.random() == generator.random()
+
+
+@pytest.mark.parametrize('a, size', [(1, 1), (5, 5), (10, 3), (1000, 40), (20000, 100), (20000, 1000), (2 ** 40, 3)])
+def test_scalar_choice_matches_numpy(a, size):
+    streams = RNGStreams(7)
+    scalar, generator = streams.stream('entity', 'choice'), streams.generator('entity', 'choice')
+    assert scalar.choice(a, size) == generator.choice(a, size=size, replace=False).tolist()
+    assert scalar.choice(a, size, replace=True) == generator.choice(a, size=size).tolist()
+    assert scalar.random() == generator.random()
+
+
+def test_scalar_path_does_not_import_numpy():
+    script = ("import sys; sys.path.insert(0, sys.argv[1]); from rng_streams import RNGStreams; "
+              "RNGStreams(1).stream('e', 's').choice(10, 3); print('numpy' in sys.modules)")
+    completed = subprocess.run([sys.executable, '-c', script, SCRIPTS_DIR], capture_output=True, text=True, check=True)
+    assert completed.stdout.strip() == 'False'
+
+
+def test_parallel_analysis_matches_serial(ai_engine):
+    assets = [{'id': i, 'name': f"Asset {i}", 'type': 'art', 'estimated_value': 1000 * (i + 1)} for i in range(12)]
+
+    def stable(result):
+        return {k: v for k, v in result.items() if k not in ('analysis_timestamp', 'processing_time_ms')}
+
+    serial = [stable(ai_engine.analyze_asset(a)) for a in assets]
+    with ThreadPoolExecutor(4) as pool:
+        parallel = [stable(r) for r in pool.map(ai_engine.analyze_asset, reversed(assets))][::-1]
+    assert parallel == serial
+
+
+_USER_SCRIPT = """
+import json, sys
+sys.path.insert(0, sys.argv[1])
+from ecochain import EcoChainAnalytics
+user = {'wallet_address': '0x42', 'eco_actions': [{'type': 'water', 'carbon_offset': 1.0, 'eco_reward': 5}]}
+result = EcoChainAnalytics(run_seed=42, simulate_latency=False).analyze_user_sustainability_impact(user)
+print(json.dumps({k: v for k, v in result.items() if k not in ('analysis_timestamp', 'processing_time_ms')},
+                 sort_keys=True, default=str))
+"""
+
+
+def test_user_analysis_does_not_depend_on_hash_seed():
+    outputs = set()
+    for hash_seed in ('1', '2', '3'):
+        env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+        completed = subprocess.run([sys.executable, '-c', _USER_SCRIPT, SCRIPTS_DIR], env=env,
+                                   capture_output=True, text=True, check=True)
+        outputs.add(completed.stdout)
+    assert len(outputs) == 1
+    assert json.loads(outputs.pop())['recommendations']
@@ -0,0 +1,76 @@
+import json
+
+import numpy as np
+
+from sharded_analytics import ShardedAnalytics, shard_for
+
+
+def _users(n=60):
+    types = ['energy', 'water', 'recycling', 'transport', 'planting']
+    return [{
+        'wallet_address': f"0x{i:040x}",
+        'eco_actions': [{'type': types[(i + j) % 5], 'carbon_offset': 0.5 * j, 'eco_reward': 5 * j}
+                        for j in range(i % 6)],
+        'utility_payments': [{'amount_usd': 10.0 * (i % 3)}]
+    } for i in range(n)]
+
+
+def _write_jsonl(path, users):
+    with open(path, 'w') as f:
+        for user in users:
+            f.write(json.dumps(user) + '\n')
+
+
+def test_sharded_totals_match_a_single_shard(tmp_path):
+    users = _users()
+    single = ShardedAnalytics(1, str(tmp_path / 'one'), processes=1).run(iter(users))
+    sharded = ShardedAnalytics(4, str(tmp_path / 'four'), processes=2).run(iter(users))
+
+    assert sharded.totals['users'] == single.totals['users'] == len(users)
+    assert sharded.totals['eco_actions'] == single.totals['eco_actions']
+    assert abs(sharded.totals['carbon_offset'] - single.totals['carbon_offset']) < 1e-9
+    assert sharded.actions_by_type == single.actions_by_type
+    assert np.array_equal(sharded.score_distribution.counts, single.score_distribution.counts)
+    assert 'active_users_30d' not in sharded.platform_metrics()
+
+
+def test_each_shard_input_holds_only_its_hash_range(tmp_path):
+    runner = ShardedAnalytics(3, str(tmp_path))
+    users_path = tmp_path / 'users.jsonl'
+    _write_jsonl(users_path, _users(30))
+    runner.run(str(users_path))
+    for shard_id in range(3):
+        with open(runner.input_path(shard_id)) as f:
+            wallets = [json.loads(line)['wallet_address'] for line in f]
+        assert wallets and all(shard_for(w, 3) == shard_id for w in wallets)
+
+
+def test_only_changed_shards_are_reanalyzed(tmp_path):
+    users = _users(40)
+    runner = ShardedAnalytics(4, str(tmp_path), processes=1)
+    runner.run(iter(users))
+    stamps = {s: (tmp_path / f"shard-{s:04d}-of-0004.json").stat().st_mtime_ns for s in range(4)}
+
+    users[0]['eco_actions'].append({'type': 'water', 'carbon_offset': 9.0, 'eco_reward': 1})
+    changed = shard_for(users[0]['wallet_address'], 4)
+    aggregate = runner.run(iter(users))
+
+    for shard_id, stamp in stamps.items():
+        rewritten = (tmp_path / f"shard-{shard_id:04d}-of-0004.json").stat().st_mtime_ns != stamp
+        assert rewritten == (shard_id == changed)
+    assert aggregate.totals['eco_actions'] == sum(len(u['eco_actions']) for u in users)
+
+
+def test_installed_distribution_ranks_like_a_single_process_run(tmp_path, analytics_module):
+    users = _users()
+    single = analytics_module.EcoChainAnalytics(run_seed=1, simulate_latency=False)
+    sharded = analytics_module.EcoChainAnalytics(run_seed=1, simulate_latency=False)
+    ShardedAnalytics(1, str(tmp_path / 'one'), processes=1).run(iter(users)).install(single)
+    ShardedAnalytics(4, str(tmp_path / 'four'), processes=2).run(iter(users)).install(sharded)
+
+    scores = [single._calculate_eco_score(u)['overall_score'] for u in users]
+    for user, score in zip(users[:10], scores):
+        ranking = sharded.analyze_user_sustainability_impact(user)['platform_ranking']
+        assert ranking == single.analyze_user_sustainability_impact(user)['platform_ranking']
+        assert ranking['total_users'] == len(users)
+        assert ranking['current_rank'] == 1 + sum(other > score for other in scores)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from sketches import HyperLogLog, KLLSketch, PlatformSketches
+
+
+@pytest.mark.parametrize('n', [100, 5000, 60000])
+def test_hyperloglog_count_within_error_bound(n):
+    sketch = HyperLogLog(12)
+    sketch.add_many(f"0x{i:040x}" for i in range(n))
+    assert abs(sketch.count() - n) <= 4 * sketch.relative_error * n + 2
+
+
+def test_hyperloglog_merge_equals_sketch_of_union():
+    left, right, union = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+    left.add_many(range(0, 3000))
+    right.add_many(range(2000, 5000))
+    union.add_many(range(0, 5000))
+    assert np.array_equal(left.merge(right).registers, union.registers)
+
+
+def test_hyperloglog_rejects_mismatched_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(10).merge(HyperLogLog(12))
+
+
+def _rank_error(values, sketch, qs):
+    ordered = np.sort(values)
+    estimates = sketch.quantiles(qs)
+    return max(abs(np.searchsorted(ordered, e, side='right') / len(ordered) - q) for q, e in zip(qs, estimates))
+
+
+def test_kll_quantiles_within_rank_error():
+    values = np.random.default_rng(0).lognormal(3, 1, 100000)
+    sketch = KLLSketch(200)
+    sketch.add_many(values)
+    qs = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+    assert _rank_error(values, sketch, qs) <= 3 * sketch.rank_error
+
+
+def test_kll_one_at_a_time_within_rank_error():
+    values = np.random.default_rng(2).uniform(0, 100, 20000)
+    sketch = KLLSketch(200)
+    for value in values:
+        sketch.add(value)
+    assert _rank_error(values, sketch, [0.1, 0.5, 0.9]) <= 3 * sketch.rank_error
+
+
+def test_kll_merged_shards_within_rank_error():
+    values = np.random.default_rng(1).normal(50, 15, 80000)
+    merged = KLLSketch(200)
+    for shard in np.array_split(values, 8):
+        part = KLLSketch(200)
+        part.add_many(shard)
+        merged.merge(part)
+    assert merged.count == len(values)
+    assert _rank_error(values, merged, [0.1, 0.5, 0.9]) <= 3 * merged.rank_error
+
+
+def test_kll_empty_sketch_has_no_quantiles():
+    assert KLLSketch().quantiles([0.5]) == [None]
+
+
+def test_platform_sketches_round_trip():
+    sketches = PlatformSketches(precision=10, k=64)
+    sketches.add_eco_actions([{'wallet_address': f"w{i % 50}", 'type': 'water' if i % 2 else 'energy',
+                               'carbon_offset': i / 10} for i in range(500)])
+    sketches.add_eco_scores(range(100))
+    restored = PlatformSketches.from_dict(sketches.to_dict())
+    assert restored.summary() == sketches.summary()
+    assert abs(sketches.summary()['active_wallets'] - 50) <= 3
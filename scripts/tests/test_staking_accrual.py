@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from staking_accrual import SECONDS_PER_YEAR, StakingBook
+
+DAY = 86400
+
+
+def _records():
+    return [
+        {'id': 1, 'user_id': 10, 'amount_staked': 1000, 'apy_rate': 0.1, 'staking_period_days': 30,
+         'staked_at': '2024-01-01T00:00:00', 'status': 'active'},
+        {'id': 2, 'user_id': 10, 'amount_staked': 500, 'apy_rate': 0.2, 'staking_period_days': 30,
+         'staked_at': '2024-01-01T00:00:00', 'status': 'completed'},
+        {'id': 3, 'user_id': 11, 'amount_staked': 800, 'apy_rate': 0.05, 'staking_period_days': 90,
+         'staked_at': '2024-01-01T00:00:00', 'unstaked_at': '2024-01-11T00:00:00', 'status': 'withdrawn'}
+    ]
+
+
+def _interest(amount, apy, days):
+    return amount * apy * days * DAY / SECONDS_PER_YEAR
+
+
+def test_accrual_stops_where_each_position_does():
+    book = StakingBook()
+    book.upsert(_records())
+    book.accrue('2024-03-01T00:00:00')
+    rewards = book.rewards_for([1, 2, 3])
+    assert rewards[1] == pytest.approx(_interest(1000, 0.1, 60))
+    assert rewards[2] == pytest.approx(_interest(500, 0.2, 30))
+    assert rewards[3] == pytest.approx(_interest(800, 0.05, 10))
+    assert book.user_totals()[10] == pytest.approx(rewards[1] + rewards[2])
+
+
+def test_incremental_accrual_matches_full_recompute():
+    rng = np.random.default_rng(0)
+    records = [{'id': i, 'user_id': int(rng.integers(50)), 'amount_staked': float(rng.uniform(10, 1000)),
+                'apy_rate': 0.08, 'staking_period_days': int(rng.choice([30, 90])),
+                'staked_at': f"2024-01-{1 + i % 28:02d}T00:00:00",
+                'status': str(rng.choice(['active', 'completed']))} for i in range(300)]
+    incremental = StakingBook()
+    incremental.upsert(records)
+    incremental.accrue('2024-02-01')
+    incremental.upsert([dict(records[5], amount_staked=5.0)])
+    summary = incremental.accrue('2024-06-01')
+    assert summary['positions_recomputed'] < len(records)
+
+    full = StakingBook()
+    full.upsert(records)
+    full.upsert([dict(records[5], amount_staked=5.0)])
+    full.accrue('2024-06-01', full=True)
+    assert incremental.user_totals() == pytest.approx(full.user_totals())
+
+
+def test_withdrawn_position_without_unstaked_at_is_rejected():
+    row = dict(_records()[2], unstaked_at=None)
+    with pytest.raises(ValueError, match=r'\[3\]'):
+        StakingBook().upsert([row])
+    with pytest.raises(ValueError):
+        StakingBook.from_arrays([3], [11], [800.0], [0.05], [90], ['2024-01-01'], ['NaT'], ['withdrawn'])
@@ -0,0 +1,67 @@
+import sqlite3
+
+import numpy as np
+
+from workload_generator import ENUMS, ColumnarWriter, SQLiteWriter, WorkloadGenerator, WorkloadWriter, read_table
+
+
+def _generator(**kwargs):
+    return WorkloadGenerator(200, 5000, seed=kwargs.pop('seed', 3), chunk_size=1500, **kwargs)
+
+
+def test_row_counts_follow_sizes_and_chunks():
+    writer = WorkloadWriter()
+    summary = _generator().generate(writer)
+    assert summary['rows']['eco_actions'] == 5000
+    assert summary['rows']['users'] == 200
+    assert summary['rows']['governance_proposals'] == 20
+    assert summary['rows']['iot_readings'] == summary['rows']['iot_devices'] * 48
+
+
+def test_output_is_reproducible_per_seed(tmp_path):
+    _generator().generate(ColumnarWriter(str(tmp_path / 'a')))
+    _generator().generate(ColumnarWriter(str(tmp_path / 'b')))
+    _generator(seed=4).generate(ColumnarWriter(str(tmp_path / 'c')))
+    first, second, other = (list(read_table(str(tmp_path / d), 'eco_actions')) for d in 'abc')
+    assert len(first) == 4
+    for a, b in zip(first, second):
+        assert all(np.array_equal(a[k], b[k], equal_nan=a[k].dtype.kind in 'fM') for k in a)
+    assert not np.array_equal(first[0]['user_id'], other[0]['user_id'])
+
+
+def test_enum_codes_and_foreign_keys_are_in_range(tmp_path):
+    _generator().generate(ColumnarWriter(str(tmp_path)))
+    actions = list(read_table(str(tmp_path), 'eco_actions'))
+    for chunk in actions:
+        assert 0 <= chunk['action_type'].min() and chunk['action_type'].max() < len(ENUMS['action_type'])
+        assert 1 <= chunk['user_id'].min() and chunk['user_id'].max() <= 200
+        assert (chunk['carbon_offset'] > 0).all()
+    votes = np.concatenate([c['user_id'] for c in read_table(str(tmp_path), 'governance_votes')])
+    proposals = np.concatenate([c['proposal_id'] for c in read_table(str(tmp_path), 'governance_votes')])
+    assert len(set(zip(proposals.tolist(), votes.tolist()))) == len(votes)
+
+
+def test_user_totals_match_credited_actions(tmp_path):
+    _generator().generate(ColumnarWriter(str(tmp_path)))
+    actions = list(read_table(str(tmp_path), 'eco_actions'))
+    expected = np.zeros(201)
+    for chunk in actions:
+        credited = chunk['status'] != ENUMS['action_status'].index('rejected')
+        np.add.at(expected, chunk['user_id'][credited], chunk['carbon_offset'][credited])
+    users = next(read_table(str(tmp_path), 'users'))
+    np.testing.assert_allclose(users['total_carbon_offset'], np.round(expected[users['id']], 4))
+
+
+def test_sqlite_writer_decodes_enums_and_nulls(tmp_path):
+    path = str(tmp_path / 'ecochain.db')
+    _generator().generate(SQLiteWriter(path))
+    with sqlite3.connect(path) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM eco_actions').fetchone()[0] == 5000
+        types = {row[0] for row in conn.execute('SELECT DISTINCT action_type FROM eco_actions')}
+        assert types <= set(ENUMS['action_type'])
+        unverified = conn.execute("SELECT COUNT(*) FROM eco_actions WHERE status IN ('pending', 'rejected') "
+                                  "AND verified_at IS NOT NULL").fetchone()[0]
+        assert unverified == 0
+        withdrawn = conn.execute("SELECT COUNT(*) FROM staking_records WHERE status = 'withdrawn' "
+                                 "AND unstaked_at IS NULL").fetchone()[0]
+        assert withdrawn == 0
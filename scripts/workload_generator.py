@@ -0,0 +1,552 @@
+"""
+EcoChain Workload Generator
+Vectorized synthetic users, eco actions, IoT readings, votes and staking records following
+create-ecochain-database.sql, written in bulk to columnar .npz parts or SQLite
+
+Usage:
+    python scripts/workload_generator.py --users 1000000 --actions 100000000 --output data/
+    python scripts/workload_generator.py --users 10000 --actions 1000000 --sqlite ecochain.db
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, List, Any, Iterator, Mapping, Optional, Tuple
+
+import numpy as np
+
+from model_config import default_registry
+from rng_streams import RNGStreams
+
+logger = logging.getLogger('ecochain.workload')
+
+# Enum columns are generated as small integer codes; labels follow the schema's ENUM order
+ENUMS = {
+    'kyc_status': ['pending', 'approved', 'rejected'],
+    'action_type': ['energy', 'water', 'recycling', 'transport', 'planting'],
+    'action_status': ['pending', 'verified', 'rejected', 'completed'],
+    'category': ['rewards', 'partnerships', 'technical', 'governance', 'tokenomics'],
+    'proposal_status': ['pending', 'active', 'passed', 'rejected', 'executed'],
+    'staking_status': ['active', 'completed', 'withdrawn'],
+    'device_type': ['smart_meter', 'water_sensor', 'air_quality', 'solar_panel', 'ev_charger'],
+    'device_status': ['active', 'inactive', 'maintenance']
+}
+
+# Columns holding enum codes, per table
+ENUM_COLUMNS = {
+    'users': {'kyc_status': 'kyc_status'},
+    'eco_actions': {'action_type': 'action_type', 'status': 'action_status'},
+    'governance_proposals': {'category': 'category', 'status': 'proposal_status'},
+    'staking_records': {'status': 'staking_status'},
+    'iot_devices': {'device_type': 'device_type', 'status': 'device_status'}
+}
+
+# Reading type, unit and value distribution (mean, std) per device type, after seed-ecochain-data.sql
+READING_PROFILES = {
+    'smart_meter': ('energy_consumption', 'kWh', 240.0, 40.0),
+    'water_sensor': ('water_usage', 'liters', 1250.0, 200.0),
+    'air_quality': ('pm2.5_level', 'μg/m³', 12.0, 4.0),
+    'solar_panel': ('energy_generated', 'kWh', 150.0, 30.0),
+    'ev_charger': ('distance_traveled', 'km', 45.0, 15.0)
+}
+
+# Staking terms offered on the platform: (period days, APY)
+STAKING_TERMS = [(30, 0.1250), (60, 0.1300), (90, 0.1350)]
+
+# SQLite rendering of the MySQL schema; ENUM columns become TEXT
+SQLITE_SCHEMA = {
+    'users': ['id INTEGER PRIMARY KEY', 'wallet_address TEXT UNIQUE NOT NULL', 'email TEXT',
+              'kyc_status TEXT', 'eco_balance REAL', 'staked_eco REAL', 'total_carbon_offset REAL',
+              'created_at TEXT', 'updated_at TEXT'],
+    'eco_actions': ['id INTEGER PRIMARY KEY', 'user_id INTEGER', 'action_type TEXT NOT NULL', 'description TEXT',
+                    'eco_reward REAL', 'carbon_offset REAL', 'verification_method TEXT', 'verification_data TEXT',
+                    'status TEXT', 'iot_device_id TEXT', 'created_at TEXT', 'verified_at TEXT'],
+    'governance_proposals': ['id INTEGER PRIMARY KEY', 'title TEXT NOT NULL', 'description TEXT',
+                             'proposer_id INTEGER', 'category TEXT NOT NULL', 'status TEXT', 'votes_for INTEGER',
+                             'votes_against INTEGER', 'quorum_required INTEGER', 'start_date TEXT',
+                             'end_date TEXT', 'created_at TEXT'],
+    'governance_votes': ['id INTEGER PRIMARY KEY', 'proposal_id INTEGER', 'user_id INTEGER',
+                         'voting_power INTEGER', 'vote_choice INTEGER', 'transaction_hash TEXT',
+                         'created_at TEXT', 'UNIQUE (proposal_id, user_id)'],
+    'staking_records': ['id INTEGER PRIMARY KEY', 'user_id INTEGER', 'amount_staked REAL',
+                        'staking_period_days INTEGER', 'apy_rate REAL', 'rewards_earned REAL', 'status TEXT',
+                        'staked_at TEXT', 'unstaked_at TEXT'],
+    'iot_devices': ['id INTEGER PRIMARY KEY', 'device_id TEXT UNIQUE NOT NULL', 'user_id INTEGER',
+                    'device_type TEXT NOT NULL', 'location TEXT', 'status TEXT', 'last_reading TEXT',
+                    'calibration_date TEXT', 'created_at TEXT'],
+    'iot_readings': ['id INTEGER PRIMARY KEY', 'device_id TEXT', 'reading_type TEXT', 'value REAL', 'unit TEXT',
+                     'timestamp TEXT', 'processed INTEGER', 'eco_reward_calculated REAL']
+}
+
+# Secondary indexes from create-ecochain-database.sql, built after the bulk load
+SQLITE_INDEXES = [
+    'CREATE INDEX idx_eco_actions_user ON eco_actions(user_id)',
+    'CREATE INDEX idx_eco_actions_type ON eco_actions(action_type)',
+    'CREATE INDEX idx_eco_actions_status ON eco_actions(status)',
+    'CREATE INDEX idx_governance_votes_proposal ON governance_votes(proposal_id)',
+    'CREATE INDEX idx_iot_readings_device ON iot_readings(device_id)',
+    'CREATE INDEX idx_iot_readings_timestamp ON iot_readings(timestamp)',
+    'CREATE INDEX idx_staking_records_user ON staking_records(user_id)'
+]
+
+DAY = np.timedelta64(1, 'D')
+
+
+def _default_eco_actions() -> Mapping[str, Mapping[str, Any]]:
+    """Action categories from the model configuration, so offsets and rewards track the engine's factors"""
+    return default_registry().current.eco_actions
+
+
+def _hex_ids(rng: np.random.Generator, n: int, nbytes: int, prefix: bytes) -> np.ndarray:
+    """n random hex identifiers (wallets, transaction hashes) as a fixed-width bytes array"""
+    digits = np.frombuffer(rng.bytes(n * nbytes).hex().encode(), dtype=f'S{nbytes * 2}')
+    return np.char.add(prefix, digits)
+
+
+def _chunks(total: int, size: int) -> Iterator[Tuple[int, int, int]]:
+    """(chunk index, first row offset, rows) covering total rows"""
+    for index, offset in enumerate(range(0, total, size)):
+        yield index, offset, min(size, total - offset)
+
+
+class WorkloadGenerator:
+    """
+    Generates a full EcoChain dataset chunk by chunk
+    Activity per user follows a Pareto (power-law) distribution, timestamps follow a yearly
+    seasonal cycle with a weekend uplift, and carbon offsets are drawn from per-type ranges
+    derived from the eco_actions carbon factors. Every chunk draws from its own stream, so
+    the output is reproducible for a seed and memory stays proportional to the number of
+    users and the chunk size, not to the number of actions.
+    """
+
+    def __init__(self, num_users: int, num_actions: int, seed: int = 0,
+                 start: str = '2024-01-01', end: str = '2025-01-01',
+                 activity_alpha: float = 1.2, seasonal_amplitude: float = 0.25, seasonal_peak_day: int = 172,
+                 weekend_factor: float = 1.15, offset_ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+                 eco_actions: Optional[Dict[str, Dict[str, Any]]] = None, device_share: float = 0.3,
+                 readings_per_device: int = 48, num_proposals: int = 20, vote_participation: float = 0.05,
+                 staking_share: float = 0.2, chunk_size: int = 1_000_000):
+        self.num_users = num_users
+        self.num_actions = num_actions
+        self.streams = RNGStreams(seed)
+        self.start = np.datetime64(start, 's')
+        self.end = np.datetime64(end, 's')
+        self.activity_alpha = activity_alpha
+        self.num_devices = int(num_users * device_share)
+        self.readings_per_device = readings_per_device
+        self.num_proposals = num_proposals
+        self.vote_participation = vote_participation
+        self.staking_share = staking_share
+        self.chunk_size = chunk_size
+
+        types = ENUMS['action_type']
+        if eco_actions:
+            factors = np.array([float(eco_actions[t]['carbon_factor']) for t in types])
+            base_rewards = np.array([float(eco_actions[t]['base_reward']) for t in types])
+        else:
+            # The compiled configuration's tables, reordered to this generator's type codes
+            config = default_registry().current
+            codes = config.codes(types)
+            if (codes < 0).any():
+                raise KeyError(f"eco_actions: no configuration for {[t for t, c in zip(types, codes) if c < 0]}")
+            eco_actions = config.eco_actions
+            factors = config.arrays['carbon_factor'][codes]
+            base_rewards = config.arrays['base_reward'][codes]
+        offset_ranges = offset_ranges or {t: (0.5 * f, 2.0 * f) for t, f in zip(types, factors.tolist())}
+        self.offset_low = np.array([offset_ranges[t][0] for t in types])
+        self.offset_span = np.array([offset_ranges[t][1] - offset_ranges[t][0] for t in types])
+        self.reward_per_offset = base_rewards / factors
+        self.methods = [eco_actions[t]['verification_methods'] for t in types]
+
+        # Seasonal day weights: yearly cosine around the peak day plus a weekend uplift
+        days = np.arange(self.start.astype('datetime64[D]'), self.end.astype('datetime64[D]'))
+        day_of_year = (days - days.astype('datetime64[Y]')).astype(int)
+        weekday = (days.astype(int) + 3) % 7
+        weights = 1 + seasonal_amplitude * np.cos(2 * np.pi * (day_of_year - seasonal_peak_day) / 365.25)
+        weights = weights * np.where(weekday >= 5, weekend_factor, 1.0)
+        self.day_cdf = np.cumsum(weights) / weights.sum()
+
+        # Power-law activity: the share of actions each user contributes
+        activity = self.streams.generator('users', 'activity').pareto(activity_alpha, num_users) + 1
+        self.activity_cdf = np.cumsum(activity) / activity.sum()
+
+        # Device types are needed again when generating readings, so they are drawn up front
+        self.device_types = self.streams.generator('iot_devices', 'types').integers(
+            len(ENUMS['device_type']), size=self.num_devices).astype(np.int8)
+
+    # Distributions
+
+    def _timestamps(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        day = np.minimum(np.searchsorted(self.day_cdf, rng.random(n)), len(self.day_cdf) - 1)
+        seconds = day * 86400 + rng.integers(86400, size=n)
+        return self.start + seconds.astype('timedelta64[s]')
+
+    def _active_users(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """1-based user ids weighted by power-law activity"""
+        return np.minimum(np.searchsorted(self.activity_cdf, rng.random(n)), self.num_users - 1) + 1
+
+    # Tables
+
+    def eco_actions(self, totals: Optional[Dict[str, np.ndarray]] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """eco_actions chunks; per-user offset and reward totals are accumulated into totals"""
+        for index, offset, n in _chunks(self.num_actions, self.chunk_size):
+            rng = self.streams.generator('eco_actions', f"chunk-{index}")
+            user_id = self._active_users(rng, n)
+            action_type = rng.integers(len(ENUMS['action_type']), size=n).astype(np.int8)
+            carbon_offset = np.round(self.offset_low[action_type] + self.offset_span[action_type] * rng.random(n), 6)
+            eco_reward = np.round(carbon_offset * self.reward_per_offset[action_type], 4)
+            status = np.searchsorted(np.cumsum([0.10, 0.70, 0.05, 0.15]), rng.random(n)).astype(np.int8)
+            created_at = self._timestamps(rng, n)
+            settled = (status == 1) | (status == 3)
+            delay = rng.exponential(6 * 3600, size=n).astype('timedelta64[s]')
+            verified_at = np.where(settled, created_at + delay, np.datetime64('NaT'))
+
+            if totals is not None:
+                credited = status != 2
+                totals['carbon_offset'] += np.bincount(user_id[credited], carbon_offset[credited],
+                                                       minlength=self.num_users + 1)
+                totals['eco_reward'] += np.bincount(user_id[credited], eco_reward[credited],
+                                                    minlength=self.num_users + 1)
+            yield {
+                'id': np.arange(offset + 1, offset + n + 1),
+                'user_id': user_id,
+                'action_type': action_type,
+                'eco_reward': eco_reward,
+                'carbon_offset': carbon_offset,
+                'verification_method': rng.integers(3, size=n).astype(np.int8),
+                'status': status,
+                'created_at': created_at,
+                'verified_at': verified_at
+            }
+
+    def users(self, totals: Dict[str, np.ndarray],
+              staked: Optional[np.ndarray] = None) -> Iterator[Dict[str, np.ndarray]]:
+        for index, offset, n in _chunks(self.num_users, self.chunk_size):
+            rng = self.streams.generator('users', f"chunk-{index}")
+            ids = np.arange(offset + 1, offset + n + 1)
+            created_at = self.start - (rng.integers(1, 365 * 86400, size=n)).astype('timedelta64[s]')
+            yield {
+                'id': ids,
+                'wallet_address': _hex_ids(rng, n, 20, b'0x'),
+                'kyc_status': np.searchsorted([0.15, 0.97], rng.random(n)).astype(np.int8),
+                'eco_balance': np.round(totals['eco_reward'][ids] * rng.uniform(0.2, 1.0, n), 8),
+                'staked_eco': np.round(staked[ids], 8) if staked is not None else np.zeros(n),
+                'total_carbon_offset': np.round(totals['carbon_offset'][ids], 4),
+                'created_at': created_at,
+                'updated_at': np.full(n, self.end)
+            }
+
+    def iot_devices(self) -> Iterator[Dict[str, np.ndarray]]:
+        for index, offset, n in _chunks(self.num_devices, self.chunk_size):
+            rng = self.streams.generator('iot_devices', f"chunk-{index}")
+            ids = np.arange(offset + 1, offset + n + 1)
+            created_at = self._timestamps(rng, n)
+            yield {
+                'id': ids,
+                'device_id': np.char.add(b'IOT', np.char.zfill(ids.astype('S'), 9)),
+                'user_id': rng.integers(1, self.num_users + 1, size=n),
+                'device_type': self.device_types[offset:offset + n],
+                'status': np.searchsorted([0.9, 0.97], rng.random(n)).astype(np.int8),
+                'last_reading': np.full(n, self.end),
+                'calibration_date': created_at,
+                'created_at': created_at
+            }
+
+    def iot_readings(self) -> Iterator[Dict[str, np.ndarray]]:
+        """Readings spread uniformly over the registered devices"""
+        types = ENUMS['device_type']
+        means = np.array([READING_PROFILES[t][2] for t in types])
+        stds = np.array([READING_PROFILES[t][3] for t in types])
+        for index, offset, n in _chunks(self.num_devices * self.readings_per_device, self.chunk_size):
+            rng = self.streams.generator('iot_readings', f"chunk-{index}")
+            device = rng.integers(self.num_devices, size=n)
+            device_type = self.device_types[device]
+            processed = rng.random(n) < 0.8
+            yield {
+                'id': np.arange(offset + 1, offset + n + 1),
+                'device_id': np.char.add(b'IOT', np.char.zfill((device + 1).astype('S'), 9)),
+                'device_type': device_type,
+                'value': np.round(np.abs(rng.normal(means[device_type], stds[device_type])), 6),
+                'timestamp': self._timestamps(rng, n),
+                'processed': processed,
+                'eco_reward_calculated': np.where(processed & (device_type != 2),
+                                                  np.round(rng.uniform(15, 40, n), 4), 0.0)
+            }
+
+    def governance_votes(self, tallies: Optional[np.ndarray] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Votes from distinct users per proposal (UNIQUE (proposal_id, user_id)); power is tallied into tallies"""
+        start_dates = self._proposal_start_dates()
+        next_id = 1
+        for proposal_id, start_date in enumerate(start_dates, 1):
+            rng = self.streams.generator('governance_votes', f"proposal-{proposal_id}")
+            voters = rng.choice(self.num_users, size=rng.binomial(self.num_users, self.vote_participation),
+                                replace=False) + 1
+            support = rng.beta(5, 3)
+            for _, offset, n in _chunks(len(voters), self.chunk_size):
+                voting_power = np.maximum(1, rng.lognormal(7.5, 1.0, n)).astype(np.int64)
+                vote_choice = rng.random(n) < support
+                if tallies is not None:
+                    tallies[proposal_id] += [voting_power[vote_choice].sum(), voting_power[~vote_choice].sum()]
+                yield {
+                    'id': np.arange(next_id, next_id + n),
+                    'proposal_id': np.full(n, proposal_id),
+                    'user_id': voters[offset:offset + n],
+                    'voting_power': voting_power,
+                    'vote_choice': vote_choice,
+                    'transaction_hash': _hex_ids(rng, n, 32, b'0x'),
+                    'created_at': start_date + rng.integers(7 * 86400, size=n).astype('timedelta64[s]')
+                }
+                next_id += n
+
+    def _proposal_start_dates(self) -> np.ndarray:
+        return self._timestamps(self.streams.generator('governance_proposals', 'start'), self.num_proposals)
+
+    def governance_proposals(self, tallies: np.ndarray) -> Dict[str, np.ndarray]:
+        rng = self.streams.generator('governance_proposals', 'all')
+        n = self.num_proposals
+        ids = np.arange(1, n + 1)
+        start_date = self._proposal_start_dates()
+        closed = start_date + 7 * DAY < self.end
+        passed = (tallies[ids, 0] > tallies[ids, 1]) & (tallies[ids].sum(axis=1) >= 10_000_000)
+        return {
+            'id': ids,
+            'title': np.char.add(b'Proposal ', ids.astype('S')),
+            'proposer_id': rng.integers(1, self.num_users + 1, size=n),
+            'category': rng.integers(len(ENUMS['category']), size=n).astype(np.int8),
+            'status': np.where(closed, np.where(passed, 2, 3), 1).astype(np.int8),
+            'votes_for': tallies[ids, 0],
+            'votes_against': tallies[ids, 1],
+            'quorum_required': np.full(n, 10_000_000),
+            'start_date': start_date,
+            'end_date': start_date + 7 * DAY,
+            'created_at': start_date - DAY
+        }
+
+    def staking_records(self, staked: Optional[np.ndarray] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Staking positions; amounts still staked are accumulated per user into staked"""
+        periods = np.array([t[0] for t in STAKING_TERMS])
+        apys = np.array([t[1] for t in STAKING_TERMS])
+        total = int(self.num_users * self.staking_share * 1.5)
+        for index, offset, n in _chunks(total, self.chunk_size):
+            rng = self.streams.generator('staking_records', f"chunk-{index}")
+            user_id = self._active_users(rng, n)
+            term = rng.integers(len(STAKING_TERMS), size=n)
+            amount = np.round(rng.lognormal(6.2, 0.9, n), 8)
+            staked_at = self._timestamps(rng, n)
+            matured = staked_at + periods[term] * DAY
+            withdrawn = (matured < self.end) & (rng.random(n) < 0.3)
+            status = np.where(matured < self.end, np.where(withdrawn, 2, 1), 0).astype(np.int8)
+            accrued_until = np.where(status == 0, self.end, matured)
+            days = (accrued_until - staked_at) / DAY
+            if staked is not None:
+                active = status == 0
+                staked += np.bincount(user_id[active], amount[active], minlength=self.num_users + 1)
+            yield {
+                'id': np.arange(offset + 1, offset + n + 1),
+                'user_id': user_id,
+                'amount_staked': amount,
+                'staking_period_days': periods[term],
+                'apy_rate': apys[term],
+                'rewards_earned': np.round(amount * apys[term] * days / 365, 8),
+                'status': status,
+                'staked_at': staked_at,
+                'unstaked_at': np.where(withdrawn, matured, np.datetime64('NaT'))
+            }
+
+    # Orchestration
+
+    def generate(self, writer: 'WorkloadWriter') -> Dict[str, Any]:
+        """Stream every table into writer; returns row counts and elapsed time"""
+        started = time.perf_counter()
+        totals = {
+            'carbon_offset': np.zeros(self.num_users + 1),
+            'eco_reward': np.zeros(self.num_users + 1)
+        }
+        staked = np.zeros(self.num_users + 1)
+
+        for chunk in self.eco_actions(totals):
+            writer.write('eco_actions', chunk)
+            logger.info("🌱 eco_actions: %d rows written", writer.rows['eco_actions'])
+        for chunk in self.staking_records(staked):
+            writer.write('staking_records', chunk)
+        for chunk in self.users(totals, staked):
+            writer.write('users', chunk)
+        for chunk in self.iot_devices():
+            writer.write('iot_devices', chunk)
+        for chunk in self.iot_readings():
+            writer.write('iot_readings', chunk)
+        tallies = np.zeros((self.num_proposals + 1, 2), dtype=np.int64)
+        for chunk in self.governance_votes(tallies):
+            writer.write('governance_votes', chunk)
+        writer.write('governance_proposals', self.governance_proposals(tallies))
+        writer.close()
+
+        elapsed = time.perf_counter() - started
+        return {
+            'rows': dict(writer.rows),
+            'elapsed_seconds': round(elapsed, 2),
+            'actions_per_second': round(self.num_actions / elapsed) if elapsed > 0 else None
+        }
+
+
+# Writers
+
+class WorkloadWriter:
+    """Receives table chunks as dicts of NumPy columns"""
+
+    def __init__(self):
+        self.rows: Dict[str, int] = {}
+
+    def write(self, table: str, columns: Dict[str, np.ndarray]):
+        self.rows[table] = self.rows.get(table, 0) + len(columns['id'])
+
+    def close(self):
+        pass
+
+
+class ColumnarWriter(WorkloadWriter):
+    """
+    One uncompressed .npz part per chunk under <output_dir>/<table>/
+    Timestamps are datetime64[s] (NaT for NULL) and enum columns are int8 codes whose
+    labels are listed in manifest.json.
+    """
+
+    def __init__(self, output_dir: str):
+        super().__init__()
+        self.output_dir = output_dir
+        self.parts: Dict[str, int] = {}
+
+    def write(self, table: str, columns: Dict[str, np.ndarray]):
+        part = self.parts.get(table, 0)
+        directory = os.path.join(self.output_dir, table)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{part:06d}.npz")
+        with open(path + '.tmp', 'wb') as f:
+            np.savez(f, **columns)
+        os.replace(path + '.tmp', path)
+        self.parts[table] = part + 1
+        super().write(table, columns)
+
+    def close(self):
+        manifest = {
+            'schema': 'create-ecochain-database.sql',
+            'rows': self.rows,
+            'parts': self.parts,
+            'enums': {table: {column: ENUMS[enum] for column, enum in columns.items()}
+                      for table, columns in ENUM_COLUMNS.items()},
+            'verification_methods': 'index into eco_actions[action_type].verification_methods'
+        }
+        with open(os.path.join(self.output_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+
+def read_table(output_dir: str, table: str) -> Iterator[Dict[str, np.ndarray]]:
+    """Stream a table written by ColumnarWriter back one part at a time"""
+    directory = os.path.join(output_dir, table)
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.npz'):
+            with np.load(os.path.join(directory, name)) as part:
+                yield {column: part[column] for column in part.files}
+
+
+class SQLiteWriter(WorkloadWriter):
+    """
+    Bulk loads chunks into SQLite with executemany, one transaction per chunk
+    Journaling and fsync are disabled during the load and the schema's secondary indexes
+    are created once at the end, which is far faster than maintaining them row by row.
+    """
+
+    def __init__(self, path: str, methods: Optional[List[List[str]]] = None):
+        super().__init__()
+        if methods is None:
+            eco_actions = _default_eco_actions()
+            methods = [eco_actions[t]['verification_methods'] for t in ENUMS['action_type']]
+        self.methods = np.array(methods, dtype=object)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode = OFF')
+        self.conn.execute('PRAGMA synchronous = OFF')
+        for table, columns in SQLITE_SCHEMA.items():
+            self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+
+    def _render(self, table: str, columns: Dict[str, np.ndarray]) -> Dict[str, list]:
+        """Decode enum codes, timestamps and byte strings into SQLite values"""
+        rendered = {}
+        for name, values in columns.items():
+            enum = ENUM_COLUMNS.get(table, {}).get(name)
+            if enum is not None:
+                rendered[name] = np.array(ENUMS[enum], dtype=object)[values].tolist()
+            elif np.issubdtype(values.dtype, np.datetime64):
+                text = np.char.replace(np.datetime_as_string(values, unit='s'), 'T', ' ').astype(object)
+                text[np.isnat(values)] = None
+                rendered[name] = text.tolist()
+            elif values.dtype.kind == 'S':
+                rendered[name] = np.char.decode(values).tolist()
+            else:
+                rendered[name] = values.tolist()
+
+        if table == 'eco_actions':
+            rendered['verification_method'] = self.methods[columns['action_type'], columns['verification_method']].tolist()
+        elif table == 'iot_readings':
+            profiles = [READING_PROFILES[t] for t in ENUMS['device_type']]
+            device_type = columns['device_type']
+            rendered['reading_type'] = np.array([p[0] for p in profiles], dtype=object)[device_type].tolist()
+            rendered['unit'] = np.array([p[1] for p in profiles], dtype=object)[device_type].tolist()
+            del rendered['device_type']
+        return rendered
+
+    def write(self, table: str, columns: Dict[str, np.ndarray]):
+        rendered = self._render(table, columns)
+        names = list(rendered)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                zip(*(rendered[name] for name in names))
+            )
+        super().write(table, columns)
+
+    def close(self):
+        with self.conn:
+            for statement in SQLITE_INDEXES:
+                self.conn.execute(statement)
+        self.conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic EcoChain workload")
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--actions', type=int, default=10_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--start', default='2024-01-01')
+    parser.add_argument('--end', default='2025-01-01')
+    parser.add_argument('--activity-alpha', type=float, default=1.2, help="Pareto shape of per-user activity")
+    parser.add_argument('--seasonal-amplitude', type=float, default=0.25)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--output', help="directory for columnar .npz parts")
+    target.add_argument('--sqlite', help="SQLite database file to (re)create")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    generator = WorkloadGenerator(
+        args.users, args.actions, seed=args.seed, start=args.start, end=args.end,
+        activity_alpha=args.activity_alpha, seasonal_amplitude=args.seasonal_amplitude,
+        chunk_size=args.chunk_size
+    )
+    if args.output:
+        writer = ColumnarWriter(args.output)
+    else:
+        writer = SQLiteWriter(args.sqlite, generator.methods)
+
+    summary = generator.generate(writer)
+    logger.info("✅ Generated %s in %.1fs (%s actions/s)", summary['rows'], summary['elapsed_seconds'],
+                f"{summary['actions_per_second'] or 0:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())